@@ -1,14 +1,22 @@
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 from asset_manager.cli import CLI
-from asset_manager.database import Database
-from asset_manager.database.entities import Portfolio
-from asset_manager.equity_service import YahooService
+from asset_manager.database import (
+    Database,
+    MongoDatabase,
+    SnapshotStore,
+    SqliteDatabase,
+    WriteBehindDatabase,
+)
+from asset_manager.database.entities import Historical, Portfolio
+from asset_manager.equity_service import CachedEquityService, YahooService
 from asset_manager.portfolio_analyzer import PortfolioAnalyzer
-from asset_manager.treasury_service import Fred
+from asset_manager.treasury_service import Fred, LazyTreasuryService
+from asset_manager.utilities.request_scheduler import RequestScheduler
 
 
 def main() -> None:
@@ -17,22 +25,37 @@ def main() -> None:
     # load config and configure services
     config = load_config()
 
-    equity_service = YahooService()
-    treasury_service = Fred(config)
-
-    # establish database connection
-    db = Database(
-        user=config["mongodb"]["username"],
-        password=config["mongodb"]["password"],
-        database=config["mongodb"]["database"],
-        cluster=config["mongodb"]["cluster"],
+    request_scheduler = RequestScheduler(config.get("scheduler"))
+    quote_cache_config = config.get("quote_cache", {})
+    equity_service = CachedEquityService(
+        YahooService(request_scheduler),
+        ttl=quote_cache_config.get("ttl", 60),
+        max_size=quote_cache_config.get("max_size", 512),
     )
+    # rates are only read by some commands, so they load in the background
+    treasury_service = LazyTreasuryService(lambda: Fred(config, request_scheduler))
+
+    snapshot_store = SnapshotStore()
+    snapshot = snapshot_store.load(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    p: Optional[Portfolio]
+    if snapshot is not None:
+        # connect and reconcile the snapshot in the background while it is rendered
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            reconciled = executor.submit(
+                connect_and_reconcile, config, snapshot_store, *snapshot
+            )
+            log_snapshot(snapshot[0])
+            db, p, historical = reconciled.result()
+    else:
+        # establish database connection
+        db = connect_database(config)
 
-    # get portfolio specified on command line
-    p = retrieve_portfolio(db)
-    if p is None:
-        return
-    historical = db.get_historical(p.id)
+        # get portfolio specified on command line
+        p = retrieve_portfolio(db)
+        if p is None:
+            return
+        historical = db.get_historical(p.id)
 
     print("")
     print(f"SUMMARY DATE - {current_date}")
@@ -41,6 +64,7 @@ def main() -> None:
     # construct portfolio analyzer and update details
     portfolio_analyzer = PortfolioAnalyzer(p, historical, db, equity_service)
     portfolio_analyzer.analyze()
+    snapshot_store.save(p, historical)
 
     # output cash
     log_cash(p)
@@ -54,8 +78,18 @@ def main() -> None:
         db=db,
         equity_service=equity_service,
         treasury_service=treasury_service,
+        request_scheduler=request_scheduler,
     )
-    portfolio_prompt.cmdloop()
+    try:
+        portfolio_prompt.cmdloop()
+    finally:
+        db.close()
+        snapshot_store.save(p, historical)
+
+        # report writes that still failed when retried on close
+        if isinstance(db, WriteBehindDatabase):
+            for error in db.pop_errors():
+                print(f"FAILED TO SAVE CHANGES - {error}")
 
 
 def load_config() -> dict:
@@ -69,6 +103,63 @@ def load_config() -> dict:
         return yaml.safe_load(config_file)
 
 
+def connect_database(config: dict) -> Database:
+    """Connects to the database backend selected in the config
+
+    Args:
+        config (dict): dictionary object representing the config file
+
+    Returns:
+        Database: database instance for the configured backend
+    """
+
+    database_config = config.get("database", {})
+    backend = database_config.get("backend", "mongodb")
+
+    db: Database
+    if backend == "sqlite":
+        db = SqliteDatabase(database_config["sqlite"]["path"])
+    elif backend == "mongodb":
+        db = MongoDatabase(
+            user=config["mongodb"]["username"],
+            password=config["mongodb"]["password"],
+            database=config["mongodb"]["database"],
+            cluster=config["mongodb"]["cluster"],
+        )
+    else:
+        raise ValueError(f"unsupported database backend - {backend}")
+
+    # persist writes on a background worker so commands do not wait on the database
+    if database_config.get("write_behind", False):
+        db = WriteBehindDatabase(db)
+
+    return db
+
+
+def connect_and_reconcile(
+    config: dict,
+    snapshot_store: SnapshotStore,
+    p: Portfolio,
+    historical: Historical,
+) -> tuple[Database, Portfolio, Historical]:
+    """Connects to the database and replaces snapshot objects older than the stored objects
+
+    Args:
+        config (dict): dictionary object representing the config file
+        snapshot_store (SnapshotStore): store the snapshot was loaded from
+        p (Portfolio): portfolio object loaded from the snapshot
+        historical (Historical): historical object loaded from the snapshot
+
+    Returns:
+        tuple[Database, Portfolio, Historical]: database instance, up to date portfolio and historical objects
+    """
+
+    db = connect_database(config)
+    p, historical = snapshot_store.reconcile(db, p, historical)
+
+    return db, p, historical
+
+
 def retrieve_portfolio(db: Database) -> Optional[Portfolio]:
     """Retrieves portfolio specified from the command line
 
@@ -82,16 +173,24 @@ def retrieve_portfolio(db: Database) -> Optional[Portfolio]:
     if len(sys.argv) > 1:
         portfolio_name = sys.argv[1]
     else:
-        # retrieve all portfolios names
-        portfolio_names = db.get_portfolio_names()
+        # retrieve summaries of all portfolios
+        portfolio_summaries = db.list_portfolios()
 
         # display portfolios and wait for user to select
         print("")
         print(
             "No portfolio name provided. Please enter a portfolio name from below list."
         )
-        for name in portfolio_names:
-            print(f"\t- {name}")
+        for summary in portfolio_summaries:
+            last_updated = (
+                summary.last_updated.strftime("%Y-%m-%d %H:%M")
+                if summary.last_updated is not None
+                else "never"
+            )
+            print(
+                f"\t- {summary.name:<20} value = {summary.value:>12,.2f}  "
+                f"ytd = {summary.ytd:>7.2%}  updated = {last_updated}"
+            )
 
         # assign selected portfolio to portfolio
         portfolio_name = input("-> ")
@@ -115,6 +214,22 @@ def retrieve_portfolio(db: Database) -> Optional[Portfolio]:
     return p
 
 
+def log_snapshot(p: Portfolio) -> None:
+    """Outputs cash and equities of the portfolio as of its last snapshot
+
+    Args:
+        p (Portfolio): object representing the portfolio and its holdings
+    """
+
+    print(f"PORTFOLIO ID - {p.id}")
+    print("")
+    print("LAST SNAPSHOT - refreshing")
+    print("---------------------------------")
+
+    log_cash(p)
+    log_equities(p)
+
+
 def log_cash(p: Portfolio) -> None:
     """Outputs cash balance of the portfolio
 
@@ -202,12 +202,8 @@ class CLI:
     def trades(self) -> None:
         """Outputs ten most recent trades in portfolio"""
 
-        trades = sorted(
-            self.portfolio_analyzer.portfolio.trades,
-            key=lambda trade: trade.execution_time,
-            reverse=True,
-        )
-        for i in range(min(len(trades), 10)):
+        trades = self.db.get_recent_trades(self.portfolio_analyzer.portfolio.id)
+        for i in range(len(trades)):
             print(
                 f"{'BUY' if trades[i].shares >= 0 else 'SELL'}"
                 + "\t"
@@ -3,12 +3,17 @@ import os
 from typing import IO
 
 from asset_manager.cli.portfolio_operations import deposit, trade_equity
-from asset_manager.database import Database
-from asset_manager.equity_service import EquityService
+from asset_manager.database import Database, WriteBehindDatabase
+from asset_manager.equity_service import CachedEquityService, EquityService
 from asset_manager.objects import Interval
 from asset_manager.portfolio_analyzer import PortfolioAnalyzer
 from asset_manager.treasury_service import TreasuryService
 from asset_manager.utilities.excel_utility import ExcelUtility
+from asset_manager.utilities.request_scheduler import (
+    Priority,
+    RequestScheduler,
+    request_priority,
+)
 
 
 class CLI(cmd.Cmd):
@@ -20,6 +25,7 @@ class CLI(cmd.Cmd):
         db: Database,
         equity_service: EquityService,
         treasury_service: TreasuryService,
+        request_scheduler: RequestScheduler,
         completekey: str = "tab",
         stdin: IO[str] | None = None,
         stdout: IO[str] | None = None,
@@ -29,6 +35,7 @@ class CLI(cmd.Cmd):
         self.db = db
         self.equity_service = equity_service
         self.treasury_service = treasury_service
+        self.request_scheduler = request_scheduler
         self.excel_utility = ExcelUtility(self.portfolio_analyzer)
 
         # cli config
@@ -84,13 +91,15 @@ class CLI(cmd.Cmd):
         shares = round(float(command[2]), 4)
 
         try:
-            trade_equity(
-                portfolio=self.portfolio_analyzer.portfolio,
-                ticker=ticker,
-                shares=shares,
-                db=self.db,
-                equity_service=self.equity_service,
-            )
+            # trade pricing jumps ahead of any queued bulk refresh requests
+            with request_priority(Priority.INTERACTIVE):
+                trade_equity(
+                    portfolio=self.portfolio_analyzer.portfolio,
+                    ticker=ticker,
+                    shares=shares,
+                    db=self.db,
+                    equity_service=self.equity_service,
+                )
             self.portfolio_analyzer.analyze()
         except Exception as e:
             print("Exception occurred while trying to buy asset. Please view below")
@@ -144,13 +153,15 @@ class CLI(cmd.Cmd):
 
         shares = round(float(shares), 4)
 
-        trade_equity(
-            portfolio=self.portfolio_analyzer.portfolio,
-            ticker=ticker,
-            shares=-shares,
-            db=self.db,
-            equity_service=self.equity_service,
-        )
+        # trade pricing jumps ahead of any queued bulk refresh requests
+        with request_priority(Priority.INTERACTIVE):
+            trade_equity(
+                portfolio=self.portfolio_analyzer.portfolio,
+                ticker=ticker,
+                shares=-shares,
+                db=self.db,
+                equity_service=self.equity_service,
+            )
         self.portfolio_analyzer.analyze()
 
     def do_deposit(self, args: str) -> None:
@@ -224,12 +235,8 @@ class CLI(cmd.Cmd):
             trades
         """
 
-        trades = sorted(
-            self.portfolio_analyzer.portfolio.trades,
-            key=lambda trade: trade.execution_time,
-            reverse=True,
-        )
-        for i in range(min(len(trades), 10)):
+        trades = self.db.get_recent_trades(self.portfolio_analyzer.portfolio.id)
+        for i in range(len(trades)):
             print(
                 f"{'BUY' if trades[i].shares >= 0 else 'SELL'}"
                 + "\t"
@@ -244,13 +251,61 @@ class CLI(cmd.Cmd):
 
         print("")
 
+    def do_stats(self, _) -> None:
+        """
+        Outputs request counters, queue wait times, and quote cache hit rates for the market data providers.
+
+        Usage:
+            stats
+
+        Examples:
+            stats
+        """
+
+        print("provider" + "\t" + "requests" + "\t" + "avg wait" + "\t" + "max wait")
+        for provider, stats in self.request_scheduler.stats().items():
+            print(
+                provider
+                + "\t\t"
+                + str(stats.requests)
+                + "\t\t"
+                + f"{stats.average_wait:.3f}s"
+                + "\t\t"
+                + f"{stats.max_wait:.3f}s"
+            )
+
+        if isinstance(self.equity_service, CachedEquityService):
+            cache_stats = self.equity_service.stats
+            print("")
+            print("quote cache" + "\t" + "hits" + "\t" + "misses" + "\t" + "hit rate")
+            print(
+                "\t\t"
+                + str(cache_stats.hits)
+                + "\t"
+                + str(cache_stats.misses)
+                + "\t"
+                + f"{round(cache_stats.hit_rate * 100, 2)}%"
+            )
+
+        print("")
+
     def do_exit(self, _) -> bool:
         """
         Exits application.
         """
 
+        # persist queued writes before exiting
+        self.db.flush()
         return True
 
+    def postcmd(self, stop: bool, line: str) -> bool:
+        # report writes that failed in the background since the last command
+        if isinstance(self.db, WriteBehindDatabase):
+            for error in self.db.pop_errors():
+                print(f"FAILED TO SAVE CHANGES - {error}")
+
+        return stop
+
     def do_clear(self, _) -> None:
         """
         Clears terminal.
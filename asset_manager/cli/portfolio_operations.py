@@ -15,7 +15,7 @@ def trade_equity(
     equity_service: EquityService,
 ) -> None:
     now = datetime.now()
-    price, previous_day_price = equity_service.get_equity_prices(ticker)
+    price, previous_day_price = equity_service.get_equity_prices_many([ticker])[ticker]
 
     if (price * shares) > portfolio.cash:
         raise ValueError("cash balance is too low to purchase this block of assets")
@@ -46,12 +46,13 @@ def trade_equity(
         if equity.shares == 0:
             portfolio.equities.remove(equity)
 
-    portfolio.trades.append(
-        Trade(ticker=ticker, price=price, shares=shares, execution_time=now)
-    )
     portfolio.cash = round(portfolio.cash - (price * shares), 2)
 
     db.save_portfolio(portfolio)
+    db.insert_trade(
+        portfolio.id,
+        Trade(ticker=ticker, price=price, shares=shares, execution_time=now),
+    )
 
     print(f"successfully added {ticker} to portfolio = {portfolio.name}")
 
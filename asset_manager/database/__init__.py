@@ -1,10 +1,16 @@
-from asset_manager.database.database import Database
+from asset_manager.database.database import MongoDatabase
+from asset_manager.database.database_interface import Database
+from asset_manager.database.snapshot import SnapshotStore
+from asset_manager.database.sqlite import SqliteDatabase
+from asset_manager.database.write_behind import WriteBehindDatabase
 from asset_manager.database.entities import (
     Equity,
     Historical,
     HistoricalData,
+    HistoricalSeries,
     Lot,
     Portfolio,
+    PortfolioSummary,
     Trade,
     Valuation,
 )
@@ -14,8 +20,14 @@ __all__ = [
     "Equity",
     "Historical",
     "HistoricalData",
+    "HistoricalSeries",
     "Lot",
+    "MongoDatabase",
     "Portfolio",
+    "PortfolioSummary",
+    "SnapshotStore",
+    "SqliteDatabase",
     "Trade",
     "Valuation",
+    "WriteBehindDatabase",
 ]
@@ -0,0 +1,77 @@
+from typing import Callable, Union
+
+from asset_manager.database.codegen import compile_decoder
+from asset_manager.database.entities import (
+    EQUITY_FIELDS,
+    LOT_FIELDS,
+    PORTFOLIO_SUMMARY_FIELDS,
+    TRADE_FIELDS,
+    VALUATION_FIELDS,
+    Equity,
+    Lot,
+    Portfolio,
+    PortfolioSummary,
+    Trade,
+    Valuation,
+)
+
+# conversions from stored documents to entities shared by the database backends, the conversions
+# back to documents are the generated to_dict methods of the entities
+
+
+def convert_entity_to_portfolio(portfolio_entity: dict) -> Portfolio:
+    return Portfolio(
+        id=portfolio_entity["_id"],
+        name=portfolio_entity["name"],
+        value=portfolio_entity["value"],
+        cash=portfolio_entity["cash"],
+        equities=[
+            convert_entity_to_equity(equity_entity)
+            for equity_entity in portfolio_entity["equities"]
+        ],
+        valuation=convert_entity_to_valuation(portfolio_entity["valuation"]),
+        version=portfolio_entity.get("version", 0),
+        last_updated=portfolio_entity.get("lastUpdated"),
+    )
+
+
+convert_entity_to_lot: Callable[[dict], Lot] = compile_decoder(Lot, LOT_FIELDS)
+
+convert_entity_to_equity: Callable[[dict], Equity] = compile_decoder(
+    Equity, EQUITY_FIELDS
+)
+
+convert_entity_to_trade: Callable[[dict], Trade] = compile_decoder(Trade, TRADE_FIELDS)
+
+convert_entity_to_valuation: Callable[[dict], Valuation] = compile_decoder(
+    Valuation, VALUATION_FIELDS
+)
+
+convert_entity_to_portfolio_summary: Callable[[dict], PortfolioSummary] = (
+    compile_decoder(PortfolioSummary, PORTFOLIO_SUMMARY_FIELDS)
+)
+
+
+def convert_entities_to_trades(trade_entities: list[dict]) -> list[Trade]:
+    return [convert_entity_to_trade(trade_entity) for trade_entity in trade_entities]
+
+
+def apply_changes(entity: Union[dict, list], changes: dict) -> None:
+    """Applies changes keyed by dotted field path (e.g. equities.3.price) to a stored document
+
+    Args:
+        entity (Union[dict, list]): stored document or nested value, modified in place
+        changes (dict): mapping of dotted field path to its new value
+    """
+
+    for path, value in changes.items():
+        *parents, field = path.split(".")
+
+        target = entity
+        for parent in parents:
+            target = target[int(parent)] if isinstance(target, list) else target[parent]
+
+        if isinstance(target, list):
+            target[int(field)] = value
+        else:
+            target[field] = value
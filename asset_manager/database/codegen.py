@@ -0,0 +1,77 @@
+from typing import Any, Callable, Optional
+
+# attribute name, document key, and for list fields the element class and its field table
+Fields = tuple[tuple[str, str, Optional[tuple[type, tuple]]], ...]
+
+
+def compile_decoder(cls: type, fields: Fields) -> Callable[[dict], Any]:
+    """Generates a function converting stored documents to instances of the slotted entity class
+
+    The generated function assigns the slots directly rather than calling __init__, which avoids
+    the keyword argument handling that dominates the cost of loading many small entities.
+
+    Args:
+        cls (type): entity class with a slot for each field
+        fields (Fields): attribute name, document key, and optional element class and field table of
+            each field
+
+    Returns:
+        Callable[[dict], Any]: function converting a stored document to an entity
+    """
+
+    namespace: dict[str, Any] = {"new": object.__new__, "cls": cls}
+    lines = ["def decode(entity):", "    obj = new(cls)"]
+
+    for attribute, key, element in fields:
+        if element is None:
+            lines.append(f"    obj.{attribute} = entity[{key!r}]")
+        else:
+            namespace[f"decode_{attribute}"] = compile_decoder(*element)
+            lines.append(
+                f"    obj.{attribute} = [decode_{attribute}(e) for e in entity[{key!r}]]"
+            )
+
+    lines.append("    return obj")
+    exec("\n".join(lines), namespace)
+
+    return namespace["decode"]
+
+
+def compile_encoder(fields: Fields) -> Callable[[Any], dict]:
+    """Generates a function converting instances of an entity class to stored documents
+
+    The generated function builds the document in a single expression, with the documents of list
+    elements built inline rather than by calling a method of each element.
+
+    Args:
+        fields (Fields): attribute name, document key, and optional element class and field table of
+            each field
+
+    Returns:
+        Callable[[Any], dict]: function converting an entity to a stored document
+    """
+
+    namespace: dict[str, Any] = {}
+    exec(
+        f"def encode(obj):\n    return {_encoder_expression(fields, 'obj')}", namespace
+    )
+
+    return namespace["encode"]
+
+
+def _encoder_expression(fields: Fields, name: str, depth: int = 0) -> str:
+    items = []
+    for attribute, key, element in fields:
+        if element is None:
+            items.append(f"{key!r}: {name}.{attribute}")
+        else:
+            # each nesting level names its elements separately so inner loops do not shadow outer ones
+            element_name = f"e{depth}"
+            element_expression = _encoder_expression(
+                element[1], element_name, depth + 1
+            )
+            items.append(
+                f"{key!r}: [{element_expression} for {element_name} in {name}.{attribute}]"
+            )
+
+    return "{" + ", ".join(items) + "}"
@@ -1,34 +1,95 @@
+import numpy as np
 from bson import ObjectId
-from datetime import date
-from pymongo import MongoClient
-from typing import Optional
+from datetime import datetime
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    IndexModel,
+    MongoClient,
+    ReplaceOne,
+    UpdateOne,
+)
+from typing import Iterator, Optional
 
+from asset_manager.database.codec import (
+    convert_entities_to_trades,
+    convert_entity_to_portfolio,
+    convert_entity_to_portfolio_summary,
+)
+from asset_manager.database.database_interface import Database
 from asset_manager.database.entities import (
-    Equity,
     Historical,
-    HistoricalData,
-    Lot,
+    HistoricalSeries,
     Portfolio,
+    PortfolioSummary,
     Trade,
-    Valuation,
 )
 
 
-class Database:
+class MongoDatabase(Database):
     def __init__(self, user: str, password: str, database: str, cluster: str) -> None:
         self.connection = f"mongodb+srv://{user}:{password}@{cluster}/{database}?retryWrites=true&w=majority"
         self.client: MongoClient = MongoClient(host=self.connection)
         self.db = self.client.get_database(database)
 
-    def get_portfolio_names(self) -> list[str]:
-        """Returns names of portfolios stored in database
+    def create_indexes(self) -> None:
+        """Creates the indexes the queries of the database rely on
+
+        Note - indexes only need to be created once per database, so this is run as a setup step rather than on
+        every connection. Creating the unique portfolio name index fails if portfolios share a name.
+        """
+
+        self.db.get_collection("portfolio").create_index(
+            [("name", ASCENDING)], unique=True
+        )
+        self.db.get_collection("historical_bucket").create_index(
+            [("portfolioId", ASCENDING), ("date", ASCENDING)], unique=True
+        )
+        self.db.get_collection("trade").create_indexes(
+            [
+                IndexModel(
+                    [
+                        ("portfolioId", ASCENDING),
+                        ("executionTime", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                IndexModel(
+                    [
+                        ("portfolioId", ASCENDING),
+                        ("ticker", ASCENDING),
+                        ("executionTime", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+            ]
+        )
+
+    def list_portfolios(self) -> list[PortfolioSummary]:
+        """Returns summaries of portfolios stored in database ordered by name
+
+        Note - only the summary fields are queried, the holdings of the portfolios are not loaded
 
         Returns:
-            list[str]: list of portfolio names
+            list[PortfolioSummary]: list of portfolio summaries
         """
 
         portfolios = self.db.get_collection("portfolio")
-        return [p["name"] for p in portfolios.find()]
+        portfolio_entities = portfolios.find(
+            {},
+            {
+                "_id": 0,
+                "name": 1,
+                "value": 1,
+                "ytd": "$valuation.ytd",
+                "lastUpdated": {"$ifNull": ["$lastUpdated", None]},
+            },
+        ).sort("name", ASCENDING)
+
+        return [
+            convert_entity_to_portfolio_summary(portfolio_entity)
+            for portfolio_entity in portfolio_entities
+        ]
 
     def get_portfolio_by_name(self, portfolio_name: str) -> Optional[Portfolio]:
         """Returns portfolio object stored in database
@@ -41,72 +102,99 @@ class Database:
         """
 
         portfolios = self.db.get_collection("portfolio")
-        portfolio_entity = portfolios.find_one({"name": portfolio_name})
+        portfolio_entity = portfolios.find_one(
+            {"name": portfolio_name},
+            {
+                "name": 1,
+                "value": 1,
+                "cash": 1,
+                "equities": 1,
+                "valuation": 1,
+                "version": 1,
+                "lastUpdated": 1,
+                "legacyTrades": {"$ne": [{"$type": "$trades"}, "missing"]},
+            },
+        )
 
         if portfolio_entity is None:
             return None
 
-        equities = []
-        for equity_entity in portfolio_entity["equities"]:
-            equities.append(self.__convert_entity_to_equity(equity_entity))
+        if portfolio_entity["legacyTrades"]:
+            self.__migrate_trades(portfolio_entity["_id"])
 
-        trades = []
-        for trade_entity in portfolio_entity["trades"]:
-            trades.append(self.__convert_entity_to_trade(trade_entity))
+        portfolio = convert_entity_to_portfolio(portfolio_entity)
+        portfolio.mark_clean()
 
-        valuation = self.__convert_entity_to_valuation(portfolio_entity["valuation"])
+        return portfolio
 
-        return Portfolio(
-            id=portfolio_entity["_id"],
-            name=portfolio_entity["name"],
-            value=portfolio_entity["value"],
-            cash=portfolio_entity["cash"],
-            equities=equities,
-            trades=trades,
-            valuation=valuation,
-        )
+    def insert_portfolio(self, portfolio: Portfolio) -> None:
+        portfolios = self.db.get_collection("portfolio")
+        portfolios.insert_one(portfolio.to_dict())
 
-    def create_portfolio(self, portfolio_name: str) -> Portfolio:
-        """Creates a new portfolio with the provided name
+    def update_portfolio(self, portfolio_id: ObjectId, changes: dict) -> None:
+        portfolios = self.db.get_collection("portfolio")
+        portfolios.update_one({"_id": portfolio_id}, {"$set": changes})
 
-        Args:
-            portfolio_name (str): name to be used for the portfolio
+    def insert_trade(self, portfolio_id: ObjectId, trade: Trade) -> None:
+        """Appends trade to the trade ledger of the portfolio
 
-        Returns:
-            Portfolio: portfolio object
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+            trade (Trade): executed trade
         """
 
-        portfolio = Portfolio(
-            id=ObjectId(),
-            name=portfolio_name,
-            value=0,
-            cash=0,
-            equities=[],
-            trades=[],
-            valuation=Valuation(
-                current_value=0,
-                ytd=0,
-                pnl=0,
-                realized_pnl=0,
-                year_start_value=0,
-                current_year=date.today().year,
-            ),
-        )
+        trades = self.db.get_collection("trade")
+        trades.insert_one({"portfolioId": portfolio_id, **trade.to_dict()})
 
-        portfolios = self.db.get_collection("portfolio")
-        portfolios.insert_one(portfolio.to_dict())
+    def get_trades(
+        self, portfolio_id: ObjectId, ticker: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Trade]:
+        """Returns trades of the portfolio from most to least recent
 
-        return portfolio
-
-    def save_portfolio(self, portfolio: Portfolio) -> None:
-        """Saves provided portfolio to the database
+        Note - trades are queried lazily one page at a time as the iterator is consumed
 
         Args:
-            portfolio (Portfolio): portfolio object
+            portfolio_id (ObjectId): id of the portfolio
+            ticker (Optional[str]): only return trades of the ticker if provided
+            page_size (int): number of trades queried per request
+
+        Returns:
+            Iterator[Trade]: iterator over the trades of the portfolio
         """
 
-        portfolios = self.db.get_collection("portfolio")
-        portfolios.update_one({"_id": portfolio.id}, {"$set": portfolio.to_dict()})
+        trades = self.db.get_collection("trade")
+        trade_filter: dict = {"portfolioId": portfolio_id}
+        if ticker is not None:
+            trade_filter["ticker"] = ticker
+
+        last_entity = None
+        while True:
+            page_filter = trade_filter
+            if last_entity is not None:
+                # continue after the last trade of the previous page
+                page_filter = {
+                    **trade_filter,
+                    "$or": [
+                        {"executionTime": {"$lt": last_entity["executionTime"]}},
+                        {
+                            "executionTime": last_entity["executionTime"],
+                            "_id": {"$lt": last_entity["_id"]},
+                        },
+                    ],
+                }
+
+            page = list(
+                trades.find(page_filter)
+                .sort([("executionTime", DESCENDING), ("_id", DESCENDING)])
+                .limit(page_size)
+            )
+
+            yield from convert_entities_to_trades(page)
+
+            if len(page) < page_size:
+                return
+
+            last_entity = page[-1]
 
     def get_historical(self, portfolio_id: ObjectId) -> Historical:
         """Returns historical object for the portfolio stored in database
@@ -119,63 +207,166 @@ class Database:
         """
 
         historicals = self.db.get_collection("historical")
-        historical_entity = historicals.find_one({"_id": portfolio_id})
+        historical_entity = historicals.find_one(
+            {"_id": portfolio_id},
+            {
+                "name": 1,
+                "version": 1,
+                "legacy": {"$ne": [{"$type": "$historicalData"}, "missing"]},
+            },
+        )
 
         if historical_entity is None:
             raise Exception("No historical entity availabe - check database!")
 
-        historical_data = []
-        for historical_data_entity in historical_entity["historicalData"]:
-            historical_data.append(
-                HistoricalData(
-                    date=historical_data_entity["date"],
-                    value=historical_data_entity["value"],
-                )
+        if historical_entity["legacy"]:
+            self.__migrate_historical_data(portfolio_id)
+
+        # project the embedded documents of each bucket into arrays of dates and values
+        buckets = list(
+            self.db.get_collection("historical_bucket")
+            .find(
+                {"portfolioId": portfolio_id},
+                {
+                    "_id": 0,
+                    "dates": "$historicalData.date",
+                    "values": "$historicalData.value",
+                },
             )
+            .sort("date", ASCENDING)
+        )
+
+        historical_data = HistoricalSeries(
+            dates=np.array(
+                [d for bucket in buckets for d in bucket["dates"]],
+                dtype="datetime64[ms]",
+            ),
+            values=np.array(
+                [v for bucket in buckets for v in bucket["values"]], dtype=np.float64
+            ),
+        )
 
         return Historical(
             id=historical_entity["_id"],
             name=historical_entity["name"],
             historical_data=historical_data,
+            saved_length=len(historical_data),
+            version=historical_entity.get("version", 0),
+        )
+
+    def append_historical(
+        self,
+        historical_id: ObjectId,
+        name: str,
+        historical_data: HistoricalSeries,
+        version: int,
+    ) -> None:
+        # values are pushed to monthly bucket documents, so the cost only depends on the new values
+        self.db.get_collection("historical_bucket").bulk_write(
+            [
+                UpdateOne(
+                    {"portfolioId": historical_id, "date": month},
+                    {"$push": {"historicalData": {"$each": records}}},
+                    upsert=True,
+                )
+                for month, records in self.__group_by_month(historical_data)
+            ]
         )
 
-    def save_historical(self, historical: Historical) -> None:
         historicals = self.db.get_collection("historical")
-        historicals.update_one({"_id": historical.id}, {"$set": historical.to_dict()})
-
-    def __convert_entity_to_equity(self, equity_entity: dict) -> Equity:
-        return Equity(
-            ticker=equity_entity["ticker"],
-            shares=equity_entity["shares"],
-            weight=equity_entity["weight"],
-            price=equity_entity["price"],
-            year_start_price=equity_entity["yearStartPrice"],
-            ytd=equity_entity["ytd"],
-            previous_day_price=equity_entity["previousDayPrice"],
-            lots=[self.__convert_entity_to_lot(lot) for lot in equity_entity["lots"]],
+        historicals.update_one({"_id": historical_id}, {"$set": {"version": version}})
+
+    def get_versions(self, portfolio_id: ObjectId) -> Optional[tuple[int, int]]:
+        portfolio_entity = self.db.get_collection("portfolio").find_one(
+            {"_id": portfolio_id}, {"version": 1}
+        )
+        historical_entity = self.db.get_collection("historical").find_one(
+            {"_id": portfolio_id}, {"version": 1}
         )
 
-    def __convert_entity_to_trade(self, trade_entity: dict) -> Trade:
-        return Trade(
-            ticker=trade_entity["ticker"],
-            price=trade_entity["price"],
-            shares=trade_entity["shares"],
-            execution_time=trade_entity["executionTime"],
+        if portfolio_entity is None or historical_entity is None:
+            return None
+
+        return portfolio_entity.get("version", 0), historical_entity.get("version", 0)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __migrate_trades(self, portfolio_id: ObjectId) -> None:
+        # move trades embedded in the portfolio document to the trade ledger
+        portfolios = self.db.get_collection("portfolio")
+        legacy_entity = portfolios.find_one({"_id": portfolio_id}, {"trades": 1})
+
+        # nothing to migrate if the portfolio was removed since it was read
+        if legacy_entity is None:
+            return
+
+        # trades are upserted on all of their fields so an interrupted migration can be rerun
+        if len(legacy_entity["trades"]) != 0:
+            self.db.get_collection("trade").bulk_write(
+                [
+                    ReplaceOne(
+                        {"portfolioId": portfolio_id, **trade_entity},
+                        {"portfolioId": portfolio_id, **trade_entity},
+                        upsert=True,
+                    )
+                    for trade_entity in legacy_entity["trades"]
+                ]
+            )
+
+        portfolios.update_one({"_id": portfolio_id}, {"$unset": {"trades": ""}})
+
+    def __migrate_historical_data(self, portfolio_id: ObjectId) -> None:
+        # move values embedded in the historical document to monthly buckets
+        historicals = self.db.get_collection("historical")
+        legacy_entity = historicals.find_one(
+            {"_id": portfolio_id},
+            {"dates": "$historicalData.date", "values": "$historicalData.value"},
         )
 
-    def __convert_entity_to_valuation(self, valuation_entity: dict) -> Valuation:
-        return Valuation(
-            current_value=valuation_entity["currentValue"],
-            ytd=valuation_entity["ytd"],
-            pnl=valuation_entity["pnl"],
-            realized_pnl=valuation_entity["realizedPnl"],
-            year_start_value=valuation_entity["yearStartValue"],
-            current_year=valuation_entity["currentYear"],
+        # nothing to migrate if the historical object was removed since it was read
+        if legacy_entity is None:
+            return
+
+        legacy_data = HistoricalSeries(
+            dates=np.array(legacy_entity["dates"], dtype="datetime64[ms]"),
+            values=np.array(legacy_entity["values"], dtype=np.float64),
         )
 
-    def __convert_entity_to_lot(self, lot_entity: dict) -> Lot:
-        return Lot(
-            shares=lot_entity["shares"],
-            price=lot_entity["price"],
-            execution_time=lot_entity["executionTime"],
+        # buckets are replaced rather than pushed to so an interrupted migration can be rerun
+        if len(legacy_data) != 0:
+            self.db.get_collection("historical_bucket").bulk_write(
+                [
+                    ReplaceOne(
+                        {"portfolioId": portfolio_id, "date": month},
+                        {
+                            "portfolioId": portfolio_id,
+                            "date": month,
+                            "historicalData": records,
+                        },
+                        upsert=True,
+                    )
+                    for month, records in self.__group_by_month(legacy_data)
+                ]
+            )
+
+        historicals.update_one(
+            {"_id": portfolio_id}, {"$unset": {"historicalData": ""}}
         )
+
+    def __group_by_month(
+        self, historical_data: HistoricalSeries
+    ) -> list[tuple[datetime, list[dict]]]:
+        months = historical_data.dates.astype("datetime64[M]")
+        month_starts, start_indices = np.unique(months, return_index=True)
+        end_indices = np.append(start_indices[1:], len(months))
+
+        return [
+            (
+                month_start.astype("datetime64[ms]").astype(datetime),
+                historical_data[start_index:end_index].to_dict(),
+            )
+            for month_start, start_index, end_index in zip(
+                month_starts, start_indices, end_indices
+            )
+        ]
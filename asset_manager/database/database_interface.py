@@ -0,0 +1,228 @@
+from abc import ABC, abstractmethod
+from bson import ObjectId
+from datetime import date, datetime
+from itertools import islice
+from typing import Iterator, Optional
+
+from asset_manager.database.entities import (
+    Historical,
+    HistoricalSeries,
+    Portfolio,
+    PortfolioSummary,
+    Trade,
+    Valuation,
+)
+
+
+class Database(ABC):
+    @abstractmethod
+    def list_portfolios(self) -> list[PortfolioSummary]:
+        """Returns summaries of portfolios stored in database ordered by name
+
+        Note - only the summary fields are queried, the holdings of the portfolios are not loaded
+
+        Returns:
+            list[PortfolioSummary]: list of portfolio summaries
+        """
+        pass
+
+    @abstractmethod
+    def get_portfolio_by_name(self, portfolio_name: str) -> Optional[Portfolio]:
+        """Returns portfolio object stored in database
+
+        Args:
+            portfolio_name (str): name of the portfolio
+
+        Returns:
+            Optional[Portfolio]: portfolio object, returns None if no such portfolio exists
+        """
+        pass
+
+    @abstractmethod
+    def insert_portfolio(self, portfolio: Portfolio) -> None:
+        """Stores a new portfolio in the database
+
+        Args:
+            portfolio (Portfolio): portfolio object
+        """
+        pass
+
+    @abstractmethod
+    def update_portfolio(self, portfolio_id: ObjectId, changes: dict) -> None:
+        """Updates fields of the stored portfolio
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+            changes (dict): mapping of dotted field path (e.g. equities.3.price) to its new value
+        """
+        pass
+
+    @abstractmethod
+    def insert_trade(self, portfolio_id: ObjectId, trade: Trade) -> None:
+        """Appends trade to the trade ledger of the portfolio
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+            trade (Trade): executed trade
+        """
+        pass
+
+    @abstractmethod
+    def get_trades(
+        self, portfolio_id: ObjectId, ticker: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Trade]:
+        """Returns trades of the portfolio from most to least recent
+
+        Note - trades are queried lazily one page at a time as the iterator is consumed
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+            ticker (Optional[str]): only return trades of the ticker if provided
+            page_size (int): number of trades queried per request
+
+        Returns:
+            Iterator[Trade]: iterator over the trades of the portfolio
+        """
+        pass
+
+    @abstractmethod
+    def get_historical(self, portfolio_id: ObjectId) -> Historical:
+        """Returns historical object for the portfolio stored in database
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+
+        Returns:
+            Historical: object containing historical values for the portfolio
+        """
+        pass
+
+    @abstractmethod
+    def append_historical(
+        self,
+        historical_id: ObjectId,
+        name: str,
+        historical_data: HistoricalSeries,
+        version: int,
+    ) -> None:
+        """Appends values to the stored historical values of the portfolio
+
+        Args:
+            historical_id (ObjectId): id of the historical object
+            name (str): name of the portfolio
+            historical_data (HistoricalSeries): values dated after the stored values
+            version (int): version of the historical object including the values
+        """
+        pass
+
+    @abstractmethod
+    def get_versions(self, portfolio_id: ObjectId) -> Optional[tuple[int, int]]:
+        """Returns the stored versions of the portfolio and its historical object
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+
+        Returns:
+            Optional[tuple[int, int]]: portfolio version, historical version, returns None if either does not exist
+        """
+        pass
+
+    def get_portfolio_names(self) -> list[str]:
+        """Returns names of portfolios stored in database
+
+        Returns:
+            list[str]: list of portfolio names
+        """
+
+        return [summary.name for summary in self.list_portfolios()]
+
+    def create_portfolio(self, portfolio_name: str) -> Portfolio:
+        """Creates a new portfolio with the provided name
+
+        Args:
+            portfolio_name (str): name to be used for the portfolio
+
+        Returns:
+            Portfolio: portfolio object
+        """
+
+        portfolio = Portfolio(
+            id=ObjectId(),
+            name=portfolio_name,
+            value=0,
+            cash=0,
+            equities=[],
+            valuation=Valuation(
+                current_value=0,
+                ytd=0,
+                pnl=0,
+                realized_pnl=0,
+                year_start_value=0,
+                current_year=date.today().year,
+            ),
+            last_updated=datetime.now(),
+        )
+
+        self.insert_portfolio(portfolio)
+        portfolio.mark_clean()
+
+        return portfolio
+
+    def save_portfolio(self, portfolio: Portfolio) -> None:
+        """Saves fields of the provided portfolio modified since it was loaded or last saved
+
+        Note - no request is made if the portfolio is unchanged
+
+        Args:
+            portfolio (Portfolio): portfolio object
+        """
+
+        changes = portfolio.pending_changes()
+        if len(changes) == 0:
+            return
+
+        portfolio.version += 1
+        portfolio.last_updated = datetime.now()
+        changes.update(version=portfolio.version, lastUpdated=portfolio.last_updated)
+
+        self.update_portfolio(portfolio.id, changes)
+        portfolio.mark_clean()
+
+    def save_historical(self, historical: Historical) -> None:
+        """Saves values added to the historical object since it was loaded or last saved
+
+        Args:
+            historical (Historical): object containing historical values for the portfolio
+        """
+
+        saved_length = historical.saved_length
+        new_data = historical.historical_data[saved_length:]
+        if len(new_data) == 0:
+            return
+
+        historical.version += 1
+        self.append_historical(
+            historical.id, historical.name, new_data, historical.version
+        )
+        historical.saved_length = len(historical.historical_data)
+
+    def get_recent_trades(self, portfolio_id: ObjectId, count: int = 10) -> list[Trade]:
+        """Returns the most recent trades of the portfolio
+
+        Args:
+            portfolio_id (ObjectId): id of the portfolio
+            count (int): number of trades to return
+
+        Returns:
+            list[Trade]: trades from most to least recent
+        """
+
+        return list(islice(self.get_trades(portfolio_id, page_size=count), count))
+
+    def flush(self) -> None:
+        """Method waits until all writes made so far are persisted"""
+        pass
+
+    def close(self) -> None:
+        """Method flushes pending writes and releases the database connection"""
+        pass
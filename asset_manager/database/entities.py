@@ -1,26 +1,40 @@
-from datetime import datetime
+import builtins
+import numpy as np
+from datetime import date, datetime
+from typing import Iterator, Optional, Union, overload
 
 from bson import ObjectId
 
+from asset_manager.database.codegen import Fields, compile_encoder
+
 
 class Lot:
+    __slots__ = ("shares", "price", "execution_time")
+
     def __init__(self, shares: float, price: float, execution_time: datetime) -> None:
         self.shares = shares
         self.price = price
         self.execution_time = execution_time
 
-    def to_dict(self):
-        return {
-            "shares": self.shares,
-            "price": self.price,
-            "executionTime": self.execution_time,
-        }
+    def to_dict(self) -> dict:
+        return _encode_lot(self)
 
     def __repr__(self) -> str:
         return f"Lot(shares={self.shares}, price={self.price}, execution_time={self.execution_time})"
 
 
 class Equity:
+    __slots__ = (
+        "ticker",
+        "shares",
+        "weight",
+        "price",
+        "year_start_price",
+        "ytd",
+        "previous_day_price",
+        "lots",
+    )
+
     def __init__(
         self,
         ticker: str,
@@ -42,16 +56,7 @@ class Equity:
         self.lots = lots
 
     def to_dict(self) -> dict:
-        return {
-            "ticker": self.ticker,
-            "shares": self.shares,
-            "weight": self.weight,
-            "price": self.price,
-            "previousDayPrice": self.previous_day_price,
-            "yearStartPrice": self.year_start_price,
-            "ytd": self.ytd,
-            "lots": [lot.to_dict() for lot in self.lots],
-        }
+        return _encode_equity(self)
 
     def __repr__(self) -> str:
         return (
@@ -63,6 +68,15 @@ class Equity:
 
 
 class Valuation:
+    __slots__ = (
+        "current_value",
+        "ytd",
+        "pnl",
+        "realized_pnl",
+        "year_start_value",
+        "current_year",
+    )
+
     def __init__(
         self,
         current_value: float,
@@ -80,14 +94,7 @@ class Valuation:
         self.current_year = current_year
 
     def to_dict(self) -> dict:
-        return {
-            "currentValue": self.current_value,
-            "ytd": self.ytd,
-            "pnl": self.pnl,
-            "realizedPnl": self.realized_pnl,
-            "yearStartValue": self.year_start_value,
-            "currentYear": self.current_year,
-        }
+        return _encode_valuation(self)
 
     def __repr__(self) -> str:
         return (
@@ -98,6 +105,8 @@ class Valuation:
 
 
 class Trade:
+    __slots__ = ("ticker", "price", "shares", "execution_time")
+
     def __init__(
         self, ticker: str, price: float, shares: float, execution_time: datetime
     ) -> None:
@@ -107,12 +116,7 @@ class Trade:
         self.execution_time = execution_time
 
     def to_dict(self) -> dict:
-        return {
-            "ticker": self.ticker,
-            "price": self.price,
-            "shares": self.shares,
-            "executionTime": self.execution_time,
-        }
+        return _encode_trade(self)
 
     def __repr__(self) -> str:
         return (
@@ -122,6 +126,18 @@ class Trade:
 
 
 class Portfolio:
+    __slots__ = (
+        "id",
+        "name",
+        "value",
+        "cash",
+        "equities",
+        "valuation",
+        "version",
+        "last_updated",
+        "__snapshot",
+    )
+
     def __init__(
         self,
         id: ObjectId,
@@ -129,17 +145,50 @@ class Portfolio:
         value: float,
         cash: float,
         equities: list[Equity],
-        trades: list[Trade],
         valuation: Valuation,
+        version: int = 0,
+        last_updated: Optional[datetime] = None,
     ) -> None:
         self.id = id
         self.name = name
         self.value = value
         self.cash = cash
         self.equities = equities
-        self.trades = trades
         self.valuation = valuation
 
+        # incremented on every save so copies of the portfolio can be compared
+        self.version = version
+        self.last_updated = last_updated
+
+        # persisted state used to determine modified fields, None if never persisted
+        self.__snapshot: Optional[dict] = None
+
+    def mark_clean(self) -> None:
+        """Method records the current state of the portfolio as persisted"""
+
+        self.__snapshot = self.to_dict()
+
+    def persisted_state(self) -> Optional[dict]:
+        """Returns the state of the portfolio when it was last marked clean
+
+        Returns:
+            Optional[dict]: document of the persisted portfolio, returns None if never persisted
+        """
+
+        return self.__snapshot
+
+    def pending_changes(self) -> dict:
+        """Returns the fields modified since the portfolio was marked clean
+
+        Returns:
+            dict: mapping of dotted field path (e.g. equities.3.price) to its current value
+        """
+
+        if self.__snapshot is None:
+            return self.to_dict()
+
+        return _diff_documents(self.__snapshot, self.to_dict())
+
     def to_dict(self) -> dict:
         return {
             "_id": self.id,
@@ -147,20 +196,46 @@ class Portfolio:
             "value": self.value,
             "cash": self.cash,
             "equities": [equity.to_dict() for equity in self.equities],
-            "trades": [trade.to_dict() for trade in self.trades],
             "valuation": self.valuation.to_dict(),
+            "version": self.version,
+            "lastUpdated": self.last_updated,
         }
 
     def __repr__(self) -> str:
         return (
             f"Portfolio(id={self.id}, name={self.name}, value={self.value}, cash={self.cash}, "
             f"equities={'[..]' if len(self.equities) != 0 else '[]'}, "
-            f"trades={'[..]' if len(self.equities) != 0 else '[]'}), "
-            f"valuation={self.valuation!r}"
+            f"valuation={self.valuation!r})"
+        )
+
+
+class PortfolioSummary:
+    """Summary fields of a stored portfolio used to list portfolios without loading their holdings"""
+
+    __slots__ = ("name", "value", "ytd", "last_updated")
+
+    def __init__(
+        self,
+        name: str,
+        value: float,
+        ytd: float,
+        last_updated: Optional[datetime] = None,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.ytd = ytd
+        self.last_updated = last_updated
+
+    def __repr__(self) -> str:
+        return (
+            f"PortfolioSummary(name={self.name}, value={self.value}, ytd={self.ytd}, "
+            f"last_updated={self.last_updated})"
         )
 
 
 class HistoricalData:
+    __slots__ = ("date", "value")
+
     def __init__(self, date: datetime, value: float) -> None:
         self.date = date
         self.value = value
@@ -172,21 +247,154 @@ class HistoricalData:
         return f"HistoricalData(date={self.date.date()}, value={self.value})"
 
 
+class HistoricalSeries:
+    """Daily portfolio values stored as parallel arrays of dates and values ordered by date"""
+
+    __slots__ = ("dates", "values")
+
+    def __init__(
+        self, dates: Optional[np.ndarray] = None, values: Optional[np.ndarray] = None
+    ) -> None:
+        self.dates = np.asarray(
+            dates if dates is not None else [], dtype="datetime64[ms]"
+        )
+        self.values = np.asarray(values if values is not None else [], dtype=np.float64)
+
+        if len(self.dates) != len(self.values):
+            raise ValueError("historical dates and values must be the same length")
+
+    @classmethod
+    def from_historical_data(
+        cls, historical_data: list[HistoricalData]
+    ) -> "HistoricalSeries":
+        return cls(
+            dates=np.array([hd.date for hd in historical_data], dtype="datetime64[ms]"),
+            values=np.fromiter(
+                (hd.value for hd in historical_data),
+                dtype=np.float64,
+                count=len(historical_data),
+            ),
+        )
+
+    def append(self, historical_data: HistoricalData) -> None:
+        """Method adds a single value to the end of the series
+
+        Args:
+            historical_data (HistoricalData): date and value to add
+        """
+
+        self.extend(np.array([historical_data.date]), np.array([historical_data.value]))
+
+    def extend(self, dates: np.ndarray, values: np.ndarray) -> None:
+        """Method adds values to the end of the series
+
+        Args:
+            dates (np.ndarray): dates of the values to add
+            values (np.ndarray): values to add
+        """
+
+        dates = np.asarray(dates, dtype="datetime64[ms]")
+        values = np.asarray(values, dtype=np.float64)
+
+        if len(dates) != len(values):
+            raise ValueError("historical dates and values must be the same length")
+
+        self.dates = np.concatenate((self.dates, dates))
+        self.values = np.concatenate((self.values, values))
+
+    def slice(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> "HistoricalSeries":
+        """Method returns the part of the series between the start and end dates, both inclusive
+
+        Args:
+            start (Optional[date]): first date to include, defaults to the start of the series
+            end (Optional[date]): last date to include, defaults to the end of the series
+
+        Returns:
+            HistoricalSeries: series of values between the dates
+        """
+
+        start_index = (
+            np.searchsorted(self.dates, np.datetime64(start, "ms"), side="left")
+            if start is not None
+            else 0
+        )
+        end_index = (
+            np.searchsorted(self.dates, np.datetime64(end, "ms"), side="right")
+            if end is not None
+            else len(self.dates)
+        )
+
+        return HistoricalSeries(
+            self.dates[start_index:end_index], self.values[start_index:end_index]
+        )
+
+    def to_dict(self) -> list[dict]:
+        return [
+            {"date": d, "value": v}
+            for d, v in zip(self.dates.astype(datetime).tolist(), self.values.tolist())
+        ]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[HistoricalData]:
+        for d, v in zip(self.dates.astype(datetime).tolist(), self.values.tolist()):
+            yield HistoricalData(date=d, value=v)
+
+    @overload
+    def __getitem__(self, index: int) -> HistoricalData: ...
+
+    @overload
+    def __getitem__(self, index: builtins.slice) -> "HistoricalSeries": ...
+
+    def __getitem__(
+        self, index: Union[int, builtins.slice]
+    ) -> Union[HistoricalData, "HistoricalSeries"]:
+        # builtins.slice is used since the slice method shadows the builtin in the class body
+        if isinstance(index, builtins.slice):
+            return HistoricalSeries(self.dates[index], self.values[index])
+
+        return HistoricalData(
+            date=self.dates[index].astype(datetime), value=float(self.values[index])
+        )
+
+    def __repr__(self) -> str:
+        return f"HistoricalSeries(length={len(self)})"
+
+
 class Historical:
+    __slots__ = ("id", "name", "historical_data", "saved_length", "version")
+
     def __init__(
-        self, id: ObjectId, name: str, historical_data: list[HistoricalData]
+        self,
+        id: ObjectId,
+        name: str,
+        historical_data: Union[HistoricalSeries, list[HistoricalData]],
+        saved_length: int = 0,
+        version: int = 0,
     ) -> None:
         self.id = id
         self.name = name
-        self.historical_data = historical_data
+        self.historical_data = (
+            historical_data
+            if isinstance(historical_data, HistoricalSeries)
+            else HistoricalSeries.from_historical_data(historical_data)
+        )
+
+        # number of leading values already persisted, later values are pushed on save
+        self.saved_length = saved_length
+
+        # incremented on every save so copies of the historical values can be compared
+        self.version = version
 
     def to_dict(self) -> dict:
         return {
             "_id": self.id,
             "name": self.name,
-            "historicalData": [
-                historical_data.to_dict() for historical_data in self.historical_data
-            ],
+            "historicalData": self.historical_data.to_dict(),
+            "version": self.version,
         }
 
     def __repr__(self) -> str:
@@ -194,3 +402,72 @@ class Historical:
             f"Historical(id={self.id}, name={self.name}, "
             f"historicalData={'[..]' if len(self.historical_data) != 0 else '[]'})"
         )
+
+
+# fields of the stored documents of each entity, shared by the generated encoders and decoders
+
+LOT_FIELDS: Fields = (
+    ("shares", "shares", None),
+    ("price", "price", None),
+    ("execution_time", "executionTime", None),
+)
+
+EQUITY_FIELDS: Fields = (
+    ("ticker", "ticker", None),
+    ("shares", "shares", None),
+    ("weight", "weight", None),
+    ("price", "price", None),
+    ("previous_day_price", "previousDayPrice", None),
+    ("year_start_price", "yearStartPrice", None),
+    ("ytd", "ytd", None),
+    ("lots", "lots", (Lot, LOT_FIELDS)),
+)
+
+VALUATION_FIELDS: Fields = (
+    ("current_value", "currentValue", None),
+    ("ytd", "ytd", None),
+    ("pnl", "pnl", None),
+    ("realized_pnl", "realizedPnl", None),
+    ("year_start_value", "yearStartValue", None),
+    ("current_year", "currentYear", None),
+)
+
+TRADE_FIELDS: Fields = (
+    ("ticker", "ticker", None),
+    ("price", "price", None),
+    ("shares", "shares", None),
+    ("execution_time", "executionTime", None),
+)
+
+PORTFOLIO_SUMMARY_FIELDS: Fields = (
+    ("name", "name", None),
+    ("value", "value", None),
+    ("ytd", "ytd", None),
+    ("last_updated", "lastUpdated", None),
+)
+
+_encode_lot = compile_encoder(LOT_FIELDS)
+_encode_equity = compile_encoder(EQUITY_FIELDS)
+_encode_valuation = compile_encoder(VALUATION_FIELDS)
+_encode_trade = compile_encoder(TRADE_FIELDS)
+
+
+def _diff_documents(old: object, new: object, path: str = "") -> dict:
+    # recurse into documents and equal length lists, anything else is replaced whole
+    if isinstance(old, dict) and isinstance(new, dict) and old.keys() == new.keys():
+        changes = {}
+        for key in new:
+            changes.update(_diff_documents(old[key], new[key], f"{path}{key}."))
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = {}
+        for i in range(len(new)):
+            changes.update(_diff_documents(old[i], new[i], f"{path}{i}."))
+        return changes
+
+    if old == new or (old != old and new != new):
+        # unchanged, including values that are nan in both states
+        return {}
+
+    return {path[:-1]: new}
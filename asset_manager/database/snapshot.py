@@ -0,0 +1,134 @@
+import os
+import pickle
+from typing import Optional
+
+from asset_manager.database.codec import convert_entity_to_portfolio
+from asset_manager.database.database_interface import Database
+from asset_manager.database.entities import Historical, HistoricalSeries, Portfolio
+
+
+class SnapshotStore:
+    """Stores the last known state of each portfolio and its historical values on disk
+
+    Snapshots let the summary render before the database responds, and are reconciled with the
+    database by comparing the versions of the portfolio and historical objects.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = (
+            directory
+            if directory is not None
+            else f"{os.getcwd()}/asset_manager/data/snapshot"
+        )
+
+    def load(self, portfolio_name: str) -> Optional[tuple[Portfolio, Historical]]:
+        """Method loads the snapshot of the portfolio
+
+        Args:
+            portfolio_name (str): name of the portfolio
+
+        Returns:
+            Optional[tuple[Portfolio, Historical]]: portfolio and historical objects, returns None if no
+            readable snapshot exists
+        """
+
+        filename = self.__get_filename(portfolio_name)
+        if os.path.exists(filename) is False:
+            return None
+
+        try:
+            with open(filename, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        if snapshot.get("formatVersion") != self.FORMAT_VERSION:
+            return None
+
+        portfolio = convert_entity_to_portfolio(snapshot["portfolio"])
+        portfolio.mark_clean()
+
+        historical_data = HistoricalSeries(snapshot["dates"], snapshot["values"])
+        historical = Historical(
+            id=portfolio.id,
+            name=portfolio.name,
+            historical_data=historical_data,
+            saved_length=len(historical_data),
+            version=snapshot["historicalVersion"],
+        )
+
+        return portfolio, historical
+
+    def save(self, portfolio: Portfolio, historical: Historical) -> None:
+        """Method stores the snapshot of the portfolio
+
+        Note - only the persisted state is stored, since the snapshot is treated as saved when loaded.
+        No snapshot is stored for a portfolio that was never persisted.
+
+        Args:
+            portfolio (Portfolio): portfolio object
+            historical (Historical): object containing historical values for the portfolio
+        """
+
+        document = portfolio.persisted_state()
+        if document is None:
+            return
+
+        saved_length = historical.saved_length
+        saved_data = historical.historical_data[:saved_length]
+
+        snapshot = {
+            "formatVersion": self.FORMAT_VERSION,
+            "portfolio": document,
+            "historicalVersion": historical.version,
+            "dates": saved_data.dates,
+            "values": saved_data.values,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write to temporary file and swap so readers never observe a partial file
+        filename = self.__get_filename(portfolio.name)
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "wb") as snapshot_file:
+            pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_filename, filename)
+
+    def reconcile(
+        self, db: Database, portfolio: Portfolio, historical: Historical
+    ) -> tuple[Portfolio, Historical]:
+        """Method returns the snapshot objects, or the stored objects if the database versions differ
+
+        Note - a database version behind the snapshot means writes queued before the snapshot never
+        reached the database, so the stored objects replace the snapshot in both directions
+
+        Args:
+            db (Database): database instance storing the portfolio
+            portfolio (Portfolio): portfolio object loaded from the snapshot
+            historical (Historical): historical object loaded from the snapshot
+
+        Returns:
+            tuple[Portfolio, Historical]: up to date portfolio and historical objects
+        """
+
+        versions = db.get_versions(portfolio.id)
+        if versions is None:
+            return portfolio, historical
+
+        portfolio_version, historical_version = versions
+
+        if portfolio_version != portfolio.version:
+            remote_portfolio = db.get_portfolio_by_name(portfolio.name)
+            if remote_portfolio is not None:
+                portfolio = remote_portfolio
+
+        if historical_version != historical.version:
+            historical = db.get_historical(portfolio.id)
+
+        return portfolio, historical
+
+    def __get_filename(self, portfolio_name: str) -> str:
+        return f"{self.directory}/{portfolio_name}.pkl"
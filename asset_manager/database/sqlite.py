@@ -0,0 +1,313 @@
+import json
+import numpy as np
+import os
+import sqlite3
+import threading
+from bson import ObjectId
+from datetime import datetime
+from typing import Iterator, Optional
+
+from asset_manager.database.codec import (
+    apply_changes,
+    convert_entity_to_portfolio,
+    convert_entity_to_portfolio_summary,
+    convert_entity_to_trade,
+)
+from asset_manager.database.database_interface import Database
+from asset_manager.database.entities import (
+    Historical,
+    HistoricalSeries,
+    Portfolio,
+    PortfolioSummary,
+    Trade,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolio (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    document TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS trade (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    portfolio_id TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    price REAL NOT NULL,
+    shares REAL NOT NULL,
+    execution_time TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS trade_portfolio_time
+    ON trade (portfolio_id, execution_time DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS trade_portfolio_ticker_time
+    ON trade (portfolio_id, ticker, execution_time DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS historical (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS historical_value (
+    portfolio_id TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (portfolio_id, date)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteDatabase(Database):
+    """Database stored in a local SQLite file
+
+    Portfolios are stored as JSON documents in the same shape as the MongoDB backend, trades and
+    historical values are stored as indexed rows.
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+
+        with self.__lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def list_portfolios(self) -> list[PortfolioSummary]:
+        # the summary fields are extracted in the query rather than decoding whole documents
+        with self.__lock:
+            rows = self.connection.execute(
+                "SELECT name, json_extract(document, '$.value'), "
+                "json_extract(document, '$.valuation.ytd'), "
+                "json_extract(document, '$.lastUpdated.\"$date\"') "
+                "FROM portfolio ORDER BY name"
+            ).fetchall()
+
+        return [
+            convert_entity_to_portfolio_summary(
+                {
+                    "name": row[0],
+                    "value": row[1],
+                    "ytd": row[2],
+                    "lastUpdated": (
+                        datetime.fromisoformat(row[3]) if row[3] is not None else None
+                    ),
+                }
+            )
+            for row in rows
+        ]
+
+    def get_portfolio_by_name(self, portfolio_name: str) -> Optional[Portfolio]:
+        with self.__lock:
+            row = self.connection.execute(
+                "SELECT id, document FROM portfolio WHERE name = ?", (portfolio_name,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        portfolio_entity = _decode_document(row[1])
+        portfolio_entity["_id"] = ObjectId(row[0])
+
+        portfolio = convert_entity_to_portfolio(portfolio_entity)
+        portfolio.mark_clean()
+
+        return portfolio
+
+    def insert_portfolio(self, portfolio: Portfolio) -> None:
+        with self.__lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO portfolio (id, name, document) VALUES (?, ?, ?)",
+                (
+                    str(portfolio.id),
+                    portfolio.name,
+                    _encode_document(portfolio.to_dict()),
+                ),
+            )
+
+    def update_portfolio(self, portfolio_id: ObjectId, changes: dict) -> None:
+        # the document is local so the changes are applied to it and it is rewritten whole
+        with self.__lock, self.connection:
+            (document,) = self.connection.execute(
+                "SELECT document FROM portfolio WHERE id = ?", (str(portfolio_id),)
+            ).fetchone()
+
+            portfolio_entity = _decode_document(document)
+            apply_changes(
+                portfolio_entity,
+                {path: value for path, value in changes.items() if path != "_id"},
+            )
+
+            self.connection.execute(
+                "UPDATE portfolio SET name = ?, document = ? WHERE id = ?",
+                (
+                    portfolio_entity["name"],
+                    _encode_document(portfolio_entity),
+                    str(portfolio_id),
+                ),
+            )
+
+    def insert_trade(self, portfolio_id: ObjectId, trade: Trade) -> None:
+        with self.__lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO trade (portfolio_id, ticker, price, shares, execution_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    str(portfolio_id),
+                    trade.ticker,
+                    trade.price,
+                    trade.shares,
+                    _encode_datetime(trade.execution_time),
+                ),
+            )
+
+    def get_trades(
+        self, portfolio_id: ObjectId, ticker: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Trade]:
+        conditions = "portfolio_id = ?"
+        parameters: tuple = (str(portfolio_id),)
+        if ticker is not None:
+            conditions += " AND ticker = ?"
+            parameters += (ticker,)
+
+        last_row = None
+        while True:
+            page_conditions, page_parameters = conditions, parameters
+            if last_row is not None:
+                # continue after the last trade of the previous page
+                page_conditions += " AND (execution_time, id) < (?, ?)"
+                page_parameters += (last_row[3], last_row[4])
+
+            with self.__lock:
+                page = self.connection.execute(
+                    "SELECT ticker, price, shares, execution_time, id "
+                    f"FROM trade WHERE {page_conditions} "
+                    "ORDER BY execution_time DESC, id DESC LIMIT ?",
+                    page_parameters + (page_size,),
+                ).fetchall()
+
+            for row in page:
+                yield convert_entity_to_trade(
+                    {
+                        "ticker": row[0],
+                        "price": row[1],
+                        "shares": row[2],
+                        "executionTime": datetime.fromisoformat(row[3]),
+                    }
+                )
+
+            if len(page) < page_size:
+                return
+
+            last_row = page[-1]
+
+    def get_historical(self, portfolio_id: ObjectId) -> Historical:
+        with self.__lock:
+            historical_row = self.connection.execute(
+                "SELECT id, name, version FROM historical WHERE id = ?",
+                (str(portfolio_id),),
+            ).fetchone()
+            value_rows = self.connection.execute(
+                "SELECT date, value FROM historical_value "
+                "WHERE portfolio_id = ? ORDER BY date",
+                (str(portfolio_id),),
+            ).fetchall()
+
+        if historical_row is None:
+            raise Exception("No historical entity availabe - check database!")
+
+        values = np.array(value_rows, dtype=np.float64).reshape(-1, 2)
+        historical_data = HistoricalSeries(
+            dates=values[:, 0].astype(np.int64).astype("datetime64[ms]"),
+            values=values[:, 1],
+        )
+
+        return Historical(
+            id=ObjectId(historical_row[0]),
+            name=historical_row[1],
+            historical_data=historical_data,
+            saved_length=len(historical_data),
+            version=historical_row[2],
+        )
+
+    def append_historical(
+        self,
+        historical_id: ObjectId,
+        name: str,
+        historical_data: HistoricalSeries,
+        version: int,
+    ) -> None:
+        with self.__lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO historical (id, name, version) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET version = excluded.version",
+                (str(historical_id), name, version),
+            )
+
+            # insert all new values in a single batch
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO historical_value (portfolio_id, date, value) "
+                "VALUES (?, ?, ?)",
+                zip(
+                    [str(historical_id)] * len(historical_data),
+                    historical_data.dates.astype(np.int64).tolist(),
+                    historical_data.values.tolist(),
+                ),
+            )
+
+    def get_versions(self, portfolio_id: ObjectId) -> Optional[tuple[int, int]]:
+        with self.__lock:
+            portfolio_row = self.connection.execute(
+                "SELECT json_extract(document, '$.version') FROM portfolio WHERE id = ?",
+                (str(portfolio_id),),
+            ).fetchone()
+            historical_row = self.connection.execute(
+                "SELECT version FROM historical WHERE id = ?", (str(portfolio_id),)
+            ).fetchone()
+
+        if portfolio_row is None or historical_row is None:
+            return None
+
+        return portfolio_row[0] or 0, historical_row[0]
+
+    def close(self) -> None:
+        with self.__lock:
+            self.connection.close()
+
+
+def _encode_datetime(value: datetime) -> str:
+    # fixed precision keeps the stored strings sortable
+    return value.isoformat(timespec="microseconds")
+
+
+def _encode_value(value: object) -> object:
+    if isinstance(value, datetime):
+        return {"$date": _encode_datetime(value)}
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode_document(portfolio_entity: dict) -> str:
+    # the id is stored in its own column
+    return json.dumps(
+        {key: value for key, value in portfolio_entity.items() if key != "_id"},
+        default=_encode_value,
+    )
+
+
+def _decode_document(document: str) -> dict:
+    return json.loads(
+        document,
+        object_hook=lambda entity: (
+            datetime.fromisoformat(entity["$date"])
+            if entity.keys() == {"$date"}
+            else entity
+        ),
+    )
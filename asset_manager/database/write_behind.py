@@ -0,0 +1,199 @@
+import queue
+import threading
+from bson import ObjectId
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from asset_manager.database.codec import apply_changes, convert_entity_to_portfolio
+from asset_manager.database.database_interface import Database
+from asset_manager.database.entities import (
+    Historical,
+    HistoricalSeries,
+    Portfolio,
+    PortfolioSummary,
+    Trade,
+)
+
+
+@dataclass
+class _Write:
+    kind: str
+    key: Optional[ObjectId]
+    args: tuple
+
+
+class WriteBehindDatabase(Database):
+    """Database queueing writes to the wrapped database and persisting them on a background worker
+
+    Queued writes to the same portfolio or historical object are merged into a single write. Reads
+    wait for pending writes so they always observe earlier writes. Failed writes are collected for the
+    prompt to report and retried ahead of the next write, so their changes are not lost.
+    """
+
+    def __init__(self, database: Database) -> None:
+        self.database = database
+
+        self.__queue: queue.Queue[Optional[_Write]] = queue.Queue()
+        self.__errors: list[str] = []
+        self.__errors_lock = threading.Lock()
+
+        # only accessed by the worker
+        self.__failed: list[_Write] = []
+
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+
+    def pop_errors(self) -> list[str]:
+        """Method returns the errors of failed writes since it was last called
+
+        Returns:
+            list[str]: descriptions of the failed writes
+        """
+
+        with self.__errors_lock:
+            errors, self.__errors = self.__errors, []
+
+        return errors
+
+    def list_portfolios(self) -> list[PortfolioSummary]:
+        self.flush()
+        return self.database.list_portfolios()
+
+    def get_portfolio_by_name(self, portfolio_name: str) -> Optional[Portfolio]:
+        self.flush()
+        return self.database.get_portfolio_by_name(portfolio_name)
+
+    def insert_portfolio(self, portfolio: Portfolio) -> None:
+        # copy the portfolio so later changes to it are saved separately
+        self.__queue.put(
+            _Write(
+                "insert_portfolio",
+                portfolio.id,
+                (convert_entity_to_portfolio(portfolio.to_dict()),),
+            )
+        )
+
+    def update_portfolio(self, portfolio_id: ObjectId, changes: dict) -> None:
+        self.__queue.put(_Write("update_portfolio", portfolio_id, (changes,)))
+
+    def insert_trade(self, portfolio_id: ObjectId, trade: Trade) -> None:
+        self.__queue.put(_Write("insert_trade", None, (portfolio_id, trade)))
+
+    def get_trades(
+        self, portfolio_id: ObjectId, ticker: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Trade]:
+        self.flush()
+        return self.database.get_trades(portfolio_id, ticker, page_size)
+
+    def get_historical(self, portfolio_id: ObjectId) -> Historical:
+        self.flush()
+        return self.database.get_historical(portfolio_id)
+
+    def append_historical(
+        self,
+        historical_id: ObjectId,
+        name: str,
+        historical_data: HistoricalSeries,
+        version: int,
+    ) -> None:
+        self.__queue.put(
+            _Write("append_historical", historical_id, (name, historical_data, version))
+        )
+
+    def get_versions(self, portfolio_id: ObjectId) -> Optional[tuple[int, int]]:
+        self.flush()
+        return self.database.get_versions(portfolio_id)
+
+    def flush(self) -> None:
+        self.__queue.join()
+
+    def close(self) -> None:
+        self.flush()
+
+        self.__queue.put(None)
+        self.__worker.join()
+
+        self.database.close()
+
+    def __run(self) -> None:
+        while True:
+            batch = [self.__queue.get()]
+
+            # drain writes queued while the previous batch was persisted
+            while True:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # failed writes are retried first so later writes to the same object are merged into them
+            writes, self.__failed = self.__failed, []
+            writes.extend(w for w in batch if w is not None)
+
+            for write in _merge_writes(writes):
+                try:
+                    self.__persist(write)
+                except Exception as e:
+                    self.__failed.append(write)
+                    with self.__errors_lock:
+                        self.__errors.append(f"{write.kind} failed - {e}")
+
+            for _ in batch:
+                self.__queue.task_done()
+
+            if None in batch:
+                return
+
+    def __persist(self, write: _Write) -> None:
+        if write.kind == "insert_portfolio":
+            self.database.insert_portfolio(write.args[0])
+        elif write.kind == "update_portfolio":
+            assert write.key is not None, "portfolio updates are keyed by portfolio id"
+            self.database.update_portfolio(write.key, *write.args)
+        elif write.kind == "insert_trade":
+            self.database.insert_trade(*write.args)
+        elif write.kind == "append_historical":
+            assert write.key is not None, "historical appends are keyed by historical id"
+            self.database.append_historical(write.key, *write.args)
+
+
+def _merge_writes(writes: list[_Write]) -> list[_Write]:
+    merged: list[_Write] = []
+
+    # first write of each kind and key, trades are inserted to another collection so updates and
+    # appends are merged across them
+    first: dict[tuple[str, Optional[ObjectId]], _Write] = {}
+
+    for write in writes:
+        previous = first.get((write.kind, write.key))
+
+        if previous is None:
+            merged.append(write)
+            if write.kind in ("update_portfolio", "append_historical"):
+                first[(write.kind, write.key)] = write
+        elif write.kind == "update_portfolio":
+            previous.args = (_merge_changes(previous.args[0], write.args[0]),)
+        else:
+            combined = HistoricalSeries(previous.args[1].dates, previous.args[1].values)
+            combined.extend(write.args[1].dates, write.args[1].values)
+            previous.args = (write.args[0], combined, write.args[2])
+
+    return merged
+
+
+def _merge_changes(earlier: dict, later: dict) -> dict[str, Any]:
+    merged = dict(earlier)
+
+    for path, value in later.items():
+        # the later value replaces earlier values of the field and of its nested fields
+        for key in [k for k in merged if k == path or k.startswith(f"{path}.")]:
+            del merged[key]
+
+        # a field nested in an earlier value is applied to that value
+        parent = next((k for k in merged if path.startswith(f"{k}.")), None)
+        if parent is None:
+            merged[path] = value
+        else:
+            apply_changes(merged[parent], {path.removeprefix(f"{parent}."): value})
+
+    return merged
@@ -1,5 +1,6 @@
 from asset_manager.equity_service.equity_interface import EquityService
 from asset_manager.equity_service.finnhub import FinnhubService
 from asset_manager.equity_service.yahoo import YahooService
+from asset_manager.equity_service.quote_cache import CachedEquityService
 
-__all__ = ["EquityService", "FinnhubService", "YahooService"]
+__all__ = ["CachedEquityService", "EquityService", "FinnhubService", "YahooService"]
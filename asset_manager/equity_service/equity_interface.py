@@ -1,3 +1,4 @@
+import pandas as pd
 from abc import ABC, abstractmethod
 from datetime import date
 
@@ -18,6 +19,20 @@ class EquityService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_equity_prices_many(
+        self, tickers: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        """Method retrieves the current price and previous day price for multiple equities in bulk
+
+        Args:
+            tickers (list[str]): stock tickers
+
+        Returns:
+            dict[str, tuple[float, float]]: mapping of ticker to current day price, previous day price
+        """
+        pass
+
     @abstractmethod
     def get_price_history(
         self, ticker: str, start_date: date, end_date: date
@@ -34,6 +49,22 @@ class EquityService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_price_history_many(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> pd.DataFrame:
+        """Method retrieves prices for multiple equities between the specified dates in bulk
+
+        Args:
+            tickers (list[str]): stock tickers
+            start_date (date): start date for range (inclusive)
+            end_date (date): end date for range (inclusive)
+
+        Returns:
+            pd.DataFrame: adjusted close prices aligned as a date x ticker matrix, nan where a ticker has no price
+        """
+        pass
+
     @abstractmethod
     def get_equity_year_start_price(self, ticker: str) -> float:
         """Method retrieves the year start price for the equity
@@ -46,6 +77,18 @@ class EquityService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_equity_year_start_prices_many(self, tickers: list[str]) -> dict[str, float]:
+        """Method retrieves the year start price for multiple equities in bulk
+
+        Args:
+            tickers (list[str]): stock tickers
+
+        Returns:
+            dict[str, float]: mapping of ticker to year start price
+        """
+        pass
+
     @abstractmethod
     def update_equity_details(
         self, eq: Equity, time_interval: Interval
@@ -60,3 +103,20 @@ class EquityService(ABC):
             TimeSeriesDetails: object containing statistics for the equity over the interval
         """
         pass
+
+    @abstractmethod
+    def update_equity_details_many(
+        self, equities: list[Equity], time_intervals: list[Interval]
+    ) -> dict[str, dict[Interval, TimeSeriesDetails]]:
+        """Method computes returns, average return, and standard deviation for each equity over every provided interval
+
+        Note - price history for each equity is loaded once and shared across all intervals
+
+        Args:
+            equities (list[Equity]): objects for equities in portfolio
+            time_intervals (list[Interval]): time periods to calculate returns and statistics
+
+        Returns:
+            dict[str, dict[Interval, TimeSeriesDetails]]: mapping of ticker to statistics for each interval
+        """
+        pass
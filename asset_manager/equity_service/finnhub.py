@@ -1,122 +1,234 @@
-import datetime
 import json
-import os
-import requests
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, time, timedelta
+from typing import Optional
 
 from asset_manager.database.entities import Equity
 from asset_manager.equity_service import EquityService
 from asset_manager.equity_service.helpers import (
-    calculate_time_series_details,
-    parse_prices_for_time_interval,
+    calculate_time_series_details_for_intervals,
 )
+from asset_manager.equity_service.price_store import (
+    HISTORY_WINDOW,
+    PriceHistory,
+    PriceStore,
+)
+from asset_manager.equity_service.year_start_cache import YearStartCache
 from asset_manager.objects import Interval, TimeSeriesDetails
+from asset_manager.utilities.http_client import HttpClient
+from asset_manager.utilities.request_scheduler import RequestScheduler
 
 
 class FinnhubService(EquityService):
     # finnhub API constants
-    __STOCK_QUOTE = "https://finnhub.io/api/v1/quote?symbol={}&token={}"
-    __STOCK_DATA = "https://finnhub.io/api/v1/stock/candle?symbol={}&resolution={}&from={}&to={}&token={}"
+    __BASE_URL = "https://finnhub.io/api/v1"
+    __STOCK_QUOTE = "{}/quote?symbol={}&token={}"
+    __STOCK_DATA = "{}/stock/candle?symbol={}&resolution={}&from={}&to={}&token={}"
 
-    def __init__(self, config: dict) -> None:
+    def __init__(
+        self, config: dict, scheduler: Optional[RequestScheduler] = None
+    ) -> None:
         self.__key = config["finnhub"]["key"]
+        self.__base_url = config["finnhub"].get("url", self.__BASE_URL)
+        self.http_client = HttpClient(
+            max_in_flight=config["finnhub"].get("max_in_flight", 8),
+            scheduler=scheduler,
+            provider="finnhub",
+        )
+        self.price_store = PriceStore()
+        self.year_start_cache = YearStartCache()
 
     def get_equity_prices(self, ticker: str) -> tuple[float, float]:
-        api_string = self.__STOCK_QUOTE.format(ticker, self.__key)
-        quote = requests.get(api_string).json()
-        return (round(quote["c"], 2), round(quote["pc"], 2))
+        return self.get_equity_prices_many([ticker])[ticker]
+
+    def get_equity_prices_many(
+        self, tickers: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        # finnhub does not provide a multi-symbol quote endpoint, so quotes are fanned out concurrently
+        quotes = self.http_client.get_json_many(
+            [
+                self.__STOCK_QUOTE.format(self.__base_url, ticker, self.__key)
+                for ticker in tickers
+            ]
+        )
+
+        return {
+            ticker: (round(quote["c"], 2), round(quote["pc"], 2))
+            for ticker, quote in zip(tickers, quotes)
+        }
+
+    def get_price_history(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> dict[date, float]:
+        prices = self.get_price_history_many([ticker], start_date, end_date)[ticker]
+        return {d.date(): price for d, price in prices.dropna().items()}
+
+    def get_price_history_many(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> pd.DataFrame:
+        from_unix = int(datetime.combine(start_date, time()).timestamp())
+        to_unix = int(datetime.combine(end_date, time.max).timestamp())
+
+        # finnhub does not provide a multi-symbol candle endpoint, so requests are fanned out concurrently
+        responses = self.http_client.get_json_many(
+            [
+                self.__STOCK_DATA.format(
+                    self.__base_url, ticker, "D", from_unix, to_unix, self.__key
+                )
+                for ticker in tickers
+            ]
+        )
+
+        prices = {
+            ticker: pd.Series(
+                response.get("c", []),
+                index=pd.to_datetime(response.get("t", []), unit="s").normalize(),
+                dtype=np.float64,
+            )
+            for ticker, response in zip(tickers, responses)
+        }
+
+        history = pd.DataFrame(prices, columns=tickers).sort_index()
+        history.index.name = "date"
+
+        return history
 
     def get_equity_year_start_price(self, ticker: str) -> float:
-        print(f"getting year start price - {ticker}")
-        current_year = datetime.datetime.today().year
+        return self.get_equity_year_start_prices_many([ticker])[ticker]
 
-        # check if year start already exists for the given ticker
-        year_start_file = f"./asset_manager/data/equity/{ticker}/year_start.json"
+    def get_equity_year_start_prices_many(self, tickers: list[str]) -> dict[str, float]:
+        current_year = datetime.today().year
 
-        if os.path.exists(year_start_file):
-            with open(year_start_file, "r") as data_file:
-                year_start_data = json.load(data_file)
+        # check if year start already exists for the given tickers
+        year_start_prices = self.year_start_cache.get_many(tickers, current_year)
+        missing_tickers = [
+            ticker for ticker in tickers if ticker not in year_start_prices
+        ]
 
-            if year_start_data["year"] == current_year:
-                return year_start_data["yearStartPrice"]
-        else:
-            year_start_data = {}
+        if len(missing_tickers) == 0:
+            return year_start_prices
 
+        print(f"getting year start prices - {', '.join(missing_tickers)}")
         first_trading_day = self.__get_first_trading_day_of_year()
         unix_time = int(first_trading_day.timestamp())
 
-        api_string = self.__STOCK_DATA.format(
-            ticker, "D", unix_time, unix_time, self.__key
+        responses = self.http_client.get_json_many(
+            [
+                self.__STOCK_DATA.format(
+                    self.__base_url, ticker, "D", unix_time, unix_time, self.__key
+                )
+                for ticker in missing_tickers
+            ]
         )
-        response = requests.get(api_string).json()
 
-        # need to handle case when first trading day of the year does not have quote for given equity
-        if len(response["c"]) == 0:
-            year_start_price = float(
-                input("ERROR retrieving year strice price, please manually enter = ")
-            )
-        else:
-            year_start_price = response["c"][0]
-
-        # save year start price for ticker to the data folder
-        year_start_data["yearStartPrice"] = year_start_price
-        year_start_data["year"] = current_year
+        fetched_prices: dict[str, float] = {}
+        for ticker, response in zip(missing_tickers, responses):
+            # need to handle case when first trading day of the year does not have quote for given equity
+            if len(response.get("c", [])) == 0:
+                fetched_prices[ticker] = float(
+                    input(
+                        f"ERROR retrieving year start price for {ticker}, please manually enter = "
+                    )
+                )
+            else:
+                fetched_prices[ticker] = response["c"][0]
 
-        with open(year_start_file, "w") as data_file:
-            json.dump(year_start_data, data_file)
+        # save year start prices to the data folder
+        self.year_start_cache.put_many(fetched_prices, current_year)
+        year_start_prices.update(fetched_prices)
 
-        return year_start_price
+        return year_start_prices
 
     def update_equity_details(
         self, eq: Equity, time_interval: Interval
     ) -> TimeSeriesDetails:
-        now_time = datetime.datetime.today()
+        return self.update_equity_details_many([eq], [time_interval])[eq.ticker][
+            time_interval
+        ]
 
-        to_date = now_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        from_date = to_date - datetime.timedelta(days=10 * 365)
+    def update_equity_details_many(
+        self, equities: list[Equity], time_intervals: list[Interval]
+    ) -> dict[str, dict[Interval, TimeSeriesDetails]]:
+        monthly_prices = self.__get_monthly_prices_many([eq.ticker for eq in equities])
 
-        ticker_directory = f"{os.getcwd()}/asset_manager/data/equity/{eq.ticker}"
+        return calculate_time_series_details_for_intervals(
+            monthly_prices, time_intervals
+        )
 
-        if os.path.exists(ticker_directory) is False:
-            os.makedirs(ticker_directory)
+    def __get_monthly_prices_many(self, tickers: list[str]) -> dict[str, np.ndarray]:
+        now_time = datetime.today()
+        to_date = now_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        filename = f"{ticker_directory}/{to_date.date()}.json"
-        response = {}
+        monthly_prices: dict[str, np.ndarray] = {}
+        stale_tickers: list[str] = []
+        from_dates: list[datetime] = []
+
+        for ticker in tickers:
+            history = self.price_store.read(ticker)
+
+            if history is None or len(history.dates) == 0:
+                stale_tickers.append(ticker)
+                from_dates.append(to_date - HISTORY_WINDOW)
+            elif history.as_of < to_date.date():
+                # only request the bars missing since the last stored date
+                last_date: date = history.dates[-1].item()
+                stale_tickers.append(ticker)
+                from_dates.append(
+                    datetime.combine(last_date + timedelta(days=1), time())
+                )
+            else:
+                monthly_prices[ticker] = history.close
+
+        if len(stale_tickers) == 0:
+            return monthly_prices
+
+        print("making request to finnhub.io api")
+        to_unix = int(to_date.replace(day=2).timestamp())
+        responses = self.http_client.get_json_many(
+            [
+                self.__STOCK_DATA.format(
+                    self.__base_url,
+                    ticker,
+                    "M",
+                    int(from_date.timestamp()),
+                    to_unix,
+                    self.__key,
+                )
+                for ticker, from_date in zip(stale_tickers, from_dates)
+            ]
+        )
 
-        if os.path.exists(filename) is False:
-            print("making request to finnhub.io api")
-            from_unix = int(from_date.timestamp())
-            to_unix = int(to_date.replace(day=2).timestamp())
-            api_string = self.__STOCK_DATA.format(
-                eq.ticker, "M", from_unix, to_unix, self.__key
+        for ticker, response in zip(stale_tickers, responses):
+            # finnhub responds with status "no_data" and no candles when the range is empty
+            # finnhub candles are not adjusted, so close is used for both columns
+            close = np.array(response.get("c", []), dtype=np.float64)
+            new_history = PriceHistory(
+                dates=np.array(response.get("t", []), dtype="datetime64[s]").astype(
+                    "datetime64[D]"
+                ),
+                close=close,
+                adjclose=close,
+                as_of=to_date.date(),
             )
-            response = requests.get(api_string).json()
 
-            # save response to file in directory
-            with open(filename, "w") as json_file:
-                json.dump(response, json_file)
-        else:
-            with open(filename, "r") as json_file:
-                response = json.load(json_file)
+            # save response to the price store
+            monthly_prices[ticker] = self.price_store.append(ticker, new_history).close
 
-        monthly_prices = response["c"]
-        time_series = parse_prices_for_time_interval(monthly_prices, time_interval)
+        return monthly_prices
 
-        return calculate_time_series_details(time_series)
-
-    def __get_first_trading_day_of_year(self) -> datetime.datetime:
+    def __get_first_trading_day_of_year(self) -> datetime:
         with open("asset_manager/global_data.json", "r") as data_file:
             global_data = json.load(data_file)
 
-        first_trading_day = datetime.datetime.fromisoformat(
-            global_data["firstTradingDay"]
-        )
-        today_date = datetime.datetime.today().date()
+        first_trading_day = datetime.fromisoformat(global_data["firstTradingDay"])
+        today_date = datetime.today().date()
 
         if first_trading_day.year != today_date.year:
             first_day = input(
                 "Please enter the first trading of the current year (YYYY-MM-DD) = "
             )
-            first_trading_day = datetime.datetime.fromisoformat(first_day)
+            first_trading_day = datetime.fromisoformat(first_day)
             global_data["firstTradingDay"] = first_day
 
             with open("asset_manager/global_data.json", "w") as data_file:
@@ -1,20 +1,19 @@
-from statistics import stdev
-from scipy.stats import gmean
+import numpy as np
 
 from asset_manager.objects import Interval, TimeSeriesDetails
 
 
 def parse_prices_for_time_interval(
-    monthly_prices: list, time_interval: Interval
-) -> list:
+    monthly_prices: np.ndarray, time_interval: Interval
+) -> np.ndarray:
     """Method will parse out the relevant time series array from the monthly stock prices
 
     Args:
-        monthly_prices (list): list of monthly prices for the stock
+        monthly_prices (np.ndarray): monthly prices for the stock
         time_interval (Interval): time period to split prices
 
     Returns:
-        list: list of prices representing the time interval
+        np.ndarray: prices representing the time interval
     """
 
     if time_interval == Interval.MONTH:
@@ -32,34 +31,111 @@ def parse_prices_for_time_interval(
         split_value = 60
     else:
         print("invalid time interval provided!")
-        return []
+        return np.array([])
 
     return monthly_prices[::split_value]
 
 
-def calculate_time_series_details(time_series: list) -> TimeSeriesDetails:
+def calculate_time_series_details_for_intervals(
+    monthly_prices: dict[str, np.ndarray], time_intervals: list[Interval]
+) -> dict[str, dict[Interval, TimeSeriesDetails]]:
+    """Method will calculate the time series details of every stock for each time interval
+
+    Note - each price history is loaded once by the caller and all stocks are computed together per interval
+
+    Args:
+        monthly_prices (dict[str, np.ndarray]): mapping of ticker to monthly prices for the stock
+        time_intervals (list[Interval]): time periods to calculate statistics
+
+    Returns:
+        dict[str, dict[Interval, TimeSeriesDetails]]: mapping of ticker to statistics for each interval
+    """
+
+    tickers = list(monthly_prices)
+    details: dict[str, dict[Interval, TimeSeriesDetails]] = {
+        ticker: {} for ticker in tickers
+    }
+
+    if len(tickers) == 0:
+        return details
+
+    for time_interval in time_intervals:
+        time_series = [
+            parse_prices_for_time_interval(monthly_prices[ticker], time_interval)
+            for ticker in tickers
+        ]
+
+        # left pad shorter histories with nan so every stock fits in one ticker x time matrix
+        max_length = max(len(series) for series in time_series)
+        price_matrix = np.full((len(tickers), max_length), np.nan)
+        for row, series in enumerate(time_series):
+            if len(series) != 0:
+                start = max_length - len(series)
+                price_matrix[row, start:] = series
+
+        for ticker, ticker_details in zip(
+            tickers, calculate_time_series_details_matrix(price_matrix)
+        ):
+            details[ticker][time_interval] = ticker_details
+
+    return details
+
+
+def calculate_time_series_details(time_series: np.ndarray) -> TimeSeriesDetails:
     """Method will calculate the returns array, average return, and risk
 
     Args:
-        time_series (list): list of prices for the time interval
+        time_series (np.ndarray): prices for the time interval
 
     Returns:
         TimeSeriesDetails: object containing statistics for the time series
     """
 
-    total_samples = len(time_series)
+    return calculate_time_series_details_matrix(
+        np.asarray(time_series, dtype=np.float64)[np.newaxis, :]
+    )[0]
 
-    percent_changes = []
-    returns = []
 
-    for i in range(total_samples - 1, 0, -1):
-        present_price = time_series[i]
-        previous_price = time_series[i - 1]
+def calculate_time_series_details_matrix(
+    price_matrix: np.ndarray,
+) -> list[TimeSeriesDetails]:
+    """Method will calculate the returns array, average return, and risk for each row of a ticker x time matrix
 
-        percent_change = present_price / previous_price
-        rate_of_return = percent_change - 1
+    Note - rows may be left padded with nan for stocks with shorter histories
 
-        percent_changes.append(percent_change)
-        returns.append(rate_of_return)
+    Args:
+        price_matrix (np.ndarray): matrix of prices with one row per stock ordered oldest to newest
+
+    Returns:
+        list[TimeSeriesDetails]: statistics for the time series of each row
+    """
 
-    return TimeSeriesDetails(returns, gmean(percent_changes) - 1, stdev(returns))
+    prices = np.atleast_2d(np.asarray(price_matrix, dtype=np.float64))
+
+    # percent changes ordered from most recent to oldest
+    percent_changes = (prices[:, 1:] / prices[:, :-1])[:, ::-1]
+    returns = percent_changes - 1
+
+    valid = ~np.isnan(percent_changes)
+    samples = valid.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # geometric mean computed in log space, sample standard deviation with one degree of freedom
+        avg_returns = (
+            np.exp(np.where(valid, np.log(percent_changes), 0).sum(axis=1) / samples)
+            - 1
+        )
+        means = np.where(valid, returns, 0).sum(axis=1) / samples
+        std_devs = np.sqrt(
+            np.where(valid, (returns - means[:, np.newaxis]) ** 2, 0).sum(axis=1)
+            / (samples - 1)
+        )
+
+    return [
+        TimeSeriesDetails(
+            returns=returns[row][valid[row]],
+            avg_return=float(avg_returns[row]),
+            std_dev=float(std_devs[row]),
+        )
+        for row in range(len(prices))
+    ]
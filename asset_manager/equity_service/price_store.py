@@ -0,0 +1,228 @@
+import glob
+import json
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+# file layout - fixed size header followed by the dates, close, and adjclose columns
+MAGIC = b"AMPS"
+VERSION = 1
+HEADER_DTYPE = np.dtype(
+    [("magic", "S4"), ("version", "<u4"), ("count", "<i8"), ("as_of", "<i8")]
+)
+HEADER_SIZE = 32
+DATE_DTYPE = np.dtype("<i8")
+PRICE_DTYPE = np.dtype("<f8")
+
+# length of the monthly price history kept for each ticker
+HISTORY_WINDOW = timedelta(days=10 * 365)
+
+
+@dataclass
+class PriceHistory:
+    dates: np.ndarray
+    close: np.ndarray
+    adjclose: np.ndarray
+    as_of: date
+
+
+class PriceStore:
+    """Stores price history for each ticker in a single column oriented binary file
+
+    Each file holds a header followed by contiguous int64 dates (days since epoch), float64 close prices,
+    and float64 adjusted close prices. Reads memory map the file and return zero-copy views of each column.
+    """
+
+    FILENAME = "prices.bin"
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = (
+            directory
+            if directory is not None
+            else f"{os.getcwd()}/asset_manager/data/equity"
+        )
+
+    def read(self, ticker: str, mmap: bool = True) -> Optional[PriceHistory]:
+        """Method reads the stored price history for the ticker, migrating legacy cache files if necessary
+
+        Args:
+            ticker (str): stock ticker
+            mmap (bool): memory map the file instead of reading it into memory
+
+        Returns:
+            Optional[PriceHistory]: price history for the ticker, returns None if nothing is stored
+        """
+
+        filename = self.__get_filename(ticker)
+
+        if os.path.exists(filename) is False:
+            self.__migrate_legacy_cache(ticker)
+
+            if os.path.exists(filename) is False:
+                return None
+
+        buffer: np.ndarray
+        if mmap:
+            buffer = np.memmap(filename, dtype=np.uint8, mode="r")
+        else:
+            buffer = np.fromfile(filename, dtype=np.uint8)
+
+        header = np.frombuffer(buffer, dtype=HEADER_DTYPE, count=1)[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise ValueError(f"unrecognized price store file - {filename}")
+
+        count = int(header["count"])
+        dates_offset = HEADER_SIZE
+        close_offset = dates_offset + count * DATE_DTYPE.itemsize
+        adjclose_offset = close_offset + count * PRICE_DTYPE.itemsize
+
+        return PriceHistory(
+            dates=np.frombuffer(
+                buffer, dtype=DATE_DTYPE, count=count, offset=dates_offset
+            ).view("datetime64[D]"),
+            close=np.frombuffer(
+                buffer, dtype=PRICE_DTYPE, count=count, offset=close_offset
+            ),
+            adjclose=np.frombuffer(
+                buffer, dtype=PRICE_DTYPE, count=count, offset=adjclose_offset
+            ),
+            as_of=np.datetime64(int(header["as_of"]), "D").item(),
+        )
+
+    def write(self, ticker: str, history: PriceHistory) -> None:
+        """Method writes the price history for the ticker, replacing any stored history
+
+        Args:
+            ticker (str): stock ticker
+            history (PriceHistory): price history to store
+        """
+
+        count = len(history.dates)
+        if len(history.close) != count or len(history.adjclose) != count:
+            raise ValueError("price history columns must be the same length")
+
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["count"] = count
+        header["as_of"] = np.datetime64(history.as_of, "D").astype(DATE_DTYPE)
+
+        filename = self.__get_filename(ticker)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        # write to temporary file and swap so readers never observe a partial file
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "wb") as price_file:
+            price_file.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+            price_file.write(
+                np.asarray(history.dates, dtype="datetime64[D]")
+                .astype(DATE_DTYPE)
+                .tobytes()
+            )
+            price_file.write(np.asarray(history.close, dtype=PRICE_DTYPE).tobytes())
+            price_file.write(np.asarray(history.adjclose, dtype=PRICE_DTYPE).tobytes())
+
+        os.replace(temp_filename, filename)
+
+    def append(
+        self, ticker: str, history: PriceHistory, window: timedelta = HISTORY_WINDOW
+    ) -> PriceHistory:
+        """Method appends newly fetched prices to the stored history for the ticker
+
+        Note - stored prices on or after the first new date are replaced by the new prices, and prices dated
+        more than the window before the as of date are dropped so the stored history does not grow
+
+        Args:
+            ticker (str): stock ticker
+            history (PriceHistory): price history fetched since the last stored date
+            window (timedelta): length of the price history to keep
+
+        Returns:
+            PriceHistory: combined price history that was stored
+        """
+
+        # read into memory so the file is not mapped while it is replaced
+        existing = self.read(ticker, mmap=False)
+
+        if existing is not None:
+            keep = (
+                existing.dates < history.dates[0]
+                if len(history.dates) != 0
+                else np.ones(len(existing.dates), dtype=bool)
+            )
+            history = PriceHistory(
+                dates=np.concatenate([existing.dates[keep], history.dates]),
+                close=np.concatenate([existing.close[keep], history.close]),
+                adjclose=np.concatenate([existing.adjclose[keep], history.adjclose]),
+                as_of=history.as_of,
+            )
+
+        # the cutoff is rounded down to the start of its month so whole monthly bars are kept
+        cutoff = np.datetime64(history.as_of - window, "M").astype("datetime64[D]")
+        recent = history.dates >= cutoff
+        history = PriceHistory(
+            dates=history.dates[recent],
+            close=history.close[recent],
+            adjclose=history.adjclose[recent],
+            as_of=history.as_of,
+        )
+
+        self.write(ticker, history)
+
+        return history
+
+    def __get_filename(self, ticker: str) -> str:
+        return f"{self.directory}/{ticker}/{self.FILENAME}"
+
+    def __migrate_legacy_cache(self, ticker: str) -> None:
+        """Method converts the most recent monthly csv/json cache file into the price store and removes the old files
+
+        Args:
+            ticker (str): stock ticker
+        """
+
+        legacy_files = sorted(
+            glob.glob(f"{self.directory}/{ticker}/????-??-??.csv")
+            + glob.glob(f"{self.directory}/{ticker}/????-??-??.json"),
+            key=os.path.basename,
+        )
+
+        if len(legacy_files) == 0:
+            return
+
+        latest_file = legacy_files[-1]
+        name, extension = os.path.splitext(os.path.basename(latest_file))
+        as_of = date.fromisoformat(name)
+
+        if extension == ".csv":
+            price_data = pd.read_csv(latest_file)
+            dates = np.array(
+                [str(d)[:10] for d in price_data["date"]], dtype="datetime64[D]"
+            )
+            close = price_data["close"].to_numpy(dtype=PRICE_DTYPE)
+            adjclose = (
+                price_data["adjclose"].to_numpy(dtype=PRICE_DTYPE)
+                if "adjclose" in price_data
+                else close
+            )
+        else:
+            with open(latest_file, "r") as json_file:
+                response = json.load(json_file)
+
+            dates = np.array(response["t"], dtype="datetime64[s]").astype(
+                "datetime64[D]"
+            )
+            close = np.array(response["c"], dtype=PRICE_DTYPE)
+            adjclose = close
+
+        print(f"migrating cached prices for {ticker} to price store")
+        self.write(
+            ticker,
+            PriceHistory(dates=dates, close=close, adjclose=adjclose, as_of=as_of),
+        )
+
+        for legacy_file in legacy_files:
+            os.remove(legacy_file)
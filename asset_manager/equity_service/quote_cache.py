@@ -0,0 +1,190 @@
+import pandas as pd
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from asset_manager.database.entities import Equity
+from asset_manager.equity_service.equity_interface import EquityService
+from asset_manager.objects import Interval, TimeSeriesDetails
+
+# regular trading session of US equity markets
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def is_market_open(now: datetime) -> bool:
+    """Returns whether the regular trading session is open at the given time
+
+    Note - exchange holidays are not taken into account
+
+    Args:
+        now (datetime): timezone aware time to check
+
+    Returns:
+        bool: indicator of whether the market is open
+    """
+
+    market_now = now.astimezone(MARKET_TIMEZONE)
+    return market_now.weekday() < 5 and MARKET_OPEN <= market_now.time() < MARKET_CLOSE
+
+
+def next_market_open(now: datetime) -> datetime:
+    """Returns the start of the next regular trading session after the given time
+
+    Args:
+        now (datetime): timezone aware time to start from
+
+    Returns:
+        datetime: timezone aware time of the next market open
+    """
+
+    market_now = now.astimezone(MARKET_TIMEZONE)
+    open_date = market_now.date()
+
+    if market_now.time() >= MARKET_OPEN:
+        open_date += timedelta(days=1)
+
+    while open_date.weekday() >= 5:
+        open_date += timedelta(days=1)
+
+    return datetime.combine(open_date, MARKET_OPEN, tzinfo=MARKET_TIMEZONE)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total != 0 else 0
+
+
+class CachedEquityService(EquityService):
+    """Equity service caching quotes of the wrapped service
+
+    Quotes fetched while the market is open expire after the ttl, and quotes fetched while the market is closed
+    remain valid until the next open. The least recently used quotes are evicted once max_size is reached.
+    """
+
+    def __init__(
+        self,
+        equity_service: EquityService,
+        ttl: float = 60,
+        max_size: int = 512,
+        clock: Optional[Callable[[], datetime]] = None,
+    ) -> None:
+        self.equity_service = equity_service
+        self.ttl = timedelta(seconds=ttl)
+        self.max_size = max_size
+        self.clock = (
+            clock if clock is not None else lambda: datetime.now(tz=MARKET_TIMEZONE)
+        )
+
+        self.__quotes: OrderedDict[str, tuple[datetime, tuple[float, float]]] = (
+            OrderedDict()
+        )
+        self.__lock = threading.Lock()
+        self.__stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(
+                hits=self.__stats.hits,
+                misses=self.__stats.misses,
+                evictions=self.__stats.evictions,
+            )
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Method removes the cached quote for the ticker, or every cached quote when no ticker is provided
+
+        Args:
+            ticker (Optional[str]): stock ticker
+        """
+
+        with self.__lock:
+            if ticker is None:
+                self.__quotes.clear()
+            else:
+                self.__quotes.pop(ticker, None)
+
+    def get_equity_prices(self, ticker: str) -> tuple[float, float]:
+        return self.get_equity_prices_many([ticker])[ticker]
+
+    def get_equity_prices_many(
+        self, tickers: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        now = self.clock()
+        prices: dict[str, tuple[float, float]] = {}
+        missing_tickers: list[str] = []
+
+        with self.__lock:
+            for ticker in tickers:
+                cached = self.__quotes.get(ticker)
+
+                if cached is not None and now < cached[0]:
+                    self.__quotes.move_to_end(ticker)
+                    self.__stats.hits += 1
+                    prices[ticker] = cached[1]
+                else:
+                    self.__stats.misses += 1
+                    missing_tickers.append(ticker)
+
+        if len(missing_tickers) == 0:
+            return prices
+
+        # fetch all misses in a single bulk request
+        fetched_prices = self.equity_service.get_equity_prices_many(missing_tickers)
+        expires = self.__get_expiry(now)
+
+        with self.__lock:
+            for ticker, price in fetched_prices.items():
+                self.__quotes[ticker] = (expires, price)
+                self.__quotes.move_to_end(ticker)
+
+            while len(self.__quotes) > self.max_size:
+                self.__quotes.popitem(last=False)
+                self.__stats.evictions += 1
+
+        prices.update(fetched_prices)
+        return prices
+
+    def get_price_history(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> dict[date, float]:
+        return self.equity_service.get_price_history(ticker, start_date, end_date)
+
+    def get_price_history_many(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> pd.DataFrame:
+        return self.equity_service.get_price_history_many(tickers, start_date, end_date)
+
+    def get_equity_year_start_price(self, ticker: str) -> float:
+        return self.equity_service.get_equity_year_start_price(ticker)
+
+    def get_equity_year_start_prices_many(self, tickers: list[str]) -> dict[str, float]:
+        return self.equity_service.get_equity_year_start_prices_many(tickers)
+
+    def update_equity_details(
+        self, eq: Equity, time_interval: Interval
+    ) -> TimeSeriesDetails:
+        return self.equity_service.update_equity_details(eq, time_interval)
+
+    def update_equity_details_many(
+        self, equities: list[Equity], time_intervals: list[Interval]
+    ) -> dict[str, dict[Interval, TimeSeriesDetails]]:
+        return self.equity_service.update_equity_details_many(equities, time_intervals)
+
+    def __get_expiry(self, now: datetime) -> datetime:
+        # quotes do not change while the market is closed
+        if is_market_open(now):
+            return now + self.ttl
+
+        return next_market_open(now)
@@ -1,77 +1,207 @@
-import os
+import numpy as np
 import pandas as pd
 from datetime import date, datetime, timedelta
+from typing import Optional
 from yahooquery import Ticker
 
 from asset_manager.database.entities import Equity
 from asset_manager.equity_service import EquityService
 from asset_manager.equity_service.helpers import (
-    calculate_time_series_details,
-    parse_prices_for_time_interval,
+    calculate_time_series_details_for_intervals,
 )
+from asset_manager.equity_service.price_store import (
+    HISTORY_WINDOW,
+    PriceHistory,
+    PriceStore,
+)
+from asset_manager.equity_service.year_start_cache import YearStartCache
 from asset_manager.objects import Interval, TimeSeriesDetails
+from asset_manager.utilities.request_scheduler import RequestScheduler
 
 
 class YahooService(EquityService):
-    def __init__(self) -> None:
-        pass
+    def __init__(self, scheduler: Optional[RequestScheduler] = None) -> None:
+        self.scheduler = scheduler
+        self.price_store = PriceStore()
+        self.year_start_cache = YearStartCache()
 
     def get_equity_prices(self, ticker: str) -> tuple[float, float]:
-        stock = Ticker(ticker)
-        price_info = stock.price[ticker]
-        return (
-            round(price_info["regularMarketPrice"], 2),
-            round(price_info["regularMarketPreviousClose"], 2),
-        )
+        return self.get_equity_prices_many([ticker])[ticker]
+
+    def get_equity_prices_many(
+        self, tickers: list[str]
+    ) -> dict[str, tuple[float, float]]:
+        if len(tickers) == 0:
+            return {}
+
+        # single request for all symbols
+        stocks = Ticker(tickers)
+        self.__acquire()
+        price_infos = stocks.price
+
+        prices = {}
+        for ticker in tickers:
+            price_info = price_infos[ticker]
+
+            # yahooquery returns an error message in place of the quote for invalid symbols
+            if isinstance(price_info, str):
+                raise ValueError(
+                    f"unable to retrieve price for {ticker} - {price_info}"
+                )
+
+            prices[ticker] = (
+                round(price_info["regularMarketPrice"], 2),
+                round(price_info["regularMarketPreviousClose"], 2),
+            )
+
+        return prices
 
     def get_price_history(
         self, ticker: str, start_date: date, end_date: date
     ) -> dict[date, float]:
-        stock = Ticker(ticker)
-        history = stock.history(start=start_date, end=end_date + timedelta(days=1))
-        prices: pd.Series = history.loc[ticker]["adjclose"]
+        prices = self.get_price_history_many([ticker], start_date, end_date)[ticker]
+        return {d.date(): price for d, price in prices.dropna().items()}
+
+    def get_price_history_many(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> pd.DataFrame:
+        empty_history = pd.DataFrame(
+            columns=tickers, index=pd.DatetimeIndex([], name="date"), dtype=np.float64
+        )
 
-        return prices.to_dict()
+        if len(tickers) == 0:
+            return empty_history
+
+        # single history request for all symbols
+        stocks = Ticker(tickers)
+        self.__acquire()
+        history = stocks.history(start=start_date, end=end_date + timedelta(days=1))
+
+        # yahooquery returns a message instead of a dataframe when there is no data in the range
+        if not isinstance(history, pd.DataFrame) or history.empty:
+            return empty_history
+
+        # the latest row may be an intraday timestamp, so every row is normalized to its date
+        prices = pd.DataFrame(
+            {
+                "symbol": history.index.get_level_values("symbol"),
+                "date": pd.to_datetime(
+                    [str(d)[:10] for d in history.index.get_level_values("date")]
+                ),
+                "adjclose": history["adjclose"].to_numpy(dtype=np.float64),
+            }
+        )
+
+        return prices.pivot_table(
+            index="date", columns="symbol", values="adjclose", aggfunc="last"
+        ).reindex(columns=tickers)
 
     def get_equity_year_start_price(self, ticker: str) -> float:
-        print(f"getting year start price - {ticker}")
+        return self.get_equity_year_start_prices_many([ticker])[ticker]
+
+    def get_equity_year_start_prices_many(self, tickers: list[str]) -> dict[str, float]:
         current_year = datetime.today().year
 
-        stock = Ticker(ticker)
-        stock_history = stock.history(
+        # check if year start already exists for the given tickers
+        year_start_prices = self.year_start_cache.get_many(tickers, current_year)
+        missing_tickers = [
+            ticker for ticker in tickers if ticker not in year_start_prices
+        ]
+
+        if len(missing_tickers) == 0:
+            return year_start_prices
+
+        print(f"getting year start prices - {', '.join(missing_tickers)}")
+
+        # single history request for all missing symbols
+        stocks = Ticker(missing_tickers)
+        self.__acquire()
+        stock_history = stocks.history(
             start=f"{current_year}-01-01", end=f"{current_year}-01-07"
         )
 
-        return stock_history.iloc[0]["open"]
+        fetched_prices = {
+            ticker: float(stock_history.loc[ticker].iloc[0]["open"])
+            for ticker in missing_tickers
+        }
+
+        # save year start prices to the data folder
+        self.year_start_cache.put_many(fetched_prices, current_year)
+        year_start_prices.update(fetched_prices)
+
+        return year_start_prices
 
     def update_equity_details(
         self, eq: Equity, time_interval: Interval
     ) -> TimeSeriesDetails:
-        now_time = datetime.today()
+        return self.update_equity_details_many([eq], [time_interval])[eq.ticker][
+            time_interval
+        ]
+
+    def update_equity_details_many(
+        self, equities: list[Equity], time_intervals: list[Interval]
+    ) -> dict[str, dict[Interval, TimeSeriesDetails]]:
+        return calculate_time_series_details_for_intervals(
+            {eq.ticker: self.__get_monthly_prices(eq.ticker) for eq in equities},
+            time_intervals,
+        )
 
+    def __get_monthly_prices(self, ticker: str) -> np.ndarray:
+        now_time = datetime.today()
         to_date = now_time.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        from_date = to_date - timedelta(days=10 * 365)
-
-        ticker_directory = f"{os.getcwd()}/asset_manager/data/equity/{eq.ticker}"
 
-        if os.path.exists(ticker_directory) is False:
-            os.makedirs(ticker_directory)
+        history = self.price_store.read(ticker)
 
-        filename = f"{ticker_directory}/{to_date.date()}.csv"
+        if history is None or len(history.dates) == 0:
+            print("making request to yahoofinance api")
+            from_date = to_date - HISTORY_WINDOW
+            history = self.__get_monthly_history(
+                ticker, from_date.date(), to_date.date()
+            )
 
-        if os.path.exists(filename) is False:
+            # save response to the price store
+            self.price_store.write(ticker, history)
+        elif history.as_of < to_date.date():
+            # only request the bars missing since the last stored date
             print("making request to yahoofinance api")
-            stock = Ticker(eq.ticker)
-            price_data = stock.history(
-                start=from_date.date(), end=to_date.date(), interval="1mo"
+            last_date: date = history.dates[-1].item()
+            history = self.price_store.append(
+                ticker,
+                self.__get_monthly_history(
+                    ticker, last_date + timedelta(days=1), to_date.date()
+                ),
+            )
+
+        return history.close
+
+    def __get_monthly_history(
+        self, ticker: str, from_date: date, to_date: date
+    ) -> PriceHistory:
+        stock = Ticker(ticker)
+        self.__acquire()
+        price_data = stock.history(start=from_date, end=to_date, interval="1mo")
+
+        # yahooquery returns a message instead of a dataframe when there is no data in the range
+        if not isinstance(price_data, pd.DataFrame) or price_data.empty:
+            return PriceHistory(
+                dates=np.array([], dtype="datetime64[D]"),
+                close=np.array([], dtype=np.float64),
+                adjclose=np.array([], dtype=np.float64),
+                as_of=to_date,
             )
 
-            # save response to file in directory
-            price_data.to_csv(filename)
-        else:
-            price_data = pd.read_csv(filename)
+        price_data = price_data.loc[ticker]
 
-        monthly_prices = list(price_data["close"])
-        time_series = parse_prices_for_time_interval(monthly_prices, time_interval)
+        return PriceHistory(
+            dates=np.array(
+                [str(d)[:10] for d in price_data.index], dtype="datetime64[D]"
+            ),
+            close=price_data["close"].to_numpy(dtype=np.float64),
+            adjclose=price_data["adjclose"].to_numpy(dtype=np.float64),
+            as_of=to_date,
+        )
 
-        return calculate_time_series_details(time_series)
+    def __acquire(self) -> None:
+        # yahooquery sends the requests itself, so each call waits for the quota before it is made
+        if self.scheduler is not None:
+            self.scheduler.acquire("yahoo")
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from typing import Optional
+
+
+class YearStartCache:
+    """Persists year start prices keyed by year and ticker in a single file shared by all equity services"""
+
+    FILENAME = "year_start.json"
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = (
+            directory
+            if directory is not None
+            else f"{os.getcwd()}/asset_manager/data/equity"
+        )
+        self.filename = f"{self.directory}/{self.FILENAME}"
+        self.__lock = threading.Lock()
+
+    def get_many(self, tickers: list[str], year: int) -> dict[str, float]:
+        """Method returns the cached year start prices for the tickers
+
+        Args:
+            tickers (list[str]): stock tickers
+            year (int): year of the year start prices
+
+        Returns:
+            dict[str, float]: mapping of ticker to year start price, tickers without a cached price are omitted
+        """
+
+        with self.__lock:
+            year_start_data = self.__read()
+            year_prices = year_start_data.get(str(year), {})
+
+            prices = {}
+            migrated = False
+            for ticker in tickers:
+                if ticker in year_prices:
+                    prices[ticker] = year_prices[ticker]
+                    continue
+
+                legacy_price = self.__read_legacy(ticker, year)
+                if legacy_price is not None:
+                    year_prices[ticker] = legacy_price
+                    prices[ticker] = legacy_price
+                    migrated = True
+
+            if migrated:
+                year_start_data[str(year)] = year_prices
+                self.__write(year_start_data)
+
+            return prices
+
+    def put_many(self, prices: dict[str, float], year: int) -> None:
+        """Method caches year start prices for the tickers
+
+        Args:
+            prices (dict[str, float]): mapping of ticker to year start price
+            year (int): year of the year start prices
+        """
+
+        if len(prices) == 0:
+            return
+
+        with self.__lock:
+            year_start_data = self.__read()
+            year_start_data.setdefault(str(year), {}).update(prices)
+            self.__write(year_start_data)
+
+    def __read(self) -> dict:
+        if os.path.exists(self.filename) is False:
+            return {}
+
+        with open(self.filename, "r") as data_file:
+            return json.load(data_file)
+
+    def __write(self, year_start_data: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write to temporary file and swap so readers never observe a partial file
+        temp_filename = f"{self.filename}.tmp"
+        with open(temp_filename, "w") as data_file:
+            json.dump(year_start_data, data_file)
+
+        os.replace(temp_filename, self.filename)
+
+    def __read_legacy(self, ticker: str, year: int) -> Optional[float]:
+        # finnhub previously cached a single year start price per ticker directory
+        legacy_file = f"{self.directory}/{ticker}/{self.FILENAME}"
+
+        if os.path.exists(legacy_file) is False:
+            return None
+
+        with open(legacy_file, "r") as data_file:
+            legacy_data = json.load(data_file)
+
+        if legacy_data.get("year") != year:
+            return None
+
+        return legacy_data["yearStartPrice"]
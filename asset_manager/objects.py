@@ -1,3 +1,4 @@
+import numpy as np
 from dataclasses import dataclass
 from enum import Enum
 
@@ -12,6 +13,6 @@ class Interval(Enum):
 
 @dataclass
 class TimeSeriesDetails:
-    returns: list
+    returns: np.ndarray
     avg_return: float
     std_dev: float
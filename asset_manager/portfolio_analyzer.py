@@ -1,5 +1,6 @@
 import math
 import numpy as np
+import pandas as pd
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Optional
@@ -37,6 +38,9 @@ class PortfolioAnalyzer:
         self.W: dict[Interval, np.ndarray] = defaultdict()
         self.M: dict[Interval, np.ndarray] = defaultdict()
         self.C: dict[Interval, np.ndarray] = defaultdict()
+        self.C_factorization: dict[
+            Interval, Optional[mf.FactorizedMatrix]
+        ] = defaultdict()
 
         self.expected_return: dict[Interval, float] = defaultdict()
         self.variance: dict[Interval, Optional[float]] = defaultdict()
@@ -83,36 +87,33 @@ class PortfolioAnalyzer:
         if self.portfolio.equities is None:
             return
 
-        for eq in self.portfolio.equities:
-            eq.price, eq.previous_day_price = self.equity_service.get_equity_prices(
-                eq.ticker
-            )
+        # retrieve current prices for all equities in a single request
+        prices = self.equity_service.get_equity_prices_many(
+            [eq.ticker for eq in self.portfolio.equities]
+        )
+
+        # retrieve time interval details for all stocks, loading each price history once
+        equity_details = self.equity_service.update_equity_details_many(
+            self.portfolio.equities,
+            [Interval.MONTH, Interval.THREE_MONTH, Interval.SIX_MONTH, Interval.YEAR],
+        )
 
-            # retrieve time interval details for the stock
-            self.ticker_to_timeseries[eq.ticker][
-                Interval.MONTH
-            ] = self.equity_service.update_equity_details(eq, Interval.MONTH)
-            self.ticker_to_timeseries[eq.ticker][
-                Interval.THREE_MONTH
-            ] = self.equity_service.update_equity_details(eq, Interval.THREE_MONTH)
-            self.ticker_to_timeseries[eq.ticker][
-                Interval.SIX_MONTH
-            ] = self.equity_service.update_equity_details(eq, Interval.SIX_MONTH)
-            self.ticker_to_timeseries[eq.ticker][
-                Interval.YEAR
-            ] = self.equity_service.update_equity_details(eq, Interval.YEAR)
-            # self.ticker_to_timeseries[eq.ticker][
-            #     Interval.FIVE_YEAR
-            # ] = self.equity_service.update_equity_details(eq, Interval.FIVE_YEAR)
-
-            # get the year start price of the stock
-            if (
-                eq.year_start_price is None
+        # get the year start price of the stocks missing one for the current year
+        year_start_prices = self.equity_service.get_equity_year_start_prices_many(
+            [
+                eq.ticker
+                for eq in self.portfolio.equities
+                if eq.year_start_price is None
                 or self.current_year != self.portfolio.valuation.current_year
-            ):
-                eq.year_start_price = self.equity_service.get_equity_year_start_price(
-                    eq.ticker
-                )
+            ]
+        )
+
+        for eq in self.portfolio.equities:
+            eq.price, eq.previous_day_price = prices[eq.ticker]
+            self.ticker_to_timeseries[eq.ticker].update(equity_details[eq.ticker])
+
+            if eq.ticker in year_start_prices:
+                eq.year_start_price = year_start_prices[eq.ticker]
 
             eq.ytd = (eq.price / eq.year_start_price) - 1
 
@@ -160,40 +161,20 @@ class PortfolioAnalyzer:
         if last_historical_date == today:
             return
 
-        # get pricing data for each equity
-        pricing_data: dict[str, dict[date, float]] = {}
-        for eq in self.portfolio.equities:
-            pricing_data[eq.ticker] = self.equity_service.get_price_history(
-                ticker=eq.ticker, start_date=(last_historical_date - timedelta(weeks=1)), end_date=today
-            )
-
         # determine if we need to backfill portfolio values
-        current_date = last_historical_date + timedelta(days=1)
-        while current_date < today:
-            # check pricing data exists on the date to fill
-            pricing_date = current_date
-            while (
-                pricing_data[self.portfolio.equities[0].ticker].get(pricing_date) is None
-            ):
-                pricing_date -= timedelta(days=1)
-
-            # calculate portfolio value using pricing data and pricing date
-            value = self.compute_total_value_on_date(pricing_date, pricing_data)
-
-            # add historical data entry
-            self.historical.historical_data.append(
-                HistoricalData(
-                    date=datetime(
-                        year=current_date.year,
-                        month=current_date.month,
-                        day=current_date.day,
-                    ),
-                    value=value,
-                )
-            )
+        backfill_dates = pd.date_range(
+            start=last_historical_date + timedelta(days=1),
+            end=today - timedelta(days=1),
+            freq="D",
+        )
+        backfill_values = self.compute_total_values_on_dates(
+            backfill_dates, start_date=last_historical_date - timedelta(weeks=1)
+        )
 
-            # go to next date to backfill
-            current_date += timedelta(days=1)
+        # add historical data entries for the backfilled dates
+        self.historical.historical_data.extend(
+            backfill_dates.to_numpy(), backfill_values
+        )
 
         # update historical data for current date
         self.historical.historical_data.append(
@@ -236,15 +217,45 @@ class PortfolioAnalyzer:
 
         return total_value
 
-    def compute_total_value_on_date(
-        self, target_date: date, pricing_data: dict[str, dict[date, float]]
-    ) -> float:
-        total_value = self.portfolio.cash
+    def compute_total_values_on_dates(
+        self, target_dates: pd.DatetimeIndex, start_date: date
+    ) -> np.ndarray:
+        """Method computes the total value of all assets in the portfolio on each of the target dates
 
-        for eq in self.portfolio.equities:
-            total_value += pricing_data[eq.ticker][target_date] * eq.shares
+        Note - dates without a price use the most recent prior price, and equities without any price
+        in the range use their current price
+
+        Args:
+            target_dates (pd.DatetimeIndex): dates to value the portfolio on
+            start_date (date): start date of the price history used to seed the earliest target dates
+
+        Returns:
+            np.ndarray: portfolio value on each target date
+        """
+
+        if len(target_dates) == 0:
+            return np.empty(0)
 
-        return round(total_value, 2)
+        if len(self.portfolio.equities) == 0:
+            return np.full(len(target_dates), round(self.portfolio.cash, 2))
+
+        tickers = [eq.ticker for eq in self.portfolio.equities]
+        shares = np.array([eq.shares for eq in self.portfolio.equities])
+
+        # get pricing data for all equities in a single request
+        price_history = self.equity_service.get_price_history_many(
+            tickers=tickers, start_date=start_date, end_date=target_dates[-1].date()
+        )
+
+        # align prices onto the calendar, carrying the last known price over non-trading days
+        prices = (
+            price_history.reindex(price_history.index.union(target_dates))
+            .ffill()
+            .reindex(index=target_dates, columns=tickers)
+            .fillna({eq.ticker: eq.price for eq in self.portfolio.equities})
+        )
+
+        return np.round(prices.to_numpy() @ shares + self.portfolio.cash, 2)
 
     def compute_year_start_value(self) -> None:
         """Method computes the year start value of all assets in the portfolio"""
@@ -277,55 +288,39 @@ class PortfolioAnalyzer:
 
         weights = []
         portfolio_returns_daily = []
-        covariances: list[list[Optional[np.float64]]] = []
+        returns = []
+        risks = []
 
         for equity in self.portfolio.equities:
-            daily_returns = self.ticker_to_timeseries[equity.ticker][
-                time_interval
-            ].returns
-            daily_return = self.ticker_to_timeseries[equity.ticker][
-                time_interval
-            ].avg_return
-            daily_risk = self.ticker_to_timeseries[equity.ticker][time_interval].std_dev
+            timeseries = self.ticker_to_timeseries[equity.ticker][time_interval]
 
             equity.weight = (equity.shares * equity.price) / self.portfolio.value
             # print(equity.ticker + " weight = " + str(equity.weight))
 
             weights.append(equity.weight)
-            portfolio_returns_daily.append(daily_return)
-
-            row_covariances: list[Optional[np.float64]] = []
-            no_covariance = False
-            for other_equity in self.portfolio.equities:
-                if equity.ticker == other_equity.ticker:
-                    row_covariances.append(np.float64(1))
-                else:
-                    other_returns = self.ticker_to_timeseries[other_equity.ticker][
-                        time_interval
-                    ].returns
-                    other_risk = self.ticker_to_timeseries[other_equity.ticker][
-                        time_interval
-                    ].std_dev
-
-                    covariance = mf.compute_covariance_with_correlation_coefficient(
-                        daily_returns, other_returns, daily_risk, other_risk
-                    )
-                    if covariance is None:
-                        no_covariance = True
-                        break
-
-                    row_covariances.append(covariance)
-
-            # check if we could not compute covariance for any entry in the array
-            if no_covariance is True:
-                covariances = []
-                break
-
-            covariances.append(row_covariances)
+            portfolio_returns_daily.append(timeseries.avg_return)
+            returns.append(timeseries.returns)
+            risks.append(timeseries.std_dev)
+
+        # covariances of all pairs are computed together, entries of an equity with itself are 1
+        tickers = np.array([equity.ticker for equity in self.portfolio.equities])
+        covariances = mf.compute_covariance_matrix(returns, np.array(risks))
+        covariances[np.equal.outer(tickers, tickers)] = 1
 
         self.W[time_interval] = np.array(weights)
         self.M[time_interval] = np.array(portfolio_returns_daily)
-        self.C[time_interval] = np.array(covariances)
+        self.C[time_interval] = covariances
+
+        # factorize once so the minimum variance computations solve with C rather than inverting it
+        factorization = None
+        if covariances.size != 0:
+            factorization = mf.FactorizedMatrix(covariances)
+            if factorization.ill_conditioned:
+                print(
+                    f"WARNING - covariance matrix for {time_interval.value} is ill-conditioned "
+                    f"(condition number = {factorization.condition_number:.2e})"
+                )
+        self.C_factorization[time_interval] = factorization
 
         # print("w array = " + str(self.W[time_interval]))
         # print("m array = " + str(self.M[time_interval]))
@@ -370,14 +365,18 @@ class PortfolioAnalyzer:
         """
 
         mvp: np.ndarray = np.ndarray(0)
+        factorization = self.C_factorization[time_interval]
 
-        if len(self.portfolio.equities) != 0 and self.C[time_interval].size != 0:
+        if (
+            len(self.portfolio.equities) != 0
+            and factorization is not None
+            and math.isfinite(factorization.condition_number)
+        ):
             u = np.ones(len(self.portfolio.equities))
-            u_t = np.transpose(u)
-            C_inv = np.linalg.inv(self.C[time_interval])
 
-            uC_inv = u @ C_inv
-            uC_invu_t = uC_inv @ u_t
+            # C is symmetric, so uC^-1 is the transpose of the solution to Cx = u
+            uC_inv = factorization.solve(u)
+            uC_invu_t = uC_inv @ u
             result = uC_inv / uC_invu_t
 
             mvp = result
@@ -425,24 +424,27 @@ class PortfolioAnalyzer:
         if self.C[time_interval].size == 0 or self.C[time_interval].size == 1:
             return
 
+        factorization = self.C_factorization[time_interval]
+        if factorization is None or not math.isfinite(factorization.condition_number):
+            return
+
         u = np.ones(len(self.portfolio.equities))
-        u_t = np.transpose(u)
-        M_t = np.transpose(self.M[time_interval])
-        C_inv = np.linalg.inv(self.C[time_interval])
+        M = self.M[time_interval]
+
+        # C is symmetric, so both uC^-1 and MC^-1 come from a single solve with two columns
+        solutions = factorization.solve(np.column_stack((u, M)))
+        uC_inv = solutions[:, 0]
+        MC_inv = solutions[:, 1]
 
-        a_bar = u @ C_inv @ M_t
-        b_bar = self.M[time_interval] @ C_inv @ M_t
-        c_bar = u @ C_inv @ u_t
+        a_bar = u @ MC_inv
+        b_bar = M @ MC_inv
+        c_bar = u @ uC_inv
 
         denom = (b_bar * c_bar) - (a_bar**2)
 
         # w = a * m_v + b
-        self.a[time_interval] = (
-            ((c_bar * self.M[time_interval]) - (a_bar * u)) @ C_inv
-        ) / denom
-        self.b[time_interval] = (
-            ((b_bar * u) - (a_bar * self.M[time_interval])) @ C_inv
-        ) / denom
+        self.a[time_interval] = ((c_bar * MC_inv) - (a_bar * uC_inv)) / denom
+        self.b[time_interval] = ((b_bar * uC_inv) - (a_bar * MC_inv)) / denom
 
         # print("a parameter")
         # print(self.a[time_interval])
@@ -0,0 +1,20 @@
+from asset_manager.asset_manager import load_config
+from asset_manager.database import MongoDatabase
+
+
+def main() -> None:
+    config = load_config()
+
+    db = MongoDatabase(
+        user=config["mongodb"]["username"],
+        password=config["mongodb"]["password"],
+        database=config["mongodb"]["database"],
+        cluster=config["mongodb"]["cluster"],
+    )
+    db.create_indexes()
+
+    print(f"created indexes for database {config['mongodb']['database']}")
+
+
+if __name__ == "__main__":
+    main()
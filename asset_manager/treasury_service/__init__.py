@@ -1,4 +1,12 @@
+from asset_manager.treasury_service.yield_curve import YieldCurve, YieldCurveStore
 from asset_manager.treasury_service.treasury_interface import TreasuryService
 from asset_manager.treasury_service.fred import Fred
+from asset_manager.treasury_service.lazy import LazyTreasuryService
 
-__all__ = ["TreasuryService", "Fred"]
+__all__ = [
+    "TreasuryService",
+    "Fred",
+    "LazyTreasuryService",
+    "YieldCurve",
+    "YieldCurveStore",
+]
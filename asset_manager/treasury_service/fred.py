@@ -1,14 +1,21 @@
 import json
+import numpy as np
 import os
-import requests
+import threading
 from datetime import date
+from typing import Optional
 
 from asset_manager.treasury_service import TreasuryService
+from asset_manager.treasury_service.yield_curve import YieldCurve, YieldCurveStore
+from asset_manager.utilities.http_client import HttpClient
+from asset_manager.utilities.request_scheduler import RequestScheduler
 
 
 class Fred(TreasuryService):
     # API ENDPOINTS
-    __FRED_TREASURY_RATE = "https://api.stlouisfed.org/fred/series/observations?series_id={}&file_type=json&limit=1&sort_order=desc&api_key={}"  # noqa
+    __BASE_URL = "https://api.stlouisfed.org/fred"
+    __FRED_TREASURY_RATE = "{}/series/observations?series_id={}&file_type=json&limit=1&sort_order=desc&api_key={}"  # noqa
+    __FRED_OBSERVATIONS = "{}/series/observations?series_id={}&file_type=json&observation_start={}&api_key={}"  # noqa
 
     # TREASURY SYMBOLS
     DGS30 = "DGS30"
@@ -19,16 +26,47 @@ class Fred(TreasuryService):
     DGS3MO = "DGS3MO"
     DGS1MO = "DGS1MO"
 
-    def __init__(self, config: dict) -> None:
+    SYMBOLS = (DGS30, DGS10, DGS5, DGS1, DGS6MO, DGS3MO, DGS1MO)
+
+    # tenor in years of each symbol, ordered by tenor
+    TENORS = {
+        DGS1MO: 1 / 12,
+        DGS3MO: 0.25,
+        DGS6MO: 0.5,
+        DGS1: 1,
+        DGS5: 5,
+        DGS10: 10,
+        DGS30: 30,
+    }
+
+    def __init__(
+        self,
+        config: dict,
+        scheduler: Optional[RequestScheduler] = None,
+        directory: Optional[str] = None,
+    ) -> None:
         self.__key = config["fred"]["key"]
-
-        self.__UST30Y = self.__get_treasury_rate(self.DGS30)
-        self.__UST10Y = self.__get_treasury_rate(self.DGS10)
-        self.__UST5Y = self.__get_treasury_rate(self.DGS5)
-        self.__UST1Y = self.__get_treasury_rate(self.DGS1)
-        self.__UST6MO = self.__get_treasury_rate(self.DGS6MO)
-        self.__UST3MO = self.__get_treasury_rate(self.DGS3MO)
-        self.__UST1MO = self.__get_treasury_rate(self.DGS1MO)
+        self.__base_url = config["fred"].get("url", self.__BASE_URL)
+        self.http_client = HttpClient(scheduler=scheduler, provider="fred")
+        self.directory = (
+            directory
+            if directory is not None
+            else f"{os.getcwd()}/asset_manager/data/treasury"
+        )
+        self.yield_curve_store = YieldCurveStore(self.directory)
+
+        self.__yield_curve: Optional[YieldCurve] = None
+        self.__yield_curve_lock = threading.Lock()
+
+        rates = self.__get_treasury_rates()
+
+        self.__UST30Y = rates[self.DGS30]
+        self.__UST10Y = rates[self.DGS10]
+        self.__UST5Y = rates[self.DGS5]
+        self.__UST1Y = rates[self.DGS1]
+        self.__UST6MO = rates[self.DGS6MO]
+        self.__UST3MO = rates[self.DGS3MO]
+        self.__UST1MO = rates[self.DGS1MO]
 
     @property
     def UST30Y(self) -> float:
@@ -58,32 +96,90 @@ class Fred(TreasuryService):
     def UST1MO(self) -> float:
         return self.__UST1MO
 
-    def __get_treasury_rate(self, symbol: str) -> float:
-        today = date.today()
+    def get_yield_curve(self) -> YieldCurve:
+        with self.__yield_curve_lock:
+            if self.__yield_curve is None:
+                self.__yield_curve = self.__update_yield_curve()
+
+            return self.__yield_curve
 
-        current_directory = os.getcwd()
-        symbol_directory = current_directory + "/asset_manager/data/treasury/{}/"
-        symbol_directory = symbol_directory.format(symbol)
+    def __update_yield_curve(self) -> YieldCurve:
+        today = date.today()
+        stored = self.yield_curve_store.load()
+
+        if stored is not None and stored[1] == today:
+            return stored[0]
+
+        # the last stored date is requested again so late or revised observations replace it
+        yield_curve = (
+            stored[0]
+            if stored is not None
+            else YieldCurve(np.empty(0), list(self.TENORS.values()), np.empty((0, 0)))
+        )
+        # the full history is requested from the earliest start date accepted by FRED
+        observation_start = (
+            str(yield_curve.dates[-1]) if len(yield_curve) != 0 else "1776-07-04"
+        )
+
+        responses = self.http_client.get_json_many(
+            [
+                self.__FRED_OBSERVATIONS.format(
+                    self.__base_url, symbol, observation_start, self.__key
+                )
+                for symbol in self.TENORS
+            ]
+        )
+
+        # place the observations of each symbol in its tenor column, FRED reports missing values as "."
+        observations = [response["observations"] for response in responses]
+        series_dates = [
+            np.array([o["date"] for o in obs], dtype="datetime64[D]")
+            for obs in observations
+        ]
+        dates = np.unique(np.concatenate(series_dates))
+
+        rates = np.full((len(dates), len(self.TENORS)), np.nan)
+        for column, (obs, obs_dates) in enumerate(zip(observations, series_dates)):
+            values = np.array([o["value"] for o in obs], dtype=object)
+            observed = values != "."
+            rates[np.searchsorted(dates, obs_dates[observed]), column] = values[
+                observed
+            ].astype(np.float64)
+
+        yield_curve = yield_curve.merge(dates, rates)
+        self.yield_curve_store.save(yield_curve, today)
+
+        return yield_curve
+
+    def __get_treasury_rates(self) -> dict[str, float]:
+        # rates of all symbols are cached together in a single file per day
+        filename = f"{self.directory}/{date.today()}.json"
+
+        if os.path.exists(filename):
+            with open(filename, "r") as json_file:
+                rates = json.load(json_file)
 
-        if os.path.exists(symbol_directory) is False:
-            os.makedirs(symbol_directory)
-        os.chdir(symbol_directory)
+            if all(symbol in rates for symbol in self.SYMBOLS):
+                return rates
 
-        filename = str(today) + ".json"
-        response = {}
+        responses = self.http_client.get_json_many(
+            [
+                self.__FRED_TREASURY_RATE.format(self.__base_url, symbol, self.__key)
+                for symbol in self.SYMBOLS
+            ]
+        )
+        rates = {
+            symbol: float(response["observations"][0]["value"])
+            for symbol, response in zip(self.SYMBOLS, responses)
+        }
 
-        if os.path.exists(filename) is False:
-            api_string = self.__FRED_TREASURY_RATE.format(symbol, self.__key)
-            response = requests.get(api_string).json()
+        os.makedirs(self.directory, exist_ok=True)
 
-            # save response to file in directory
-            with open(filename, "w") as json_file:
-                json.dump(response, json_file)
-        else:
-            with open(filename, "r") as json_file:
-                response = json.load(json_file)
+        # write to temporary file and swap so readers never observe a partial file
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "w") as json_file:
+            json.dump(rates, json_file)
 
-        os.chdir(current_directory)
+        os.replace(temp_filename, filename)
 
-        rate = response["observations"][0]["value"]
-        return float(rate)
+        return rates
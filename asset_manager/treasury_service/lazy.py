@@ -0,0 +1,56 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from asset_manager.treasury_service.treasury_interface import TreasuryService
+from asset_manager.treasury_service.yield_curve import YieldCurve
+
+
+class LazyTreasuryService(TreasuryService):
+    """Treasury service constructing the wrapped service on a background thread
+
+    The wrapped service is requested as soon as this object is created, and reading a rate only
+    blocks if it has not finished loading. The loaded service is kept for the rest of the session,
+    and errors raised while loading it are raised from the rate properties.
+    """
+
+    def __init__(self, factory: Callable[[], TreasuryService]) -> None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="treasury")
+        self.__service: Future[TreasuryService] = executor.submit(factory)
+
+        # the thread exits once the service is loaded
+        executor.shutdown(wait=False)
+
+    @property
+    def service(self) -> TreasuryService:
+        return self.__service.result()
+
+    @property
+    def UST30Y(self) -> float:
+        return self.service.UST30Y
+
+    @property
+    def UST10Y(self) -> float:
+        return self.service.UST10Y
+
+    @property
+    def UST5Y(self) -> float:
+        return self.service.UST5Y
+
+    @property
+    def UST1Y(self) -> float:
+        return self.service.UST1Y
+
+    @property
+    def UST6MO(self) -> float:
+        return self.service.UST6MO
+
+    @property
+    def UST3MO(self) -> float:
+        return self.service.UST3MO
+
+    @property
+    def UST1MO(self) -> float:
+        return self.service.UST1MO
+
+    def get_yield_curve(self) -> YieldCurve:
+        return self.service.get_yield_curve()
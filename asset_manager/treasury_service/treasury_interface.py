@@ -1,4 +1,6 @@
-from abc import ABC, abstractproperty
+from abc import ABC, abstractmethod, abstractproperty
+
+from asset_manager.treasury_service.yield_curve import YieldCurve
 
 
 class TreasuryService(ABC):
@@ -29,3 +31,12 @@ class TreasuryService(ABC):
     @abstractproperty
     def UST1MO(self) -> float:
         pass
+
+    @abstractmethod
+    def get_yield_curve(self) -> YieldCurve:
+        """Returns the daily history of treasury yields for all tracked tenors
+
+        Returns:
+            YieldCurve: yield curve including the most recent observations
+        """
+        pass
@@ -0,0 +1,181 @@
+import numpy as np
+import os
+import threading
+from datetime import date
+from scipy.interpolate import CubicSpline
+from typing import Any, Optional
+
+
+class YieldCurve:
+    """Daily treasury yields stored as a date x tenor array
+
+    Rates are in percent and tenors are in years. Missing observations are NaN in the stored rates,
+    and are carried forward from the previous date when the curve is interpolated.
+    """
+
+    __slots__ = ("dates", "tenors", "rates", "__filled")
+
+    def __init__(self, dates: Any, tenors: Any, rates: Any) -> None:
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.tenors = np.asarray(tenors, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64).reshape(
+            len(self.dates), len(self.tenors)
+        )
+
+        self.__filled = _forward_fill(self.rates)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def merge(self, dates: Any, rates: Any) -> "YieldCurve":
+        """Method returns a curve including the observations, replacing stored observations on the same dates
+
+        Args:
+            dates (Any): array-like of observation dates
+            rates (Any): array of shape (dates, tenors) of observed rates, NaN if not observed
+
+        Returns:
+            YieldCurve: curve with the observations merged in date order
+        """
+
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        rates = np.asarray(rates, dtype=np.float64).reshape(
+            len(dates), len(self.tenors)
+        )
+
+        keep = ~np.isin(self.dates, dates)
+        merged_dates = np.concatenate((self.dates[keep], dates))
+        merged_rates = np.concatenate((self.rates[keep], rates))
+
+        order = np.argsort(merged_dates, kind="stable")
+        return YieldCurve(merged_dates[order], self.tenors, merged_rates[order])
+
+    def interpolate(
+        self, tenors: Any, dates: Optional[Any] = None, method: str = "linear"
+    ) -> np.ndarray:
+        """Method interpolates the curve at the tenors on each of the dates
+
+        Note - the curve of each date is the last observed curve on or before it, rates are NaN for
+        dates before the first observation and tenors outside the stored tenors take the nearest rate
+
+        Args:
+            tenors (Any): array-like of tenors in years
+            dates (Optional[Any]): array-like of dates, defaults to the most recent date
+            method (str): linear or cubic
+
+        Returns:
+            np.ndarray: array of shape (dates, tenors) of interpolated rates
+        """
+
+        tenors = np.clip(
+            np.atleast_1d(np.asarray(tenors, dtype=np.float64)),
+            self.tenors[0],
+            self.tenors[-1],
+        )
+        curves = self.__curves_on(dates)
+
+        if method == "linear":
+            upper = np.clip(
+                np.searchsorted(self.tenors, tenors), 1, len(self.tenors) - 1
+            )
+            lower = upper - 1
+            weight = (tenors - self.tenors[lower]) / (
+                self.tenors[upper] - self.tenors[lower]
+            )
+            return curves[:, lower] * (1 - weight) + curves[:, upper] * weight
+
+        if method == "cubic":
+            # a single spline is fit to all complete curves, one output column per date
+            result = np.full((len(curves), len(tenors)), np.nan)
+            complete = ~np.isnan(curves).any(axis=1)
+            if complete.any():
+                spline = CubicSpline(self.tenors, curves[complete].T, axis=0)
+                result[complete] = spline(tenors).T
+            return result
+
+        raise ValueError(f"unsupported interpolation method - {method}")
+
+    def __curves_on(self, dates: Optional[Any]) -> np.ndarray:
+        if dates is None:
+            return self.__filled[-1:]
+
+        dates = np.atleast_1d(np.asarray(dates, dtype="datetime64[D]"))
+        indices = np.searchsorted(self.dates, dates, side="right") - 1
+
+        curves = self.__filled[np.maximum(indices, 0)]
+        curves[indices < 0] = np.nan
+        return curves
+
+    def __repr__(self) -> str:
+        return (
+            f"YieldCurve(dates={len(self.dates)}, tenors={self.tenors.tolist()}, "
+            f"last_date={self.dates[-1] if len(self.dates) != 0 else None})"
+        )
+
+
+class YieldCurveStore:
+    """Persists the yield curve and the date it was last updated in a single file"""
+
+    FILENAME = "yield_curve.npz"
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = (
+            directory
+            if directory is not None
+            else f"{os.getcwd()}/asset_manager/data/treasury"
+        )
+        self.filename = f"{self.directory}/{self.FILENAME}"
+        self.__lock = threading.Lock()
+
+    def load(self) -> Optional[tuple[YieldCurve, date]]:
+        """Method loads the stored yield curve
+
+        Returns:
+            Optional[tuple[YieldCurve, date]]: yield curve and the date it was last updated, returns None if
+            no curve is stored
+        """
+
+        with self.__lock:
+            if os.path.exists(self.filename) is False:
+                return None
+
+            with np.load(self.filename) as data:
+                yield_curve = YieldCurve(data["dates"], data["tenors"], data["rates"])
+                updated = data["updated"].astype("datetime64[D]").item()
+
+        return yield_curve, updated
+
+    def save(self, yield_curve: YieldCurve, updated: date) -> None:
+        """Method stores the yield curve
+
+        Args:
+            yield_curve (YieldCurve): yield curve to store
+            updated (date): date the yield curve was last updated
+        """
+
+        with self.__lock:
+            os.makedirs(self.directory, exist_ok=True)
+
+            # write to temporary file and swap so readers never observe a partial file
+            temp_filename = f"{self.filename}.tmp"
+            with open(temp_filename, "wb") as data_file:
+                np.savez(
+                    data_file,
+                    dates=yield_curve.dates,
+                    tenors=yield_curve.tenors,
+                    rates=yield_curve.rates,
+                    updated=np.datetime64(updated, "D"),
+                )
+
+            os.replace(temp_filename, self.filename)
+
+
+def _forward_fill(rates: np.ndarray) -> np.ndarray:
+    # index of the last observed row for each cell, -1 before the first observation
+    observed = ~np.isnan(rates)
+    last_observed = np.where(observed, np.arange(len(rates))[:, None], -1)
+    np.maximum.accumulate(last_observed, axis=0, out=last_observed)
+
+    filled = rates[np.maximum(last_observed, 0), np.arange(rates.shape[1])]
+    filled[last_observed < 0] = np.nan
+    return filled
@@ -0,0 +1,86 @@
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Any, Optional
+
+from asset_manager.utilities.request_scheduler import (
+    Priority,
+    RequestScheduler,
+    current_priority,
+)
+
+
+class HttpClient:
+    """HTTP client sharing a keep-alive session across a bounded pool of worker threads
+
+    When a scheduler is provided, every request waits for the provider quota before it is sent.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        timeout: float = 30,
+        scheduler: Optional[RequestScheduler] = None,
+        provider: str = "",
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.provider = provider
+
+        # size the connection pool to the worker pool so connections are reused rather than discarded
+        adapter = HTTPAdapter(
+            pool_connections=max_in_flight, pool_maxsize=max_in_flight
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="http-client"
+        )
+
+    def get_json(self, url: str, priority: Optional[Priority] = None) -> Any:
+        """Method performs a GET request and decodes the JSON response
+
+        Args:
+            url (str): url to request
+            priority (Optional[Priority]): scheduling priority, defaults to the priority of the current context
+
+        Returns:
+            Any: decoded JSON response
+        """
+
+        if self.scheduler is not None:
+            self.scheduler.acquire(self.provider, priority)
+
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_json_many(self, urls: list[str]) -> list[Any]:
+        """Method performs GET requests concurrently, with at most max_in_flight requests outstanding
+
+        Args:
+            urls (list[str]): urls to request
+
+        Returns:
+            list[Any]: decoded JSON responses in the same order as the urls
+        """
+
+        if len(urls) == 0:
+            return []
+
+        # worker threads do not inherit the caller's context, so the priority is passed explicitly
+        priority = current_priority()
+
+        if len(urls) == 1:
+            return [self.get_json(urls[0], priority)]
+
+        return list(self.executor.map(lambda url: self.get_json(url, priority), urls))
+
+    def close(self) -> None:
+        """Method shuts down the worker threads and closes pooled connections"""
+
+        self.executor.shutdown(wait=True)
+        self.session.close()
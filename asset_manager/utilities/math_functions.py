@@ -1,8 +1,69 @@
 import math
 import numpy as np
+import warnings
+from scipy.linalg import (
+    LinAlgError,
+    LinAlgWarning,
+    cho_factor,
+    cho_solve,
+    lu_factor,
+    lu_solve,
+)
+from scipy.linalg.lapack import dgecon, dpocon
 from scipy.stats import pearsonr
 from typing import Optional
 
+# matrices with a larger condition number lose most of the precision of solutions
+CONDITION_NUMBER_LIMIT = 1e12
+
+
+class FactorizedMatrix:
+    """Factorization of a square matrix reused to solve linear systems with it
+
+    Symmetric positive definite matrices use a Cholesky factorization, other matrices fall back to
+    an LU factorization with partial pivoting.
+    """
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+
+        self.cholesky: Optional[tuple] = None
+        self.lu: Optional[tuple] = None
+
+        # matrices with missing entries (e.g. correlations of a constant series) are treated as singular
+        if not np.isfinite(matrix).all():
+            self.condition_number = math.inf
+            return
+
+        norm = np.abs(matrix).sum(axis=0).max()
+
+        try:
+            self.cholesky = cho_factor(matrix)
+            c, lower = self.cholesky
+            rcond, _ = dpocon(c, norm, uplo="L" if lower else "U")
+        except LinAlgError:
+            # singular matrices are reported through the condition number instead
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LinAlgWarning)
+                self.lu = lu_factor(matrix)
+            rcond, _ = dgecon(self.lu[0], norm, norm="1")
+
+        # estimate of the 1-norm condition number from the factorization
+        self.condition_number = 1 / rcond if rcond > 0 else math.inf
+
+    @property
+    def ill_conditioned(self) -> bool:
+        return self.condition_number > CONDITION_NUMBER_LIMIT
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        if self.cholesky is not None:
+            return cho_solve(self.cholesky, b)
+
+        if self.lu is None:
+            raise LinAlgError("matrix contains infs or NaNs and was not factorized")
+
+        return lu_solve(self.lu, b)
+
 
 def compute_covariance_with_correlation_coefficient(
     x_data: list[float],
@@ -26,6 +87,28 @@ def compute_covariance_with_correlation_coefficient(
     return covariance
 
 
+def compute_covariance_matrix(
+    returns: list[np.ndarray], stdevs: np.ndarray
+) -> np.ndarray:
+    # as in compute_covariance_with_correlation_coefficient, each pair of series is correlated over the
+    # trailing values of the longer series (the oldest, since returns are ordered most recent first),
+    # so the correlations are computed once for each distinct length over the series at least that long
+    lengths = np.array([len(r) for r in returns])
+    correlations = np.empty((len(returns), len(returns)))
+
+    for length in np.unique(lengths):
+        members = np.flatnonzero(lengths >= length)
+        starts = lengths[members] - length
+        aligned = np.stack([returns[i][start:] for i, start in zip(members, starts)])
+
+        rho = np.atleast_2d(np.corrcoef(aligned))
+        pair_lengths = np.minimum.outer(lengths[members], lengths[members])
+        rows, columns = np.nonzero(pair_lengths == length)
+        correlations[members[rows], members[columns]] = rho[rows, columns]
+
+    return correlations * np.outer(stdevs, stdevs)
+
+
 def calculate_expected_value(X: np.ndarray, p: np.ndarray) -> float:
     p_t = np.transpose(p)
     expected_value = round(X @ p_t, 8)
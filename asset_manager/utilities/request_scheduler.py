@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Iterator, Optional
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+# priority applied to requests that do not specify one
+_current_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.BULK
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Context manager setting the priority of requests submitted by the current thread
+
+    Args:
+        priority (Priority): priority for requests made within the context
+    """
+
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Returns the request priority of the current context
+
+    Returns:
+        Priority: priority for requests made in the current context
+    """
+
+    return _current_priority.get()
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    waiting: int = 0
+    total_wait: float = 0
+    max_wait: float = 0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests != 0 else 0
+
+
+class _Provider:
+    """Token bucket for a single provider with a priority ordered queue of waiting requests"""
+
+    def __init__(self, calls: int, period: float) -> None:
+        self.rate = calls / period
+        self.capacity = float(calls)
+        self.tokens = float(calls)
+        self.updated = time.monotonic()
+
+        self.condition = threading.Condition()
+        self.waiters: list[tuple[int, int]] = []
+        self.stats = ProviderStats()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RequestScheduler:
+    """Paces requests to external APIs using a token bucket quota per provider
+
+    Requests waiting on the same provider are released in priority order, so interactive commands
+    are served before bulk refreshes queued ahead of them.
+    """
+
+    # free tier limits of the supported providers, as calls per period in seconds, yahoo publishes no
+    # limit so its quota is a conservative pace
+    DEFAULT_QUOTAS = {
+        "finnhub": {"calls": 60, "period": 60},
+        "fred": {"calls": 120, "period": 60},
+        "yahoo": {"calls": 60, "period": 60},
+    }
+
+    def __init__(self, quotas: Optional[dict] = None) -> None:
+        self.__sequence = itertools.count()
+        self.__providers: dict[str, _Provider] = {}
+
+        # configured quotas override the defaults of the same provider, other providers keep the defaults
+        for provider, quota in {**self.DEFAULT_QUOTAS, **(quotas or {})}.items():
+            self.register_provider(provider, quota["calls"], quota["period"])
+
+    def register_provider(self, provider: str, calls: int, period: float) -> None:
+        """Method registers the request quota for the provider
+
+        Args:
+            provider (str): name of the provider
+            calls (int): number of requests allowed per period
+            period (float): length of the period in seconds
+        """
+
+        self.__providers[provider] = _Provider(calls, period)
+
+    def acquire(self, provider: str, priority: Optional[Priority] = None) -> None:
+        """Method blocks until the provider quota allows another request
+
+        Args:
+            provider (str): name of the provider
+            priority (Optional[Priority]): priority of the request, defaults to the priority of the current context
+
+        Raises:
+            ValueError: raised if the provider has not been registered
+        """
+
+        if provider not in self.__providers:
+            raise ValueError(f"no request quota registered for provider - {provider}")
+
+        state = self.__providers[provider]
+        ticket = (
+            priority if priority is not None else current_priority(),
+            next(self.__sequence),
+        )
+        start = time.monotonic()
+
+        with state.condition:
+            heapq.heappush(state.waiters, ticket)
+            state.stats.waiting += 1
+
+            while True:
+                state.refill()
+                is_next = state.waiters[0] == ticket
+
+                if is_next and state.tokens >= 1:
+                    state.tokens -= 1
+                    heapq.heappop(state.waiters)
+                    break
+
+                # the head of the queue sleeps until its token is available, others until woken
+                timeout = (1 - state.tokens) / state.rate if is_next else None
+                state.condition.wait(timeout=timeout)
+
+            waited = time.monotonic() - start
+            state.stats.waiting -= 1
+            state.stats.requests += 1
+            state.stats.total_wait += waited
+            state.stats.max_wait = max(state.stats.max_wait, waited)
+
+            # wake the remaining waiters so the new head of the queue starts its timer
+            state.condition.notify_all()
+
+    def stats(self) -> dict[str, ProviderStats]:
+        """Returns request and queue wait counters for each provider
+
+        Returns:
+            dict[str, ProviderStats]: mapping of provider name to its counters
+        """
+
+        stats = {}
+        for provider, state in self.__providers.items():
+            with state.condition:
+                stats[provider] = ProviderStats(
+                    requests=state.stats.requests,
+                    waiting=state.stats.waiting,
+                    total_wait=state.stats.total_wait,
+                    max_wait=state.stats.max_wait,
+                )
+
+        return stats
@@ -0,0 +1,213 @@
+"""Micro-benchmark of loading and saving portfolios with many lots and trades
+
+Compares the slotted entities and generated codec in asset_manager.database against the plain
+classes, keyword argument converters, and hand-written to_dict methods they replaced.
+
+Usage:
+    python -m benchmarks.entity_codec [lots] [trades]
+"""
+
+import sys
+import timeit
+import tracemalloc
+from bson import ObjectId
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from asset_manager.database.codec import (
+    convert_entities_to_trades,
+    convert_entity_to_portfolio,
+)
+
+
+class LegacyLot:
+    def __init__(self, shares: float, price: float, execution_time: datetime) -> None:
+        self.shares = shares
+        self.price = price
+        self.execution_time = execution_time
+
+    def to_dict(self) -> dict:
+        return {
+            "shares": self.shares,
+            "price": self.price,
+            "executionTime": self.execution_time,
+        }
+
+
+class LegacyEquity:
+    def __init__(
+        self,
+        ticker: str,
+        shares: float,
+        price: float,
+        previous_day_price: float,
+        lots: list[LegacyLot],
+        weight: float = 0,
+        year_start_price: float = 0,
+        ytd: float = 0,
+    ) -> None:
+        self.ticker = ticker
+        self.shares = shares
+        self.weight = weight
+        self.price = price
+        self.year_start_price = year_start_price
+        self.ytd = ytd
+        self.previous_day_price = previous_day_price
+        self.lots = lots
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "shares": self.shares,
+            "weight": self.weight,
+            "price": self.price,
+            "previousDayPrice": self.previous_day_price,
+            "yearStartPrice": self.year_start_price,
+            "ytd": self.ytd,
+            "lots": [lot.to_dict() for lot in self.lots],
+        }
+
+
+class LegacyTrade:
+    def __init__(
+        self, ticker: str, price: float, shares: float, execution_time: datetime
+    ) -> None:
+        self.ticker = ticker
+        self.price = price
+        self.shares = shares
+        self.execution_time = execution_time
+
+
+def legacy_convert_entity_to_equity(equity_entity: dict) -> LegacyEquity:
+    return LegacyEquity(
+        ticker=equity_entity["ticker"],
+        shares=equity_entity["shares"],
+        weight=equity_entity["weight"],
+        price=equity_entity["price"],
+        year_start_price=equity_entity["yearStartPrice"],
+        ytd=equity_entity["ytd"],
+        previous_day_price=equity_entity["previousDayPrice"],
+        lots=[legacy_convert_entity_to_lot(lot) for lot in equity_entity["lots"]],
+    )
+
+
+def legacy_convert_entity_to_lot(lot_entity: dict) -> LegacyLot:
+    return LegacyLot(
+        shares=lot_entity["shares"],
+        price=lot_entity["price"],
+        execution_time=lot_entity["executionTime"],
+    )
+
+
+def legacy_convert_entity_to_trade(trade_entity: dict) -> LegacyTrade:
+    return LegacyTrade(
+        ticker=trade_entity["ticker"],
+        price=trade_entity["price"],
+        shares=trade_entity["shares"],
+        execution_time=trade_entity["executionTime"],
+    )
+
+
+def get_portfolio_entity(lots: int, equities: int = 20) -> dict:
+    now = datetime.now()
+
+    return {
+        "_id": ObjectId(),
+        "name": "benchmark",
+        "value": 0,
+        "cash": 0,
+        "equities": [
+            {
+                "ticker": f"T{i}",
+                "shares": lots // equities,
+                "weight": 1 / equities,
+                "price": 10.0,
+                "previousDayPrice": 10.0,
+                "yearStartPrice": 10.0,
+                "ytd": 0.0,
+                "lots": [
+                    {
+                        "shares": 1,
+                        "price": 10.0,
+                        "executionTime": now - timedelta(minutes=j),
+                    }
+                    for j in range(lots // equities)
+                ],
+            }
+            for i in range(equities)
+        ],
+        "valuation": {
+            "currentValue": 0,
+            "ytd": 0,
+            "pnl": 0,
+            "realizedPnl": 0,
+            "yearStartValue": 0,
+            "currentYear": now.year,
+        },
+    }
+
+
+def get_trade_entities(trades: int) -> list[dict]:
+    now = datetime.now()
+
+    return [
+        {
+            "ticker": f"T{i % 20}",
+            "price": 10.0,
+            "shares": 1,
+            "executionTime": now - timedelta(minutes=i),
+        }
+        for i in range(trades)
+    ]
+
+
+def measure(name: str, load: Callable[[], Any], save: Callable[[Any], Any]) -> None:
+    tracemalloc.start()
+    loaded = load()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    load_time = min(timeit.repeat(load, number=5, repeat=5)) / 5
+    save_time = min(timeit.repeat(lambda: save(loaded), number=5, repeat=5)) / 5
+
+    print(
+        f"{name:<10}"
+        + f"{load_time * 1000:>12.2f}"
+        + f"{save_time * 1000:>12.2f}"
+        + f"{memory / 1024 / 1024:>12.2f}"
+    )
+
+
+def main() -> None:
+    lots = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    trades = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    portfolio_entity = get_portfolio_entity(lots)
+    trade_entities = get_trade_entities(trades)
+
+    print(f"{lots} lots, {trades} trades")
+    print(f"{'':<10}{'load (ms)':>12}{'save (ms)':>12}{'memory (MB)':>12}")
+
+    measure(
+        "legacy",
+        lambda: (
+            [
+                legacy_convert_entity_to_equity(equity_entity)
+                for equity_entity in portfolio_entity["equities"]
+            ],
+            [legacy_convert_entity_to_trade(entity) for entity in trade_entities],
+        ),
+        lambda loaded: [equity.to_dict() for equity in loaded[0]],
+    )
+    measure(
+        "slotted",
+        lambda: (
+            convert_entity_to_portfolio(portfolio_entity),
+            convert_entities_to_trades(trade_entities),
+        ),
+        lambda loaded: loaded[0].to_dict(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import pytest
+from bson import ObjectId
+from datetime import datetime
+
+from asset_manager.database.codec import (
+    apply_changes,
+    convert_entities_to_trades,
+    convert_entity_to_portfolio,
+)
+
+
+def test_convert_entity_to_portfolio_round_trip() -> None:
+    portfolio_entity = get_portfolio_entity()
+
+    portfolio = convert_entity_to_portfolio(portfolio_entity)
+
+    assert portfolio.to_dict() == portfolio_entity
+    assert portfolio.pending_changes() == portfolio_entity
+    assert portfolio.equities[0].lots[1].price == 11
+
+
+def test_decoded_entities_are_slotted() -> None:
+    portfolio = convert_entity_to_portfolio(get_portfolio_entity())
+
+    with pytest.raises(AttributeError):
+        portfolio.equities[0].lots[0].unknown = 1
+
+
+def test_convert_entities_to_trades() -> None:
+    trades = convert_entities_to_trades(
+        [
+            {
+                "ticker": "ABC",
+                "price": 10,
+                "shares": -2,
+                "executionTime": datetime(2024, 1, 1),
+            }
+        ]
+    )
+
+    assert trades[0].to_dict() == {
+        "ticker": "ABC",
+        "price": 10,
+        "shares": -2,
+        "executionTime": datetime(2024, 1, 1),
+    }
+
+
+def test_apply_changes() -> None:
+    portfolio_entity = get_portfolio_entity()
+
+    apply_changes(portfolio_entity, {"cash": 5, "equities.0.lots.1.price": 12})
+
+    assert portfolio_entity["cash"] == 5
+    assert portfolio_entity["equities"][0]["lots"][1]["price"] == 12
+
+
+def get_portfolio_entity() -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": "TestPortfolio",
+        "value": 120,
+        "cash": 100,
+        "equities": [
+            {
+                "ticker": "ABC",
+                "shares": 2,
+                "weight": 1,
+                "price": 10,
+                "previousDayPrice": 9,
+                "yearStartPrice": 8,
+                "ytd": 0.25,
+                "lots": [
+                    {"shares": 1, "price": 9, "executionTime": datetime(2024, 1, 1)},
+                    {"shares": 1, "price": 11, "executionTime": datetime(2024, 1, 2)},
+                ],
+            }
+        ],
+        "valuation": {
+            "currentValue": 120,
+            "ytd": 0.1,
+            "pnl": 20,
+            "realizedPnl": 0,
+            "yearStartValue": 100,
+            "currentYear": 2024,
+        },
+        "version": 3,
+        "lastUpdated": datetime(2024, 1, 3),
+    }
@@ -3,7 +3,7 @@ from bson import ObjectId
 from datetime import datetime, timedelta
 
 from asset_manager.asset_manager import load_config
-from asset_manager.database import Database
+from asset_manager.database import Database, MongoDatabase
 from asset_manager.database.entities import (
     Equity,
     Historical,
@@ -19,12 +19,15 @@ config = load_config()
 
 @pytest.fixture(scope="session")
 def db() -> Database:
-    return Database(
+    db = MongoDatabase(
         user=config["mongodb"]["username"],
         password=config["mongodb"]["password"],
         database="am_test",  # NOTE - may want to consider adding this as config item
         cluster=config["mongodb"]["cluster"],
     )
+    db.create_indexes()
+
+    return db
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -35,6 +38,8 @@ def setup_db(db: Database):
     # reset collections
     db.db.get_collection("portfolio").delete_many({})
     db.db.get_collection("historical").delete_many({})
+    db.db.get_collection("historical_bucket").delete_many({})
+    db.db.get_collection("trade").delete_many({})
 
     # set test collections
     db.db.get_collection("portfolio").insert_many(
@@ -43,6 +48,12 @@ def setup_db(db: Database):
     db.db.get_collection("historical").insert_many(
         [h.to_dict() for h in get_historicals()]
     )
+    db.db.get_collection("trade").insert_many(
+        [
+            {"portfolioId": portfolio_id, **trade.to_dict()}
+            for portfolio_id, trade in get_trades()
+        ]
+    )
 
 
 def test_get_portfolio_names(db: Database) -> None:
@@ -51,6 +62,14 @@ def test_get_portfolio_names(db: Database) -> None:
     assert sorted(portfolio_names) == ["test_portfolio_1", "test_portfolio_2"]
 
 
+def test_list_portfolios(db: Database) -> None:
+    summaries = db.list_portfolios()
+
+    assert [s.name for s in summaries] == ["test_portfolio_1", "test_portfolio_2"]
+    assert summaries[0].value == 30
+    assert summaries[0].ytd == 0.1538
+
+
 def test_get_portfolio_by_name(db: Database) -> None:
     portfolio_name = "test_portfolio_1"
 
@@ -92,11 +111,50 @@ def test_save_portfolio(db: Database) -> None:
     assert q.valuation.realized_pnl == expected_realized_pnl
 
 
+def test_get_recent_trades(db: Database) -> None:
+    trades = db.get_recent_trades(ObjectId("000000000000000000000001"), count=3)
+
+    assert len(trades) == 3
+    assert trades[0].execution_time >= trades[1].execution_time
+    assert trades[1].execution_time >= trades[2].execution_time
+
+
+def test_get_trades_pages_through_ledger(db: Database) -> None:
+    trades = list(db.get_trades(ObjectId("000000000000000000000001"), page_size=2))
+    xyz_trades = list(
+        db.get_trades(ObjectId("000000000000000000000001"), ticker="XYZ", page_size=2)
+    )
+
+    assert len(trades) == 7
+    assert [trade.execution_time for trade in trades] == sorted(
+        [trade.execution_time for trade in trades], reverse=True
+    )
+    assert len(xyz_trades) == 3
+    assert all(trade.ticker == "XYZ" for trade in xyz_trades)
+
+
+def test_insert_trade(db: Database) -> None:
+    trade = Trade(ticker="ABC", price=9, shares=1, execution_time=datetime.now())
+
+    db.insert_trade(ObjectId("000000000000000000000000"), trade)
+
+    trades = db.get_recent_trades(ObjectId("000000000000000000000000"))
+    assert len(trades) == 2
+    assert trades[0].price == 9
+
+
 def test_get_historical(db: Database) -> None:
     historical = db.get_historical(ObjectId("000000000000000000000000"))
 
     assert historical is not None
     assert historical.name == "test_portfolio_1"
+    assert len(historical.historical_data) == 4
+
+    # embedded values are migrated to monthly buckets
+    historical_entity = db.db.get_collection("historical").find_one(
+        {"_id": ObjectId("000000000000000000000000")}
+    )
+    assert "historicalData" not in historical_entity
 
 
 def test_save_historical(db: Database) -> None:
@@ -113,6 +171,18 @@ def test_save_historical(db: Database) -> None:
     assert new_historical.historical_data[-1].value == 100
 
 
+def test_save_historical_without_new_values(db: Database) -> None:
+    historical = db.get_historical(ObjectId("000000000000000000000001"))
+
+    old_length = len(historical.historical_data)
+    db.save_historical(historical)
+    db.save_historical(historical)
+
+    new_historical = db.get_historical(ObjectId("000000000000000000000001"))
+
+    assert len(new_historical.historical_data) == old_length
+
+
 def get_portfolios() -> list[Portfolio]:
     now = datetime.now()
 
@@ -133,7 +203,6 @@ def get_portfolios() -> list[Portfolio]:
                 ytd=0.2857,
             )
         ],
-        trades=[Trade(ticker="ABC", price=8, shares=2, execution_time=now)],
         valuation=Valuation(
             current_value=30,
             ytd=0.1538,
@@ -178,34 +247,6 @@ def get_portfolios() -> list[Portfolio]:
                 ytd=-0.0385,
             ),
         ],
-        trades=[
-            Trade(
-                ticker="EFGH",
-                price=62,
-                shares=2,
-                execution_time=now - timedelta(days=10),
-            ),
-            Trade(
-                ticker="EFGH",
-                price=70,
-                shares=-2,
-                execution_time=now - timedelta(days=9),
-            ),
-            Trade(
-                ticker="XYZ", price=42, shares=2, execution_time=now - timedelta(days=4)
-            ),
-            Trade(
-                ticker="XYZ", price=45, shares=2, execution_time=now - timedelta(days=2)
-            ),
-            Trade(
-                ticker="EFGH",
-                price=60,
-                shares=2,
-                execution_time=now - timedelta(days=1),
-            ),
-            Trade(ticker="EFGH", price=60, shares=3, execution_time=now),
-            Trade(ticker="XYZ", price=44, shares=2, execution_time=now),
-        ],
         valuation=Valuation(
             current_value=1060,
             ytd=0.06,
@@ -219,6 +260,41 @@ def get_portfolios() -> list[Portfolio]:
     return [p_1, p_2]
 
 
+def get_trades() -> list[tuple[ObjectId, Trade]]:
+    now = datetime.now()
+
+    p_1_trades = [Trade(ticker="ABC", price=8, shares=2, execution_time=now)]
+
+    p_2_trades = [
+        Trade(
+            ticker="EFGH",
+            price=62,
+            shares=2,
+            execution_time=now - timedelta(days=10),
+        ),
+        Trade(
+            ticker="EFGH",
+            price=70,
+            shares=-2,
+            execution_time=now - timedelta(days=9),
+        ),
+        Trade(ticker="XYZ", price=42, shares=2, execution_time=now - timedelta(days=4)),
+        Trade(ticker="XYZ", price=45, shares=2, execution_time=now - timedelta(days=2)),
+        Trade(
+            ticker="EFGH",
+            price=60,
+            shares=2,
+            execution_time=now - timedelta(days=1),
+        ),
+        Trade(ticker="EFGH", price=60, shares=3, execution_time=now),
+        Trade(ticker="XYZ", price=44, shares=2, execution_time=now),
+    ]
+
+    return [(ObjectId("000000000000000000000000"), trade) for trade in p_1_trades] + [
+        (ObjectId("000000000000000000000001"), trade) for trade in p_2_trades
+    ]
+
+
 def get_historicals() -> list[Historical]:
     now = datetime.now()
 
@@ -0,0 +1,59 @@
+import numpy as np
+from scipy.stats import gmean
+from statistics import stdev
+
+from asset_manager.equity_service.helpers import (
+    calculate_time_series_details,
+    calculate_time_series_details_for_intervals,
+    calculate_time_series_details_matrix,
+)
+from asset_manager.objects import Interval
+
+PRICES = [63.5071, 65.508, 64.7293, 74.6354, 78.33]
+
+
+def test_calculate_time_series_details() -> None:
+    details = calculate_time_series_details(np.array(PRICES))
+
+    expected_returns = [
+        PRICES[i] / PRICES[i - 1] - 1 for i in range(len(PRICES) - 1, 0, -1)
+    ]
+
+    assert np.allclose(details.returns, expected_returns)
+    assert np.isclose(details.avg_return, gmean(np.array(expected_returns) + 1) - 1)
+    assert np.isclose(details.std_dev, stdev(expected_returns))
+
+
+def test_calculate_time_series_details_matrix_with_padded_rows() -> None:
+    price_matrix = np.array([PRICES, [np.nan, np.nan] + PRICES[2:]])
+
+    details = calculate_time_series_details_matrix(price_matrix)
+    full = calculate_time_series_details(np.array(PRICES))
+    short = calculate_time_series_details(np.array(PRICES[2:]))
+
+    assert len(details) == 2
+    assert np.allclose(details[0].returns, full.returns)
+    assert np.isclose(details[0].std_dev, full.std_dev)
+    assert len(details[1].returns) == 2
+    assert np.isclose(details[1].avg_return, short.avg_return)
+    assert np.isclose(details[1].std_dev, short.std_dev)
+
+
+def test_calculate_time_series_details_for_intervals() -> None:
+    monthly_prices = {
+        "ABC": np.arange(1, 14, dtype=np.float64),
+        "XYZ": np.array(PRICES),
+    }
+
+    details = calculate_time_series_details_for_intervals(
+        monthly_prices, [Interval.MONTH, Interval.THREE_MONTH]
+    )
+
+    assert np.isclose(
+        details["ABC"][Interval.THREE_MONTH].avg_return,
+        calculate_time_series_details(np.array([1, 4, 7, 10, 13])).avg_return,
+    )
+    assert np.isclose(
+        details["XYZ"][Interval.MONTH].std_dev,
+        calculate_time_series_details(np.array(PRICES)).std_dev,
+    )
@@ -0,0 +1,121 @@
+import json
+import pandas as pd
+import pytest
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+from asset_manager.database.entities import Equity
+from asset_manager.equity_service import FinnhubService
+from asset_manager.objects import Interval
+
+QUOTES = {"ABC": {"c": 10.123, "pc": 9.5}, "XYZ": {"c": 20.0, "pc": 21.456}}
+MONTHLY_CLOSES = [
+    10.0,
+    11.0,
+    12.0,
+    11.5,
+    12.5,
+    13.0,
+    12.0,
+    13.5,
+    14.0,
+    15.0,
+    14.5,
+    16.0,
+    17.0,
+]
+
+
+class FinnhubStandIn(BaseHTTPRequestHandler):
+    requests: list[str] = []
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        symbol = query["symbol"][0]
+        FinnhubStandIn.requests.append(url.path)
+
+        if url.path == "/quote":
+            body = QUOTES[symbol]
+        else:
+            body = {
+                "c": MONTHLY_CLOSES,
+                "t": [1640995200 + i * 2678400 for i in range(len(MONTHLY_CLOSES))],
+                "s": "ok",
+            }
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    FinnhubStandIn.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FinnhubStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(server_url: str, tmp_path, monkeypatch) -> Iterator[FinnhubService]:
+    monkeypatch.chdir(tmp_path)
+    finnhub_service = FinnhubService(
+        {"finnhub": {"key": "KEY", "url": server_url, "max_in_flight": 2}}
+    )
+
+    yield finnhub_service
+
+    finnhub_service.http_client.close()
+
+
+def test_get_equity_prices_many(service: FinnhubService) -> None:
+    prices = service.get_equity_prices_many(["ABC", "XYZ"])
+
+    assert prices == {"ABC": (10.12, 9.5), "XYZ": (20.0, 21.46)}
+    assert FinnhubStandIn.requests == ["/quote", "/quote"]
+
+
+def test_update_equity_details_many_uses_price_store(service: FinnhubService) -> None:
+    equities = [
+        Equity(ticker=ticker, shares=1, price=1, previous_day_price=1, lots=[])
+        for ticker in ["ABC", "XYZ"]
+    ]
+
+    details = service.update_equity_details_many(
+        equities, [Interval.MONTH, Interval.THREE_MONTH]
+    )
+    cached_details = service.update_equity_details_many(equities, [Interval.MONTH])
+
+    assert sorted(details) == ["ABC", "XYZ"]
+    assert list(details["ABC"]) == [Interval.MONTH, Interval.THREE_MONTH]
+    assert (
+        details["ABC"][Interval.MONTH].avg_return
+        == cached_details["ABC"][Interval.MONTH].avg_return
+    )
+    assert FinnhubStandIn.requests == ["/stock/candle", "/stock/candle"]
+
+
+def test_get_price_history_many(service: FinnhubService) -> None:
+    history = service.get_price_history_many(
+        ["ABC", "XYZ"], date(2022, 1, 1), date(2023, 1, 31)
+    )
+
+    assert list(history.columns) == ["ABC", "XYZ"]
+    assert list(history["ABC"]) == MONTHLY_CLOSES
+    assert history.index[0] == pd.Timestamp("2022-01-01")
+    assert FinnhubStandIn.requests == ["/stock/candle", "/stock/candle"]
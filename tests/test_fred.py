@@ -0,0 +1,112 @@
+import json
+import numpy as np
+import pytest
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+from asset_manager.treasury_service import Fred
+
+RATES = {
+    "DGS30": "4.50",
+    "DGS10": "4.25",
+    "DGS5": "4.00",
+    "DGS1": "4.75",
+    "DGS6MO": "5.00",
+    "DGS3MO": "5.10",
+    "DGS1MO": "5.20",
+}
+HISTORY = ["2024-01-02", "2024-01-03", "2024-01-04"]
+
+
+class FredStandIn(BaseHTTPRequestHandler):
+    requests: list[str] = []
+    observation_starts: list[str] = []
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        series_id = query["series_id"][0]
+        FredStandIn.requests.append(series_id)
+
+        if "observation_start" in query:
+            FredStandIn.observation_starts.append(query["observation_start"][0])
+            # the 10 year rate is missing on the second date
+            observations = [
+                {
+                    "date": d,
+                    "value": (
+                        "." if series_id == "DGS10" and i == 1 else RATES[series_id]
+                    ),
+                }
+                for i, d in enumerate(HISTORY)
+                if d >= query["observation_start"][0]
+            ]
+        else:
+            observations = [{"date": "2024-01-02", "value": RATES[series_id]}]
+
+        payload = json.dumps({"observations": observations}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    FredStandIn.requests = []
+    FredStandIn.observation_starts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FredStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_rates_are_fetched_once_per_day(server_url: str, tmp_path) -> None:
+    config = {"fred": {"key": "KEY", "url": server_url}}
+
+    fred = Fred(config, directory=str(tmp_path))
+    cached_fred = Fred(config, directory=str(tmp_path))
+
+    assert sorted(FredStandIn.requests) == sorted(RATES)
+    assert fred.UST10Y == 4.25
+    assert fred.UST1MO == 5.2
+    assert cached_fred.UST30Y == 4.5
+    assert [p.name for p in tmp_path.iterdir()] == [f"{date.today()}.json"]
+
+    fred.http_client.close()
+    cached_fred.http_client.close()
+
+
+def test_yield_curve_is_updated_incrementally(server_url: str, tmp_path) -> None:
+    config = {"fred": {"key": "KEY", "url": server_url}}
+    fred = Fred(config, directory=str(tmp_path))
+    yield_curve = fred.get_yield_curve()
+
+    assert len(yield_curve) == 3
+    assert yield_curve.tenors.tolist() == list(Fred.TENORS.values())
+    assert np.isnan(yield_curve.rates[1, 5])
+    assert fred.get_yield_curve() is yield_curve
+    assert np.allclose(yield_curve.interpolate([10], HISTORY[1]), 4.25)
+    assert np.allclose(yield_curve.interpolate([0.5, 3]), [[5.0, 4.375]])
+
+    # a curve updated on an earlier day only requests observations from its last date
+    fred.yield_curve_store.save(yield_curve, date(2024, 1, 4))
+    FredStandIn.observation_starts = []
+    updated_fred = Fred(config, directory=str(tmp_path))
+    updated_yield_curve = updated_fred.get_yield_curve()
+
+    assert FredStandIn.observation_starts == [HISTORY[-1]] * len(RATES)
+    assert np.array_equal(updated_yield_curve.rates, yield_curve.rates, equal_nan=True)
+
+    fred.http_client.close()
+    updated_fred.http_client.close()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+from datetime import date, datetime, timedelta
+
+from asset_manager.database.entities import (
+    Equity,
+    Historical,
+    HistoricalData,
+    HistoricalSeries,
+    Portfolio,
+    Valuation,
+)
+from asset_manager.portfolio_analyzer import PortfolioAnalyzer
+
+
+class StubEquityService:
+    def __init__(self, price_history: pd.DataFrame) -> None:
+        self.price_history = price_history
+
+    def get_price_history_many(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> pd.DataFrame:
+        return self.price_history.reindex(columns=tickers)
+
+
+def test_compute_total_values_on_dates_carries_prices_over_non_trading_days() -> None:
+    # friday and monday prices, the weekend uses friday's close
+    price_history = pd.DataFrame(
+        {"ABC": [10.0, 12.0], "XYZ": [20.0, np.nan]},
+        index=pd.to_datetime(["2024-01-05", "2024-01-08"]),
+    )
+    analyzer = get_analyzer(
+        [get_equity("ABC", shares=2, price=11), get_equity("XYZ", shares=1, price=25)],
+        price_history,
+    )
+
+    values = analyzer.compute_total_values_on_dates(
+        pd.date_range("2024-01-05", "2024-01-08", freq="D"),
+        start_date=date(2023, 12, 29),
+    )
+
+    assert values.tolist() == [140, 140, 140, 144]
+
+
+def test_compute_total_values_on_dates_uses_current_price_without_history() -> None:
+    price_history = pd.DataFrame({"ABC": [10.0]}, index=pd.to_datetime(["2024-01-05"]))
+    analyzer = get_analyzer(
+        [get_equity("XYZ", shares=1, price=25), get_equity("ABC", shares=2, price=11)],
+        price_history,
+    )
+
+    values = analyzer.compute_total_values_on_dates(
+        pd.date_range("2024-01-05", "2024-01-06", freq="D"),
+        start_date=date(2023, 12, 29),
+    )
+
+    assert values.tolist() == [145, 145]
+
+
+def test_update_historical_backfills_missing_dates() -> None:
+    today = date.today()
+    last_date = today - timedelta(days=3)
+    price_history = pd.DataFrame(
+        {"ABC": [10.0] * 10},
+        index=pd.date_range(today - timedelta(days=9), today, freq="D"),
+    )
+    analyzer = get_analyzer([get_equity("ABC", shares=2, price=11)], price_history)
+    analyzer.historical.historical_data = HistoricalSeries.from_historical_data(
+        [
+            HistoricalData(
+                date=datetime(last_date.year, last_date.month, last_date.day),
+                value=100,
+            )
+        ]
+    )
+
+    analyzer.update_historical()
+
+    historical_data = analyzer.historical.historical_data
+    assert [hd.date.date() for hd in historical_data] == [
+        last_date + timedelta(days=i) for i in range(4)
+    ]
+    assert [hd.value for hd in historical_data[1:3]] == [120, 120]
+    assert historical_data[-1].value == analyzer.portfolio.value
+
+
+def get_analyzer(
+    equities: list[Equity], price_history: pd.DataFrame
+) -> PortfolioAnalyzer:
+    portfolio = Portfolio(
+        id=ObjectId(),
+        name="TestPortfolio",
+        value=150,
+        cash=100,
+        equities=equities,
+        valuation=Valuation(
+            current_value=150,
+            ytd=0,
+            pnl=0,
+            realized_pnl=0,
+            year_start_value=0,
+            current_year=date.today().year,
+        ),
+    )
+    historical = Historical(id=ObjectId(), name="TestPortfolio", historical_data=[])
+
+    return PortfolioAnalyzer(
+        portfolio, historical, None, StubEquityService(price_history)
+    )
+
+
+def get_equity(ticker: str, shares: float, price: float) -> Equity:
+    return Equity(
+        ticker=ticker,
+        shares=shares,
+        price=price,
+        previous_day_price=price,
+        lots=[],
+    )
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from datetime import date, datetime, timedelta
+
+from asset_manager.database.entities import (
+    Historical,
+    HistoricalData,
+    HistoricalSeries,
+)
+
+
+def test_append_and_index() -> None:
+    series = HistoricalSeries()
+
+    series.append(HistoricalData(date=datetime(2024, 1, 1), value=100))
+    series.append(HistoricalData(date=datetime(2024, 1, 2), value=105.5))
+
+    assert len(series) == 2
+    assert series[-1].date == datetime(2024, 1, 2)
+    assert series[-1].value == 105.5
+    assert series[0].date.date() == date(2024, 1, 1)
+
+
+def test_extend_with_arrays() -> None:
+    series = get_series(days=2)
+
+    series.extend(
+        np.array(["2024-01-03", "2024-01-04"], dtype="datetime64[D]"),
+        np.array([3, 4]),
+    )
+
+    assert [hd.value for hd in series] == [0, 1, 3, 4]
+    assert series[-1].date == datetime(2024, 1, 4)
+
+
+def test_extend_with_mismatched_lengths() -> None:
+    series = get_series(days=2)
+
+    with pytest.raises(ValueError):
+        series.extend(np.array(["2024-01-03"], dtype="datetime64[D]"), np.array([]))
+
+
+def test_slice_by_date_is_inclusive() -> None:
+    series = get_series(days=10)
+
+    sliced = series.slice(date(2024, 1, 3), date(2024, 1, 5))
+
+    assert [hd.date.day for hd in sliced] == [3, 4, 5]
+    assert len(series.slice(start=date(2024, 1, 9))) == 2
+    assert len(series.slice(end=date(2023, 12, 31))) == 0
+
+
+def test_to_dict_round_trip() -> None:
+    historical_data = [
+        HistoricalData(date=datetime(2024, 1, 1) + timedelta(days=i), value=i * 10)
+        for i in range(3)
+    ]
+    historical = Historical(id=None, name="test", historical_data=historical_data)
+
+    records = historical.to_dict()["historicalData"]
+
+    assert records == [hd.to_dict() for hd in historical_data]
+    assert isinstance(records[0]["date"], datetime)
+    assert isinstance(records[0]["value"], float)
+
+
+def get_series(days: int) -> HistoricalSeries:
+    return HistoricalSeries(
+        dates=np.datetime64("2024-01-01") + np.arange(days),
+        values=np.arange(days),
+    )
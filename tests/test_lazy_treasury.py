@@ -0,0 +1,50 @@
+import pytest
+import threading
+
+from asset_manager.treasury_service import (
+    LazyTreasuryService,
+    TreasuryService,
+    YieldCurve,
+)
+
+
+class StubTreasuryService(TreasuryService):
+    UST30Y = 4.5
+    UST10Y = 4.25
+    UST5Y = 4.0
+    UST1Y = 4.75
+    UST6MO = 5.0
+    UST3MO = 5.1
+    UST1MO = 5.2
+
+    def get_yield_curve(self) -> YieldCurve:
+        return YieldCurve(["2024-01-02"], [1, 10], [[4.75, 4.25]])
+
+
+def test_rates_load_in_background_once() -> None:
+    release = threading.Event()
+    calls: list[int] = []
+
+    def factory() -> TreasuryService:
+        calls.append(1)
+        release.wait(timeout=5)
+        return StubTreasuryService()
+
+    # construction does not wait for the wrapped service
+    treasury_service = LazyTreasuryService(factory)
+    release.set()
+
+    assert treasury_service.UST10Y == 4.25
+    assert treasury_service.UST1MO == 5.2
+    assert treasury_service.get_yield_curve().interpolate([5.5])[0, 0] == 4.5
+    assert len(calls) == 1
+
+
+def test_load_errors_are_raised_on_read() -> None:
+    def factory() -> TreasuryService:
+        raise ConnectionError("unavailable")
+
+    treasury_service = LazyTreasuryService(factory)
+
+    with pytest.raises(ConnectionError):
+        treasury_service.UST30Y
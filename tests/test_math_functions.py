@@ -1,3 +1,6 @@
+import math
+import numpy as np
+
 import asset_manager.utilities.math_functions as mf
 
 
@@ -10,3 +13,57 @@ def test_compute_covariance_with_correlation_coefficient():
     result = mf.compute_covariance_with_correlation_coefficient(x_data, y_data, x_stdev, y_stdev)
     rounded_result = round(result, 3)
     assert rounded_result == 8.0
+
+
+def test_compute_covariance_matrix_matches_pairwise_covariances():
+    rng = np.random.default_rng(0)
+    returns = [rng.normal(size=length) for length in [30, 20, 30, 25, 20]]
+    stdevs = np.array([np.std(r) for r in returns])
+
+    result = mf.compute_covariance_matrix(returns, stdevs)
+
+    expected = [
+        [
+            mf.compute_covariance_with_correlation_coefficient(x, y, x_stdev, y_stdev)
+            for y, y_stdev in zip(returns, stdevs)
+        ]
+        for x, x_stdev in zip(returns, stdevs)
+    ]
+    assert np.allclose(result, expected)
+
+
+def test_factorized_matrix_uses_cholesky_for_positive_definite_matrix():
+    C = np.array([[2.0, 0.5], [0.5, 1.0]])
+    b = np.array([[1.0, 2.0], [1.0, -1.0]])
+
+    factorization = mf.FactorizedMatrix(C)
+
+    assert factorization.cholesky is not None
+    assert np.allclose(factorization.solve(b), np.linalg.inv(C) @ b)
+    assert np.isclose(factorization.condition_number, np.linalg.cond(C, 1))
+    assert factorization.ill_conditioned is False
+
+
+def test_factorized_matrix_falls_back_to_lu():
+    C = np.array([[1.0, 2.0], [2.0, 1.0]])
+    b = np.array([1.0, 1.0])
+
+    factorization = mf.FactorizedMatrix(C)
+
+    assert factorization.cholesky is None
+    assert np.allclose(factorization.solve(b), np.linalg.inv(C) @ b)
+
+
+def test_factorized_matrix_reports_singular_matrix():
+    factorization = mf.FactorizedMatrix(np.ones((3, 3)))
+
+    assert factorization.ill_conditioned is True
+
+
+def test_factorized_matrix_reports_matrix_with_nan_as_singular():
+    C = np.array([[1.0, np.nan], [np.nan, 1.0]])
+
+    factorization = mf.FactorizedMatrix(C)
+
+    assert factorization.condition_number == math.inf
+    assert factorization.ill_conditioned is True
@@ -256,7 +256,6 @@ def get_portfolio() -> Portfolio:
         equities=[
             get_equity()
         ],
-        trades=[],
         valuation=(
             Valuation(
                 current_value=0,
@@ -0,0 +1,93 @@
+from bson import ObjectId
+from datetime import datetime
+
+from asset_manager.database.entities import Equity, Lot, Portfolio, Valuation
+
+
+def test_pending_changes_without_snapshot() -> None:
+    portfolio = get_portfolio()
+
+    assert portfolio.pending_changes() == portfolio.to_dict()
+
+
+def test_pending_changes_when_unchanged() -> None:
+    portfolio = get_portfolio()
+    portfolio.mark_clean()
+
+    assert portfolio.pending_changes() == {}
+
+
+def test_pending_changes_returns_modified_paths() -> None:
+    portfolio = get_portfolio()
+    portfolio.mark_clean()
+
+    portfolio.cash = 50
+    portfolio.equities[1].price = 12
+    portfolio.valuation.ytd = 0.1
+
+    assert portfolio.pending_changes() == {
+        "cash": 50,
+        "equities.1.price": 12,
+        "valuation.ytd": 0.1,
+    }
+
+
+def test_pending_changes_replaces_resized_lists() -> None:
+    portfolio = get_portfolio()
+    portfolio.mark_clean()
+
+    portfolio.equities.pop(0)
+    portfolio.equities[0].lots.append(
+        Lot(shares=1, price=11, execution_time=datetime(2024, 1, 2))
+    )
+
+    changes = portfolio.pending_changes()
+
+    assert list(changes) == ["equities"]
+    assert changes["equities"] == [eq.to_dict() for eq in portfolio.equities]
+
+
+def test_mark_clean_resets_changes() -> None:
+    portfolio = get_portfolio()
+    portfolio.mark_clean()
+
+    portfolio.value = 200
+    portfolio.mark_clean()
+
+    assert portfolio.pending_changes() == {}
+
+
+def test_pending_changes_ignores_nan_values() -> None:
+    portfolio = get_portfolio()
+    portfolio.equities[0].ytd = float("nan")
+    portfolio.mark_clean()
+
+    assert portfolio.pending_changes() == {}
+
+
+def get_portfolio() -> Portfolio:
+    return Portfolio(
+        id=ObjectId(),
+        name="TestPortfolio",
+        value=150,
+        cash=100,
+        equities=[get_equity("ABC"), get_equity("XYZ")],
+        valuation=Valuation(
+            current_value=150,
+            ytd=0,
+            pnl=0,
+            realized_pnl=0,
+            year_start_value=0,
+            current_year=2024,
+        ),
+    )
+
+
+def get_equity(ticker: str) -> Equity:
+    return Equity(
+        ticker=ticker,
+        shares=2,
+        price=10,
+        previous_day_price=10,
+        lots=[Lot(shares=2, price=10, execution_time=datetime(2024, 1, 1))],
+    )
@@ -0,0 +1,160 @@
+import json
+import numpy as np
+import pandas as pd
+from datetime import date
+
+from asset_manager.equity_service.price_store import PriceHistory, PriceStore
+
+
+def test_write_and_read(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+    history = get_history()
+
+    store.write("ABC", history)
+    result = store.read("ABC")
+
+    assert result is not None
+    assert result.as_of == history.as_of
+    assert np.array_equal(result.dates, history.dates)
+    assert np.array_equal(result.close, history.close)
+    assert np.array_equal(result.adjclose, history.adjclose)
+
+
+def test_read_returns_memory_mapped_views(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+    store.write("ABC", get_history())
+
+    result = store.read("ABC")
+
+    assert result is not None
+    assert isinstance(result.close.base, np.memmap)
+    assert result.close.flags.writeable is False
+
+
+def test_read_missing_ticker(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+
+    assert store.read("ABC") is None
+
+
+def test_read_migrates_legacy_csv(tmp_path) -> None:
+    ticker_directory = tmp_path / "ABC"
+    ticker_directory.mkdir()
+
+    pd.DataFrame(
+        {
+            "symbol": ["ABC", "ABC"],
+            "date": ["2024-01-01", "2024-02-01"],
+            "close": [10.0, 11.0],
+            "adjclose": [9.5, 10.5],
+        }
+    ).to_csv(ticker_directory / "2024-03-01.csv", index=False)
+    (ticker_directory / "2024-02-01.csv").write_text("stale")
+
+    result = PriceStore(str(tmp_path)).read("ABC")
+
+    assert result is not None
+    assert result.as_of == date(2024, 3, 1)
+    assert list(result.close) == [10.0, 11.0]
+    assert list(result.adjclose) == [9.5, 10.5]
+    assert sorted(p.name for p in ticker_directory.iterdir()) == [PriceStore.FILENAME]
+
+
+def test_read_migrates_legacy_json(tmp_path) -> None:
+    ticker_directory = tmp_path / "ABC"
+    ticker_directory.mkdir()
+
+    with open(ticker_directory / "2024-03-01.json", "w") as json_file:
+        json.dump({"c": [10.0, 11.0], "t": [1704067200, 1706745600]}, json_file)
+
+    result = PriceStore(str(tmp_path)).read("ABC")
+
+    assert result is not None
+    assert list(result.dates) == [
+        np.datetime64("2024-01-01"),
+        np.datetime64("2024-02-01"),
+    ]
+    assert list(result.close) == [10.0, 11.0]
+
+
+def test_append_replaces_overlapping_dates(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+    store.write("ABC", get_history())
+
+    store.append(
+        "ABC",
+        PriceHistory(
+            dates=np.array(["2024-03-01", "2024-04-01"], dtype="datetime64[D]"),
+            close=np.array([13.0, 14.0]),
+            adjclose=np.array([12.5, 13.5]),
+            as_of=date(2024, 5, 1),
+        ),
+    )
+    result = store.read("ABC")
+
+    assert result is not None
+    assert result.as_of == date(2024, 5, 1)
+    assert list(result.close) == [10.0, 11.0, 13.0, 14.0]
+    assert list(result.adjclose) == [9.5, 10.5, 12.5, 13.5]
+
+
+def test_append_without_new_prices_updates_as_of(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+    store.write("ABC", get_history())
+
+    store.append(
+        "ABC",
+        PriceHistory(
+            dates=np.array([], dtype="datetime64[D]"),
+            close=np.array([]),
+            adjclose=np.array([]),
+            as_of=date(2024, 5, 1),
+        ),
+    )
+    result = store.read("ABC")
+
+    assert result is not None
+    assert result.as_of == date(2024, 5, 1)
+    assert list(result.close) == [10.0, 11.0, 12.5]
+
+
+def test_append_keeps_rolling_ten_year_window(tmp_path) -> None:
+    store = PriceStore(str(tmp_path))
+    months = np.arange("2014-01", "2024-01", dtype="datetime64[M]")
+    store.write(
+        "ABC",
+        PriceHistory(
+            dates=months.astype("datetime64[D]"),
+            close=np.arange(len(months), dtype=np.float64),
+            adjclose=np.arange(len(months), dtype=np.float64),
+            as_of=date(2024, 1, 1),
+        ),
+    )
+
+    for month in range(2, 5):
+        store.append(
+            "ABC",
+            PriceHistory(
+                dates=np.array([f"2024-{month - 1:02d}-01"], dtype="datetime64[D]"),
+                close=np.array([100.0 + month]),
+                adjclose=np.array([100.0 + month]),
+                as_of=date(2024, month, 1),
+            ),
+        )
+    result = store.read("ABC")
+
+    assert result is not None
+    assert len(result.dates) == 120
+    assert result.dates[0] == np.datetime64("2014-04-01")
+    assert list(result.close[-3:]) == [102.0, 103.0, 104.0]
+
+
+def get_history() -> PriceHistory:
+    return PriceHistory(
+        dates=np.array(
+            ["2024-01-01", "2024-02-01", "2024-03-01"], dtype="datetime64[D]"
+        ),
+        close=np.array([10.0, 11.0, 12.5]),
+        adjclose=np.array([9.5, 10.5, 12.0]),
+        as_of=date(2024, 4, 1),
+    )
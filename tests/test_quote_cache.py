@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from asset_manager.equity_service import CachedEquityService, EquityService
+from asset_manager.equity_service.quote_cache import (
+    MARKET_TIMEZONE,
+    is_market_open,
+    next_market_open,
+)
+
+# wednesday during the regular session
+MARKET_HOURS = datetime(2024, 5, 15, 11, 0, tzinfo=MARKET_TIMEZONE)
+# friday after the close
+AFTER_CLOSE = datetime(2024, 5, 17, 17, 0, tzinfo=MARKET_TIMEZONE)
+
+
+def test_is_market_open() -> None:
+    assert is_market_open(MARKET_HOURS) is True
+    assert is_market_open(AFTER_CLOSE) is False
+    assert is_market_open(datetime(2024, 5, 18, 11, 0, tzinfo=MARKET_TIMEZONE)) is False
+
+
+def test_next_market_open_skips_weekend() -> None:
+    assert next_market_open(AFTER_CLOSE) == datetime(
+        2024, 5, 20, 9, 30, tzinfo=MARKET_TIMEZONE
+    )
+
+
+def test_get_equity_prices_many_caches_quotes() -> None:
+    clock = Clock(MARKET_HOURS)
+    equity_service = get_equity_service()
+    cache = CachedEquityService(equity_service, ttl=60, clock=clock)
+
+    cache.get_equity_prices_many(["ABC", "XYZ"])
+    prices = cache.get_equity_prices_many(["ABC", "XYZ"])
+
+    assert prices == {"ABC": (10, 9), "XYZ": (10, 9)}
+    equity_service.get_equity_prices_many.assert_called_once_with(["ABC", "XYZ"])
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 2
+
+
+def test_get_equity_prices_many_expires_after_ttl() -> None:
+    clock = Clock(MARKET_HOURS)
+    equity_service = get_equity_service()
+    cache = CachedEquityService(equity_service, ttl=60, clock=clock)
+
+    cache.get_equity_prices_many(["ABC"])
+    clock.now += timedelta(seconds=61)
+    cache.get_equity_prices_many(["ABC"])
+
+    assert equity_service.get_equity_prices_many.call_count == 2
+
+
+def test_get_equity_prices_many_after_close_valid_until_open() -> None:
+    clock = Clock(AFTER_CLOSE)
+    equity_service = get_equity_service()
+    cache = CachedEquityService(equity_service, ttl=60, clock=clock)
+
+    cache.get_equity_prices_many(["ABC"])
+    clock.now += timedelta(days=2)
+    cache.get_equity_prices_many(["ABC"])
+    assert equity_service.get_equity_prices_many.call_count == 1
+
+    clock.now += timedelta(days=1)
+    cache.get_equity_prices_many(["ABC"])
+    assert equity_service.get_equity_prices_many.call_count == 2
+
+
+def test_get_equity_prices_many_evicts_least_recently_used() -> None:
+    clock = Clock(MARKET_HOURS)
+    equity_service = get_equity_service()
+    cache = CachedEquityService(equity_service, ttl=60, max_size=2, clock=clock)
+
+    cache.get_equity_prices_many(["ABC", "DEF"])
+    cache.get_equity_prices_many(["ABC"])
+    cache.get_equity_prices_many(["XYZ"])
+    cache.get_equity_prices_many(["ABC"])
+
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 2
+    equity_service.get_equity_prices_many.assert_called_with(["XYZ"])
+
+
+class Clock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def get_equity_service() -> MagicMock:
+    equity_service = MagicMock(spec=EquityService)
+    equity_service.get_equity_prices_many.side_effect = lambda tickers: {
+        ticker: (10, 9) for ticker in tickers
+    }
+    return equity_service
@@ -0,0 +1,73 @@
+import pytest
+import threading
+import time
+
+from asset_manager.utilities.request_scheduler import (
+    Priority,
+    RequestScheduler,
+    current_priority,
+    request_priority,
+)
+
+
+def test_acquire_paces_requests_beyond_quota() -> None:
+    scheduler = RequestScheduler({"test": {"calls": 2, "period": 0.2}})
+
+    start = time.monotonic()
+    for _ in range(4):
+        scheduler.acquire("test")
+    elapsed = time.monotonic() - start
+
+    # two requests fit in the initial burst, the remaining two wait 0.1s each
+    assert elapsed >= 0.18
+    assert scheduler.stats()["test"].requests == 4
+    assert scheduler.stats()["test"].max_wait > 0
+
+
+def test_acquire_releases_interactive_before_bulk() -> None:
+    scheduler = RequestScheduler({"test": {"calls": 1, "period": 0.1}})
+    scheduler.acquire("test")
+
+    order: list[str] = []
+
+    def request(name: str, priority: Priority) -> None:
+        scheduler.acquire("test", priority)
+        order.append(name)
+
+    bulk = threading.Thread(target=request, args=("bulk", Priority.BULK))
+    bulk.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(
+        target=request, args=("interactive", Priority.INTERACTIVE)
+    )
+    interactive.start()
+
+    bulk.join()
+    interactive.join()
+
+    assert order == ["interactive", "bulk"]
+
+
+def test_configured_quotas_keep_defaults_of_other_providers() -> None:
+    scheduler = RequestScheduler({"finnhub": {"calls": 30, "period": 60}})
+
+    scheduler.acquire("finnhub")
+    scheduler.acquire("fred")
+
+    assert sorted(scheduler.stats()) == ["finnhub", "fred", "yahoo"]
+
+
+def test_acquire_unknown_provider() -> None:
+    scheduler = RequestScheduler({})
+
+    with pytest.raises(ValueError):
+        scheduler.acquire("test")
+
+
+def test_request_priority_context() -> None:
+    assert current_priority() == Priority.BULK
+
+    with request_priority(Priority.INTERACTIVE):
+        assert current_priority() == Priority.INTERACTIVE
+
+    assert current_priority() == Priority.BULK
@@ -0,0 +1,137 @@
+import pytest
+from datetime import datetime, timedelta
+
+from asset_manager.database import SnapshotStore, SqliteDatabase
+from asset_manager.database.entities import Historical, HistoricalData, Portfolio
+
+
+@pytest.fixture
+def db(tmp_path) -> SqliteDatabase:
+    db = SqliteDatabase(f"{tmp_path}/asset_manager.db")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(f"{tmp_path}/snapshot")
+
+
+def test_save_and_load(store: SnapshotStore, db: SqliteDatabase) -> None:
+    p, historical = get_stored_portfolio(db)
+
+    store.save(p, historical)
+    snapshot = store.load("test_portfolio")
+
+    assert snapshot is not None
+    q, loaded_historical = snapshot
+    assert q.id == p.id
+    assert q.cash == p.cash
+    assert q.version == p.version
+    assert q.pending_changes() == {}
+    assert loaded_historical.version == historical.version
+    assert loaded_historical.saved_length == 2
+    assert [hd.value for hd in loaded_historical.historical_data] == [100, 101]
+
+
+def test_load_missing_or_unreadable(store: SnapshotStore, tmp_path) -> None:
+    assert store.load("test_portfolio") is None
+
+    (tmp_path / "snapshot").mkdir()
+    (tmp_path / "snapshot" / "test_portfolio.pkl").write_bytes(b"not a snapshot")
+
+    assert store.load("test_portfolio") is None
+
+
+def test_reconcile_keeps_current_snapshot(
+    store: SnapshotStore, db: SqliteDatabase
+) -> None:
+    p, historical = get_stored_portfolio(db)
+    store.save(p, historical)
+    snapshot_portfolio, snapshot_historical = store.load("test_portfolio")
+
+    q, reconciled_historical = store.reconcile(
+        db, snapshot_portfolio, snapshot_historical
+    )
+
+    assert q is snapshot_portfolio
+    assert reconciled_historical is snapshot_historical
+
+
+def test_reconcile_downloads_newer_versions(
+    store: SnapshotStore, db: SqliteDatabase
+) -> None:
+    p, historical = get_stored_portfolio(db)
+    store.save(p, historical)
+
+    # another session saves changes after the snapshot was taken
+    p.cash = 500
+    db.save_portfolio(p)
+    historical.historical_data.append(
+        HistoricalData(date=datetime(2024, 1, 3), value=102)
+    )
+    db.save_historical(historical)
+
+    q, reconciled_historical = store.reconcile(db, *store.load("test_portfolio"))
+
+    assert q.cash == 500
+    assert q.version == p.version
+    assert len(reconciled_historical.historical_data) == 3
+    assert reconciled_historical.version == historical.version
+
+
+def test_unsaved_changes_are_not_stored(
+    store: SnapshotStore, db: SqliteDatabase
+) -> None:
+    p, historical = get_stored_portfolio(db)
+
+    # changes made without saving, e.g. by reweight or a failed command
+    p.cash = 999
+    historical.historical_data.append(
+        HistoricalData(date=datetime(2024, 1, 3), value=102)
+    )
+    store.save(p, historical)
+
+    q, reconciled_historical = store.reconcile(db, *store.load("test_portfolio"))
+
+    assert q.cash == 100
+    assert q.pending_changes() == {}
+    assert db.get_portfolio_by_name("test_portfolio").cash == 100
+    assert [hd.value for hd in reconciled_historical.historical_data] == [100, 101]
+
+
+def test_reconcile_replaces_snapshot_ahead_of_database(
+    store: SnapshotStore, db: SqliteDatabase
+) -> None:
+    p, historical = get_stored_portfolio(db)
+    stored_version = p.version
+
+    # a save queued in the background that never reached the database
+    p.cash = 700
+    p.version += 1
+    p.mark_clean()
+    store.save(p, historical)
+
+    q, _ = store.reconcile(db, *store.load("test_portfolio"))
+
+    assert q.cash == 100
+    assert q.version == stored_version
+
+
+def get_stored_portfolio(db: SqliteDatabase) -> tuple[Portfolio, Historical]:
+    p = db.create_portfolio("test_portfolio")
+    p.cash = 100
+    db.save_portfolio(p)
+
+    now = datetime(2024, 1, 2)
+    historical = Historical(
+        id=p.id,
+        name=p.name,
+        historical_data=[
+            HistoricalData(date=now - timedelta(days=1), value=100),
+            HistoricalData(date=now, value=101),
+        ],
+    )
+    db.save_historical(historical)
+
+    return p, historical
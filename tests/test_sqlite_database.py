@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+from bson import ObjectId
+from datetime import datetime, timedelta
+
+from asset_manager.database import SqliteDatabase
+from asset_manager.database.entities import (
+    Equity,
+    Historical,
+    HistoricalData,
+    Lot,
+    Trade,
+)
+
+
+@pytest.fixture
+def db(tmp_path) -> SqliteDatabase:
+    db = SqliteDatabase(f"{tmp_path}/asset_manager.db")
+    yield db
+    db.close()
+
+
+def test_create_and_get_portfolio(db: SqliteDatabase) -> None:
+    p = db.create_portfolio("test_portfolio")
+
+    q = db.get_portfolio_by_name("test_portfolio")
+
+    assert db.get_portfolio_names() == ["test_portfolio"]
+    assert q is not None
+    assert q.id == p.id
+    assert q.valuation.current_year == p.valuation.current_year
+    assert q.pending_changes() == {}
+    assert db.get_portfolio_by_name("missing") is None
+
+
+def test_list_portfolios(db: SqliteDatabase) -> None:
+    db.create_portfolio("b_portfolio")
+    p = db.create_portfolio("a_portfolio")
+    p.value = 120.5
+    p.valuation.ytd = 0.1
+    db.save_portfolio(p)
+
+    summaries = db.list_portfolios()
+
+    assert [s.name for s in summaries] == ["a_portfolio", "b_portfolio"]
+    assert summaries[0].value == 120.5
+    assert summaries[0].ytd == 0.1
+    assert summaries[0].last_updated == p.last_updated
+    assert db.get_portfolio_names() == ["a_portfolio", "b_portfolio"]
+
+
+def test_save_portfolio(db: SqliteDatabase) -> None:
+    execution_time = datetime(2024, 1, 2, 10, 30)
+    p = db.create_portfolio("test_portfolio")
+
+    p.cash = 250.5
+    p.equities.append(
+        Equity(
+            ticker="ABC",
+            shares=2,
+            price=10,
+            previous_day_price=9,
+            lots=[Lot(shares=2, price=10, execution_time=execution_time)],
+            weight=np.float64(0.5),
+        )
+    )
+    db.save_portfolio(p)
+
+    q = db.get_portfolio_by_name("test_portfolio")
+
+    assert p.pending_changes() == {}
+    assert q.cash == 250.5
+    assert q.equities[0].ticker == "ABC"
+    assert q.equities[0].weight == 0.5
+    assert q.equities[0].lots[0].execution_time == execution_time
+
+
+def test_get_trades_pages_through_ledger(db: SqliteDatabase) -> None:
+    portfolio_id = ObjectId()
+    now = datetime.now()
+    for i in range(5):
+        db.insert_trade(
+            portfolio_id,
+            Trade(
+                ticker="ABC" if i % 2 == 0 else "XYZ",
+                price=10 + i,
+                shares=1,
+                execution_time=now - timedelta(days=i),
+            ),
+        )
+
+    # trades executed at the same time are still paged without gaps
+    db.insert_trade(
+        portfolio_id, Trade(ticker="ABC", price=20, shares=1, execution_time=now)
+    )
+
+    trades = list(db.get_trades(portfolio_id, page_size=2))
+    abc_trades = list(db.get_trades(portfolio_id, ticker="ABC", page_size=2))
+
+    assert [trade.price for trade in trades] == [20, 10, 11, 12, 13, 14]
+    assert [trade.price for trade in abc_trades] == [20, 10, 12, 14]
+    assert [trade.price for trade in db.get_recent_trades(portfolio_id, 3)] == [
+        20,
+        10,
+        11,
+    ]
+    assert list(db.get_trades(ObjectId())) == []
+
+
+def test_save_and_get_historical(db: SqliteDatabase) -> None:
+    portfolio_id = ObjectId()
+    now = datetime(2024, 1, 5)
+    historical = Historical(
+        id=portfolio_id,
+        name="test_portfolio",
+        historical_data=[
+            HistoricalData(date=now - timedelta(days=1), value=100),
+            HistoricalData(date=now, value=101.5),
+        ],
+    )
+    db.save_historical(historical)
+
+    loaded = db.get_historical(portfolio_id)
+    loaded.historical_data.append(
+        HistoricalData(date=now + timedelta(days=1), value=103)
+    )
+    db.save_historical(loaded)
+
+    reloaded = db.get_historical(portfolio_id)
+
+    assert loaded.saved_length == 3
+    assert reloaded.name == "test_portfolio"
+    assert [hd.value for hd in reloaded.historical_data] == [100, 101.5, 103]
+    assert reloaded.historical_data[-1].date == now + timedelta(days=1)
+
+
+def test_get_historical_missing(db: SqliteDatabase) -> None:
+    with pytest.raises(Exception):
+        db.get_historical(ObjectId())
@@ -0,0 +1,262 @@
+import threading
+from bson import ObjectId
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from asset_manager.database import SqliteDatabase, WriteBehindDatabase
+from asset_manager.database.database_interface import Database
+from asset_manager.database.entities import (
+    Equity,
+    Historical,
+    HistoricalData,
+    HistoricalSeries,
+    Lot,
+    Portfolio,
+    PortfolioSummary,
+    Trade,
+    Valuation,
+)
+
+
+class RecordingDatabase(Database):
+    """Records writes and blocks them until released so they queue up in the wrapper"""
+
+    def __init__(self) -> None:
+        self.writes: list[tuple] = []
+        self.release = threading.Event()
+        self.fail = False
+
+    def list_portfolios(self) -> list[PortfolioSummary]:
+        return []
+
+    def get_portfolio_by_name(self, portfolio_name: str) -> Optional[Portfolio]:
+        return None
+
+    def insert_portfolio(self, portfolio: Portfolio) -> None:
+        self.__record("insert_portfolio", portfolio.to_dict())
+
+    def update_portfolio(self, portfolio_id: ObjectId, changes: dict) -> None:
+        self.__record("update_portfolio", changes)
+
+    def insert_trade(self, portfolio_id: ObjectId, trade: Trade) -> None:
+        self.__record("insert_trade", trade.ticker)
+
+    def get_trades(
+        self, portfolio_id: ObjectId, ticker: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Trade]:
+        return iter([])
+
+    def get_historical(self, portfolio_id: ObjectId) -> Historical:
+        return Historical(id=portfolio_id, name="test", historical_data=[])
+
+    def append_historical(
+        self,
+        historical_id: ObjectId,
+        name: str,
+        historical_data: HistoricalSeries,
+        version: int,
+    ) -> None:
+        self.__record(
+            "append_historical", ([hd.value for hd in historical_data], version)
+        )
+
+    def get_versions(self, portfolio_id: ObjectId) -> Optional[tuple[int, int]]:
+        return None
+
+    def __record(self, kind: str, payload: object) -> None:
+        self.release.wait()
+        if self.fail:
+            raise ValueError("write rejected")
+        self.writes.append((kind, payload))
+
+
+def test_writes_are_persisted_before_reads(tmp_path) -> None:
+    db = WriteBehindDatabase(SqliteDatabase(f"{tmp_path}/asset_manager.db"))
+
+    p = db.create_portfolio("test_portfolio")
+    p.cash = 100
+    db.save_portfolio(p)
+    db.insert_trade(
+        p.id, Trade(ticker="ABC", price=10, shares=1, execution_time=datetime.now())
+    )
+
+    q = db.get_portfolio_by_name("test_portfolio")
+
+    assert q.cash == 100
+    assert len(db.get_recent_trades(p.id)) == 1
+    db.close()
+
+
+def test_consecutive_saves_are_merged() -> None:
+    inner = RecordingDatabase()
+    db = WriteBehindDatabase(inner)
+    p = get_portfolio()
+    p.mark_clean()
+
+    # the first write blocks the worker so the remaining writes queue up behind it
+    db.insert_trade(
+        p.id, Trade(ticker="ABC", price=10, shares=1, execution_time=datetime.now())
+    )
+    p.cash = 50
+    db.save_portfolio(p)
+    p.equities[0].price = 12
+    db.save_portfolio(p)
+    p.equities.append(get_equity("XYZ"))
+    db.save_portfolio(p)
+    p.equities[1].price = 20
+    db.save_portfolio(p)
+
+    inner.release.set()
+    db.flush()
+
+    assert [kind for kind, _ in inner.writes] == ["insert_trade", "update_portfolio"]
+    changes = inner.writes[1][1]
+    assert sorted(changes) == ["cash", "equities", "lastUpdated", "version"]
+    assert changes["cash"] == 50
+    assert changes["version"] == 4
+    assert [eq["price"] for eq in changes["equities"]] == [12, 20]
+
+
+def test_saves_are_merged_across_trades() -> None:
+    inner = RecordingDatabase()
+    db = WriteBehindDatabase(inner)
+    p = get_portfolio()
+    p.mark_clean()
+
+    # trading saves the portfolio around each trade insert
+    for ticker in ("ABC", "XYZ"):
+        p.cash -= 10
+        db.save_portfolio(p)
+        db.insert_trade(
+            p.id,
+            Trade(ticker=ticker, price=10, shares=1, execution_time=datetime.now()),
+        )
+        p.equities[0].shares += 1
+        db.save_portfolio(p)
+
+    inner.release.set()
+    db.flush()
+
+    assert [kind for kind, _ in inner.writes] == [
+        "update_portfolio",
+        "insert_trade",
+        "insert_trade",
+    ]
+    changes = inner.writes[0][1]
+    assert changes["cash"] == 80
+    assert changes["equities.0.shares"] == 4
+    assert changes["version"] == 4
+
+
+def test_nested_change_after_replaced_value_is_merged() -> None:
+    inner = RecordingDatabase()
+    db = WriteBehindDatabase(inner)
+    portfolio_id = ObjectId()
+
+    db.insert_trade(
+        portfolio_id,
+        Trade(ticker="ABC", price=10, shares=1, execution_time=datetime.now()),
+    )
+    db.update_portfolio(portfolio_id, {"equities.0": {"ticker": "ABC", "price": 10}})
+    db.update_portfolio(portfolio_id, {"equities.0.price": 11, "cash": 5})
+
+    inner.release.set()
+    db.flush()
+
+    assert inner.writes[1][1] == {
+        "equities.0": {"ticker": "ABC", "price": 11},
+        "cash": 5,
+    }
+
+
+def test_consecutive_historical_appends_are_merged() -> None:
+    inner = RecordingDatabase()
+    db = WriteBehindDatabase(inner)
+    historical = Historical(id=ObjectId(), name="test", historical_data=[])
+    now = datetime(2024, 1, 1)
+
+    for i in range(3):
+        historical.historical_data.append(
+            HistoricalData(date=now + timedelta(days=i), value=i)
+        )
+        db.save_historical(historical)
+
+    inner.release.set()
+    db.flush()
+
+    assert historical.saved_length == 3
+    assert inner.writes == [("append_historical", ([0, 1, 2], 3))]
+
+
+def test_failed_writes_are_reported() -> None:
+    inner = RecordingDatabase()
+    inner.fail = True
+    inner.release.set()
+    db = WriteBehindDatabase(inner)
+
+    db.insert_trade(
+        ObjectId(),
+        Trade(ticker="ABC", price=10, shares=1, execution_time=datetime.now()),
+    )
+    db.flush()
+
+    errors = db.pop_errors()
+    assert len(errors) == 1
+    assert "write rejected" in errors[0]
+    assert db.pop_errors() == []
+
+
+def test_failed_save_is_retried_with_next_save() -> None:
+    inner = RecordingDatabase()
+    inner.fail = True
+    inner.release.set()
+    db = WriteBehindDatabase(inner)
+    p = get_portfolio()
+    p.mark_clean()
+
+    p.cash = 50
+    db.save_portfolio(p)
+    db.flush()
+
+    assert len(db.pop_errors()) == 1
+    assert inner.writes == []
+
+    inner.fail = False
+    p.equities[0].price = 12
+    db.save_portfolio(p)
+    db.flush()
+
+    assert db.pop_errors() == []
+    assert [kind for kind, _ in inner.writes] == ["update_portfolio"]
+    changes = inner.writes[0][1]
+    assert changes["cash"] == 50
+    assert changes["equities.0.price"] == 12
+    assert changes["version"] == 2
+
+
+def get_portfolio() -> Portfolio:
+    return Portfolio(
+        id=ObjectId(),
+        name="TestPortfolio",
+        value=100,
+        cash=100,
+        equities=[get_equity("ABC")],
+        valuation=Valuation(
+            current_value=100,
+            ytd=0,
+            pnl=0,
+            realized_pnl=0,
+            year_start_value=100,
+            current_year=2024,
+        ),
+    )
+
+
+def get_equity(ticker: str) -> Equity:
+    return Equity(
+        ticker=ticker,
+        shares=2,
+        price=10,
+        previous_day_price=10,
+        lots=[Lot(shares=2, price=10, execution_time=datetime(2024, 1, 1))],
+    )
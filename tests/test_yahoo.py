@@ -0,0 +1,65 @@
+import pandas as pd
+from datetime import date, datetime
+from unittest.mock import patch
+
+from asset_manager.equity_service import YahooService
+from asset_manager.utilities.request_scheduler import RequestScheduler
+
+
+@patch("asset_manager.equity_service.yahoo.Ticker")
+def test_get_price_history_many(mock_ticker) -> None:
+    mock_ticker.return_value.history.return_value = pd.DataFrame(
+        {"adjclose": [10.0, 11.0, 20.0, 21.0]},
+        index=pd.MultiIndex.from_tuples(
+            [
+                ("ABC", date(2024, 1, 2)),
+                ("ABC", datetime(2024, 1, 3, 15, 30)),
+                ("XYZ", date(2024, 1, 2)),
+                ("XYZ", date(2024, 1, 3)),
+            ],
+            names=["symbol", "date"],
+        ),
+    )
+
+    history = YahooService().get_price_history_many(
+        ["XYZ", "ABC", "DEF"], date(2024, 1, 2), date(2024, 1, 3)
+    )
+
+    mock_ticker.assert_called_once_with(["XYZ", "ABC", "DEF"])
+    assert list(history.columns) == ["XYZ", "ABC", "DEF"]
+    assert list(history.index) == [
+        pd.Timestamp("2024-01-02"),
+        pd.Timestamp("2024-01-03"),
+    ]
+    assert list(history["ABC"]) == [10.0, 11.0]
+    assert history["DEF"].isna().all()
+
+
+@patch("asset_manager.equity_service.yahoo.Ticker")
+def test_get_price_history(mock_ticker) -> None:
+    mock_ticker.return_value.history.return_value = pd.DataFrame(
+        {"adjclose": [10.0, 11.0]},
+        index=pd.MultiIndex.from_tuples(
+            [("ABC", date(2024, 1, 2)), ("ABC", date(2024, 1, 3))],
+            names=["symbol", "date"],
+        ),
+    )
+
+    prices = YahooService().get_price_history("ABC", date(2024, 1, 2), date(2024, 1, 3))
+
+    assert prices == {date(2024, 1, 2): 10.0, date(2024, 1, 3): 11.0}
+
+
+@patch("asset_manager.equity_service.yahoo.Ticker")
+def test_requests_wait_for_scheduler(mock_ticker) -> None:
+    mock_ticker.return_value.price = {
+        "ABC": {"regularMarketPrice": 10.0, "regularMarketPreviousClose": 9.5}
+    }
+    mock_ticker.return_value.history.return_value = pd.DataFrame()
+    scheduler = RequestScheduler()
+    yahoo_service = YahooService(scheduler)
+
+    yahoo_service.get_equity_prices("ABC")
+    yahoo_service.get_price_history("ABC", date(2024, 1, 2), date(2024, 1, 3))
+
+    assert scheduler.stats()["yahoo"].requests == 2
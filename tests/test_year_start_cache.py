@@ -0,0 +1,34 @@
+import json
+
+from asset_manager.equity_service.year_start_cache import YearStartCache
+
+
+def test_put_many_and_get_many(tmp_path) -> None:
+    cache = YearStartCache(str(tmp_path))
+
+    cache.put_many({"ABC": 10.5, "XYZ": 20}, 2024)
+    cache.put_many({"DEF": 30}, 2024)
+
+    assert cache.get_many(["ABC", "DEF", "GHI"], 2024) == {"ABC": 10.5, "DEF": 30}
+    assert cache.get_many(["ABC"], 2025) == {}
+
+
+def test_get_many_persists_across_instances(tmp_path) -> None:
+    YearStartCache(str(tmp_path)).put_many({"ABC": 10.5}, 2024)
+
+    assert YearStartCache(str(tmp_path)).get_many(["ABC"], 2024) == {"ABC": 10.5}
+
+
+def test_get_many_migrates_legacy_ticker_file(tmp_path) -> None:
+    ticker_directory = tmp_path / "ABC"
+    ticker_directory.mkdir()
+    with open(ticker_directory / "year_start.json", "w") as data_file:
+        json.dump({"yearStartPrice": 12.5, "year": 2024}, data_file)
+
+    cache = YearStartCache(str(tmp_path))
+
+    assert cache.get_many(["ABC"], 2024) == {"ABC": 12.5}
+    assert cache.get_many(["ABC"], 2023) == {}
+
+    with open(tmp_path / "year_start.json", "r") as data_file:
+        assert json.load(data_file) == {"2024": {"ABC": 12.5}}
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from datetime import date
+from scipy.interpolate import CubicSpline
+
+from asset_manager.treasury_service import YieldCurve, YieldCurveStore
+
+TENORS = [0.25, 1, 5, 10, 30]
+
+
+def test_interpolate_linear() -> None:
+    yield_curve = get_yield_curve()
+
+    rates = yield_curve.interpolate([0.25, 3, 7.5, 50])
+
+    assert rates.shape == (1, 4)
+    assert np.allclose(rates[0], [4.2, 3.85, 3.85, 4.4])
+
+
+def test_interpolate_carries_forward_missing_observations() -> None:
+    yield_curve = get_yield_curve()
+
+    rates = yield_curve.interpolate(
+        [1, 10], ["2023-12-31", "2024-01-02", "2024-01-03", "2024-01-06"]
+    )
+
+    assert np.isnan(rates[0]).all()
+    assert np.allclose(rates[1], [5.0, 4.0])
+    # the 10 year rate was not observed on 2024-01-03
+    assert np.allclose(rates[2], [4.5, 4.0])
+    assert np.allclose(rates[3], [4.0, 4.0])
+
+
+def test_interpolate_cubic_matches_spline_of_each_date() -> None:
+    yield_curve = get_yield_curve()
+    dates = ["2024-01-02", "2024-01-04", "2024-01-05"]
+
+    rates = yield_curve.interpolate([0.5, 2, 20], dates, method="cubic")
+
+    for row, d in zip(rates, dates):
+        curve = yield_curve.interpolate(TENORS, d)[0]
+        assert np.allclose(row, CubicSpline(TENORS, curve)([0.5, 2, 20]))
+
+
+def test_interpolate_unsupported_method() -> None:
+    with pytest.raises(ValueError):
+        get_yield_curve().interpolate([1], method="quadratic")
+
+
+def test_merge_replaces_observations_on_same_dates() -> None:
+    yield_curve = get_yield_curve()
+
+    merged = yield_curve.merge(
+        ["2024-01-08", "2024-01-05"], [[4.0, 3.5, 3.0, 3.5, 4.0], [1, 2, 3, 4, 5]]
+    )
+
+    assert len(merged) == 5
+    assert merged.dates[-2:].tolist() == [date(2024, 1, 5), date(2024, 1, 8)]
+    assert merged.rates[-2].tolist() == [1, 2, 3, 4, 5]
+    assert len(yield_curve) == 4
+
+
+def test_store_round_trip(tmp_path) -> None:
+    store = YieldCurveStore(str(tmp_path))
+    yield_curve = get_yield_curve()
+
+    assert store.load() is None
+
+    store.save(yield_curve, date(2024, 1, 6))
+    loaded, updated = store.load()
+
+    assert updated == date(2024, 1, 6)
+    assert np.array_equal(loaded.dates, yield_curve.dates)
+    assert np.array_equal(loaded.rates, yield_curve.rates, equal_nan=True)
+
+
+def get_yield_curve() -> YieldCurve:
+    return YieldCurve(
+        dates=["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"],
+        tenors=TENORS,
+        rates=[
+            [5.5, 5.0, 4.0, 4.0, 4.2],
+            [5.4, 4.5, 3.8, np.nan, 4.3],
+            [5.3, 4.4, 3.7, 4.1, 4.3],
+            [4.2, 4.0, 3.7, 4.0, 4.4],
+        ],
+    )